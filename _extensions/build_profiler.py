@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+"""
+    build_profiler
+    ~~~~~~~~~~~~~~
+
+    Sphinx extension to find the documents that dominate the build time.
+
+    For each document, this records the time spent reading it (parsing and
+    transforms) and writing it (translating and rendering its page), the
+    number of nodes of its doctree and the size of its source and HTML body.
+    At the end of the build, the slowest documents are listed, and all the
+    measurements are written to `build_profile.json` next to the doctrees
+    directory (i.e. `_build/build_profile.json`). Nothing is measured unless
+    `build_profile_enabled` is set.
+
+    With parallel builds, reading measurements are merged from the workers
+    with the environment. Nothing is sent back from workers when writing, so
+    each process appends its writing measurements to a file named after its
+    process ID, and these files are merged at the end of the build.
+
+    Memory can be profiled as well by setting `build_profile_memory`, which
+    records the peak memory of the process while reading and writing each
+    document, and how much it grew from the start of the document:
+
+    - `rss` measures the resident memory of the process, which is what the
+      system runs out of. The peak is reset for each document through
+      `/proc/self/clear_refs`, so this is only available on Linux.
+    - `tracemalloc` measures memory allocated by Python only, but tells
+      exactly how much each document allocates. It slows the build down
+      significantly.
+
+    :copyright: Copyright 2026 by The Godot Engine Community
+    :license: MIT.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from sphinx.util import logging
+from sphinx.util.console import bold
+
+logger = logging.getLogger(__name__)
+
+# Start time, source size and start memory of the documents being read by this process.
+read_starts = {}
+# HTML body size of the pages written by this process.
+body_sizes = {}
+# Set when `build_profile_memory` is, inherited by parallel workers.
+memory_meter = None
+
+
+class RSSMeter:
+    """Measures the peak resident memory of the process, from `/proc/self/status`."""
+
+    name = "rss"
+
+    @staticmethod
+    def is_available():
+        return os.access("/proc/self/clear_refs", os.W_OK)
+
+    @staticmethod
+    def read_status(field):
+        with open("/proc/self/status", encoding="utf-8") as status:
+            for line in status:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) * 1024
+        return 0
+
+    def start(self):
+        # Resets the peak resident memory (`VmHWM`) of the process.
+        with open("/proc/self/clear_refs", "w", encoding="utf-8") as clear_refs:
+            clear_refs.write("5")
+        return self.read_status("VmRSS")
+
+    def stop(self, start):
+        peak = self.read_status("VmHWM")
+        return {"memory_peak": peak, "memory_growth": peak - start}
+
+
+class TracemallocMeter:
+    """Measures the peak memory allocated by Python, with `tracemalloc`."""
+
+    name = "tracemalloc"
+
+    @staticmethod
+    def is_available():
+        return True
+
+    def __init__(self):
+        # Started before parallel workers are forked, so they trace memory as well.
+        tracemalloc.start()
+
+    def start(self):
+        tracemalloc.reset_peak()
+        return tracemalloc.get_traced_memory()[0]
+
+    def stop(self, start):
+        peak = tracemalloc.get_traced_memory()[1]
+        return {"memory_peak": peak, "memory_growth": peak - start}
+
+
+MEMORY_METERS = {meter.name: meter for meter in (RSSMeter, TracemallocMeter)}
+
+
+def count_nodes(doctree):
+    return sum(1 for _ in doctree.findall())
+
+
+def start_memory():
+    return memory_meter.start() if memory_meter is not None else None
+
+
+def stop_memory(prefix, start):
+    if memory_meter is None:
+        return {}
+    return {prefix + key: value for key, value in memory_meter.stop(start).items()}
+
+
+def on_env_before_read_docs(app, env, docnames):
+    # Only documents read by this build are reported.
+    env.godot_build_profile = {}
+
+
+def on_source_read(app, docname, source):
+    if not app.config.build_profile_enabled:
+        return
+    read_starts[docname] = (time.perf_counter(), len(source[0]), start_memory())
+
+
+def on_doctree_read(app, doctree):
+    env = app.env
+    if env.docname not in read_starts:
+        return
+
+    start, source_size, memory = read_starts.pop(env.docname)
+    measurement = {
+        "read_time": time.perf_counter() - start,
+        "source_size": source_size,
+        "read_nodes": count_nodes(doctree),
+        "read_pid": os.getpid(),
+    }
+    measurement.update(stop_memory("read_", memory))
+    env.godot_build_profile[env.docname] = measurement
+
+
+def on_env_merge_info(app, env, docnames, other):
+    env.godot_build_profile.update(getattr(other, "godot_build_profile", {}))
+
+
+def on_html_page_context(app, pagename, templatename, context, doctree):
+    if app.config.build_profile_enabled and doctree is not None:
+        body_sizes[pagename] = len(context.get("body", ""))
+
+
+def init_profiler(app):
+    global memory_meter
+    if not app.config.build_profile_enabled:
+        return
+
+    meter_class = MEMORY_METERS.get(app.config.build_profile_memory)
+    if app.config.build_profile_memory and meter_class is None:
+        logger.warning(
+            "build_profile_memory should be one of %s, not %r.",
+            ", ".join(MEMORY_METERS),
+            app.config.build_profile_memory,
+        )
+    elif meter_class is not None and not meter_class.is_available():
+        logger.warning("build_profile_memory: %s is not available on this system.", meter_class.name)
+    elif meter_class is not None:
+        memory_meter = meter_class()
+
+    app.godot_build_profile_shards = tempfile.mkdtemp(prefix="build_profile-")
+
+    # There is no event around writing a document, so time the builder method itself.
+    # The doctree it gets is already resolved, even if this was done by another process.
+    write_doc = app.builder.write_doc
+
+    def profiled_write_doc(docname, doctree):
+        memory = start_memory()
+        start = time.perf_counter()
+        write_doc(docname, doctree)
+        measurement = {
+            "docname": docname,
+            "write_time": time.perf_counter() - start,
+            "write_nodes": count_nodes(doctree),
+            "body_size": body_sizes.pop(docname, 0),
+            "write_pid": os.getpid(),
+        }
+        measurement.update(stop_memory("write_", memory))
+        shard_path = os.path.join(app.godot_build_profile_shards, f"{os.getpid()}.jsonl")
+        with open(shard_path, "a", encoding="utf-8") as shard:
+            shard.write(json.dumps(measurement) + "\n")
+
+    app.builder.write_doc = profiled_write_doc
+
+
+def load_write_measurements(shards_path):
+    measurements = {}
+    for name in sorted(os.listdir(shards_path)):
+        with open(os.path.join(shards_path, name), encoding="utf-8") as shard:
+            for line in shard:
+                measurement = json.loads(line)
+                measurements[measurement.pop("docname")] = measurement
+    return measurements
+
+
+def report_profile(app, exception):
+    shards_path = getattr(app, "godot_build_profile_shards", None)
+    if shards_path is None:
+        return
+    try:
+        if exception is not None:
+            return
+        write_measurements = load_write_measurements(shards_path)
+    finally:
+        shutil.rmtree(shards_path, ignore_errors=True)
+
+    read_measurements = getattr(app.env, "godot_build_profile", {})
+    documents = {}
+    for docname in read_measurements.keys() | write_measurements.keys():
+        document = {"read_time": 0.0, "write_time": 0.0}
+        document.update(read_measurements.get(docname, {}))
+        document.update(write_measurements.get(docname, {}))
+        document["total_time"] = document["read_time"] + document["write_time"]
+        documents[docname] = document
+    if not documents:
+        return
+
+    ranking = sorted(documents, key=lambda docname: documents[docname]["total_time"], reverse=True)
+    output_path = app.config.build_profile_output
+    if not output_path:
+        output_path = os.path.join(os.path.dirname(app.doctreedir), "build_profile.json")
+    with open(output_path, "w", encoding="utf-8") as output:
+        json.dump(
+            {
+                "builder": app.builder.name,
+                "jobs": app.parallel,
+                "read_time": sum(document["read_time"] for document in documents.values()),
+                "write_time": sum(document["write_time"] for document in documents.values()),
+                "documents": {docname: documents[docname] for docname in ranking},
+            },
+            output,
+            indent=1,
+        )
+
+    lines = [f"{'read':>8} {'write':>8} {'nodes':>8} {'source':>9} {'body':>9}  document"]
+    for docname in ranking[: app.config.build_profile_report_size]:
+        document = documents[docname]
+        lines.append(
+            f"{document['read_time']:7.2f}s {document['write_time']:7.2f}s "
+            f"{document.get('write_nodes', document.get('read_nodes', 0)):8d} "
+            f"{document.get('source_size', 0) / 1024:8.1f}K {document.get('body_size', 0) / 1024:8.1f}K  {docname}"
+        )
+    logger.info(
+        bold("build profile: ") + "%d documents, slowest first (all measurements in %s):\n%s",
+        len(documents),
+        output_path,
+        "\n".join(lines),
+    )
+
+    if memory_meter is not None:
+        report_memory(app, documents)
+
+
+def report_memory(app, documents):
+    def growth(docname):
+        document = documents[docname]
+        return max(document.get("read_memory_growth", 0), document.get("write_memory_growth", 0))
+
+    mib = 1024 * 1024
+    lines = [f"{'read peak':>10} {'growth':>9} {'write peak':>10} {'growth':>9}  document"]
+    for docname in sorted(documents, key=growth, reverse=True)[: app.config.build_profile_report_size]:
+        document = documents[docname]
+        lines.append(
+            f"{document.get('read_memory_peak', 0) / mib:9.1f}M {document.get('read_memory_growth', 0) / mib:8.1f}M "
+            f"{document.get('write_memory_peak', 0) / mib:9.1f}M {document.get('write_memory_growth', 0) / mib:8.1f}M  "
+            f"{docname}"
+        )
+
+    # The peak of each process over the whole build, to size the number of parallel jobs.
+    process_peaks = {}
+    for document in documents.values():
+        for phase in ("read", "write"):
+            if phase + "_pid" in document:
+                key = (phase, document[phase + "_pid"])
+                process_peaks[key] = max(process_peaks.get(key, 0), document.get(phase + "_memory_peak", 0))
+    for phase in ("read", "write"):
+        peaks = sorted((peak for (key_phase, _), peak in process_peaks.items() if key_phase == phase), reverse=True)
+        if peaks:
+            lines.append(
+                f"{phase}: {len(peaks)} processes, highest peak {peaks[0] / mib:.1f}M, "
+                f"median peak {peaks[len(peaks) // 2] / mib:.1f}M"
+            )
+
+    logger.info(
+        bold("build profile: ") + "peak memory (%s) per document, largest growth first:\n%s",
+        memory_meter.name,
+        "\n".join(lines),
+    )
+
+
+def setup(app):
+    app.add_config_value("build_profile_enabled", False, "")
+    # Defaults to `build_profile.json` next to the doctrees directory (i.e. `_build/build_profile.json`).
+    app.add_config_value("build_profile_output", "", "")
+    app.add_config_value("build_profile_report_size", 30, "")
+    # Either "rss" or "tracemalloc" to profile memory as well.
+    app.add_config_value("build_profile_memory", "", "")
+
+    app.connect("builder-inited", init_profiler)
+    app.connect("env-before-read-docs", on_env_before_read_docs)
+    app.connect("source-read", on_source_read)
+    app.connect("doctree-read", on_doctree_read)
+    app.connect("env-merge-info", on_env_merge_info)
+    app.connect("html-page-context", on_html_page_context)
+    app.connect("build-finished", report_profile)
+
+    return {
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
@@ -12,7 +12,7 @@
 import re
 from docutils import nodes
 from docutils.parsers.rst import Directive
-from sphinx.writers.html5 import HTML5Translator
+from sphinx.transforms.post_transforms import SphinxPostTransform
 
 
 class classref_admonition(nodes.General, nodes.Element):
@@ -55,6 +55,11 @@ class BaseClassrefDirective(Directive):
             node,
         )
 
+        env = self.state.document.settings.env
+        if not hasattr(env, "classref_admonition_docs"):
+            env.classref_admonition_docs = set()
+        env.classref_admonition_docs.add(env.docname)
+
         return [node]
 
 
@@ -82,43 +87,65 @@ class ClassrefImportantDirective(BaseClassrefDirective):
     css_class = "important classref-admonition"
 
 
-def visit_inline_html(self, node):
-    classes = " ".join(node["classes"])
-    self.body.append(f'<p class="{classes}">')
-    self.body.append(f'<span class="admonition-title">{node["title"]}:</span> ')
+class ClassrefAdmonitionParagraphs(SphinxPostTransform):
+    """Replaces classref admonitions with a single paragraph, starting with
+    the title of the admonition and followed by the content of its paragraphs.
+
+    This is done when writing, so paragraphs are still available for
+    translation when reading documents."""
+
+    default_priority = 200
+    formats = ("html",)
+
+    def run(self, **kwargs):
+        if self.env.docname not in getattr(self.env, "classref_admonition_docs", ()):
+            return
+
+        for admonition in list(self.document.findall(classref_admonition)):
+            paragraph = nodes.paragraph(classes=admonition["classes"])
+            paragraph += nodes.inline("", f'{admonition["title"]}:', classes=["admonition-title"])
+            paragraph += nodes.Text(" ")
+            for child in admonition.children:
+                if isinstance(child, nodes.paragraph):
+                    paragraph.extend(child.children)
+                else:
+                    paragraph += child
+            admonition.replace_self(paragraph)
+
 
+def purge_admonition_docs(app, env, docname):
+    if hasattr(env, "classref_admonition_docs"):
+        env.classref_admonition_docs.discard(docname)
 
-def depart_inline_html(self, node):
-    self.body.append("</p>")
+
+def merge_admonition_docs(app, env, docnames, other):
+    # Documents read by parallel workers are merged into the main environment.
+    other_docs = getattr(other, "classref_admonition_docs", set()) & set(docnames)
+    if other_docs:
+        if not hasattr(env, "classref_admonition_docs"):
+            env.classref_admonition_docs = set()
+        env.classref_admonition_docs |= other_docs
 
 
 def setup(app):
-    app.set_translator("html", ClassrefAdmonitionHTMLTranslator, override=True)
     for node in (
         classref_important,
         classref_note,
         classref_tip,
         classref_warning,
     ):
-        app.add_node(node, html=(visit_inline_html, depart_inline_html))
+        app.add_node(node)
     app.add_directive("classref_important", ClassrefImportantDirective)
     app.add_directive("classref_note", ClassrefNoteDirective)
     app.add_directive("classref_tip", ClassrefTipDirective)
     app.add_directive("classref_warning", ClassrefWarningDirective)
+    app.add_post_transform(ClassrefAdmonitionParagraphs)
+    app.connect("env-purge-doc", purge_admonition_docs)
+    app.connect("env-merge-info", merge_admonition_docs)
 
     return {
+        # Bump this when the recorded data changes, so documents are read again.
+        "env_version": 1,
         "parallel_read_safe": True,
         "parallel_write_safe": True,
     }
-
-
-class ClassrefAdmonitionHTMLTranslator(HTML5Translator):
-    def visit_paragraph(self, node):
-        if isinstance(node.parent, classref_admonition):
-            return
-        super().visit_paragraph(node)
-
-    def depart_paragraph(self, node):
-        if isinstance(node.parent, classref_admonition):
-            return
-        super().depart_paragraph(node)
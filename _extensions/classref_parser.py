@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""
+    classref_parser
+    ~~~~~~~~~~~~~~~
+
+    Sphinx extension to parse the class reference (`classes/`) faster.
+
+    The class reference is generated, so its documents only use a handful of
+    top-level constructs: section titles, transitions, explicit markup
+    (labels, `rst-class`, `table` and other directives), bullet lists and
+    paragraphs. The stock parser handles each section, run of explicit
+    markup and bullet list with a new nested state machine, which dominates
+    the read phase for these pages. This parser walks the top-level
+    structure itself, and still uses the states of the reST parser for
+    everything else, so the resulting doctrees are the same. Documents with
+    titles or transitions in an unexpected form are handed to the stock
+    parser as a whole.
+
+    :copyright: Copyright 2026 by The Godot Engine Community
+    :license: MIT.
+"""
+
+import re
+
+from docutils import nodes
+from docutils.nodes import fully_normalize_name
+from docutils.parsers.rst import languages, states
+from docutils.statemachine import StringList, string2lines
+from docutils.utils import column_width
+from sphinx.parsers import RSTParser
+
+BLANK_REGEX = re.compile(" *$")
+INDENT_REGEX = re.compile(" +")
+# Transitions of the `Body` state of the reST parser, in the order they are tried.
+BODY_TRANSITIONS = [(name, re.compile(states.Body.patterns[name])) for name in states.Body.initial_transitions]
+LINE_REGEX = re.compile(states.Body.patterns["line"])
+
+
+def classify(line):
+    """Returns the name and match of the transition of the `Body` state that
+    the reST parser would use for `line`."""
+    if BLANK_REGEX.match(line):
+        return "blank", None
+    if INDENT_REGEX.match(line):
+        return "indent", None
+    for name, regex in BODY_TRANSITIONS:
+        match = regex.match(line)
+        if match:
+            return name, match
+
+
+def is_supported(lines):
+    """Returns whether all section titles and transitions in `lines` are in the
+    form expected from the class reference: underlined titles preceded by a
+    blank line, and transitions (or `::` markers) followed by a blank line."""
+    for i, line in enumerate(lines):
+        if not line or line[0] == " " or not LINE_REGEX.match(line):
+            continue
+
+        previous = lines[i - 1] if i > 0 else ""
+        if previous.strip():
+            # Title underline.
+            if i > 1 and lines[i - 2].strip():
+                return False
+            if classify(previous)[0] != "text" or column_width(previous.rstrip()) > len(line.rstrip()):
+                return False
+        elif i + 1 == len(lines) or lines[i + 1].strip():
+            # Overlined title or transition at the end of the document.
+            return False
+    return True
+
+
+class ClassReferenceStateMachine(states.RSTStateMachine):
+    """State machine handling the top-level structure of class reference documents
+    in a single pass: sections are kept on a stack instead of being parsed by
+    nested state machines."""
+
+    def run(self, input_lines, document, input_offset=0, match_titles=True, inliner=None):
+        # Same setup as `RSTStateMachine.run()` and `StateMachine.run()`.
+        self.language = languages.get_language(document.settings.language_code, document.reporter)
+        self.match_titles = match_titles
+        if inliner is None:
+            inliner = states.Inliner()
+        inliner.init_customizations(document.settings)
+        self.memo = states.Struct(
+            document=document,
+            reporter=document.reporter,
+            language=self.language,
+            title_styles=[],
+            section_level=0,
+            section_bubble_up_kludge=False,
+            inliner=inliner,
+        )
+        self.document = document
+        self.attach_observer(document.note_source)
+        self.reporter = self.memo.reporter
+        self.node = document
+        self.runtime_init()
+        self.input_lines = input_lines
+        self.input_offset = input_offset
+        self.line_offset = -1
+        self.current_state = self.initial_state
+
+        self.sections = [document]
+        while True:
+            try:
+                self.next_line()
+            except EOFError:
+                break
+            self.parse_block()
+
+        self.observers = []
+        self.node = self.memo = None
+
+    def set_parent(self, node):
+        self.node = node
+        for state in self.states.values():
+            state.parent = node
+
+    def parse_block(self):
+        name, match = classify(self.line)
+        if name == "blank":
+            return
+        if name == "explicit_markup":
+            self.explicit_markup(match)
+        elif name == "bullet":
+            self.bullet_list(match)
+        elif name == "line" and self.is_next_line_blank():
+            if len(self.line.strip()) < 4:
+                # Too short for a transition, parsed as text instead (see `Line.state_correction()`).
+                self.text(match)
+            else:
+                self.next_line()
+                self.states["Line"].blank(None, [match.string], "Body")
+        elif name == "text":
+            self.text(match)
+        else:
+            self.nested_parse()
+
+    def is_next_line_blank(self):
+        following = self.line_offset + 1
+        return following < len(self.input_lines) and BLANK_REGEX.match(self.input_lines[following])
+
+    def explicit_markup(self, match):
+        body = self.states["Body"]
+        nodelist, blank_finish = body.explicit_construct(match)
+        self.node += nodelist
+
+        # Consecutive explicit markup constructs are parsed as a list (see `Body.explicit_list()`),
+        # which only warns about a missing blank line after the last one.
+        if not blank_finish:
+            following = self.line_offset + 1
+            if following >= len(self.input_lines) or classify(self.input_lines[following])[0] not in (
+                "explicit_markup",
+                "anonymous",
+            ):
+                self.node += body.unindent_warning("Explicit markup")
+
+    def bullet_list(self, match):
+        # Same as `Body.bullet()` and the `BulletList` state.
+        body = self.states["Body"]
+        bullet_list = nodes.bullet_list()
+        bullet_list.source, bullet_list.line = self.get_source_and_line()
+        self.node += bullet_list
+        bullet_list["bullet"] = match.string[0]
+        item, blank_finish = body.list_item(match.end())
+        bullet_list += item
+
+        while True:
+            try:
+                self.next_line()
+            except EOFError:
+                break
+            name, match = classify(self.line)
+            if name == "blank":
+                continue
+            if name != "bullet" or match.string[0] != bullet_list["bullet"]:
+                self.previous_line()
+                break
+            item, blank_finish = body.list_item(match.end())
+            bullet_list += item
+
+        if not blank_finish:
+            self.node += body.unindent_warning("Bullet list")
+
+    def text(self, match):
+        # Same as the `Text` state, which classifies the second line of a text block.
+        text = self.states["Text"]
+        context = [match.string]
+        try:
+            self.next_line()
+        except EOFError:
+            text.eof(context)
+            return
+
+        if BLANK_REGEX.match(self.line):
+            text.blank(None, context, "Body")
+        elif INDENT_REGEX.match(self.line):
+            # Definition list.
+            self.previous_line()
+            self.nested_parse()
+        elif LINE_REGEX.match(self.line):
+            self.section(context[0], self.line)
+        else:
+            text.text(None, context, "Body")
+
+    def section(self, title, underline):
+        # Same as `Text.underline()`, `RSTState.check_subsection()` and `RSTState.new_subsection()`,
+        # for titles already checked by `is_supported()`.
+        text = self.states["Text"]
+        lineno = self.abs_line_number() - 1
+        title = title.rstrip()
+        underline = underline.rstrip()
+        style = underline[0]
+
+        title_styles = self.memo.title_styles
+        level = len(self.sections) - 1
+        if style in title_styles:
+            new_level = title_styles.index(style) + 1
+        elif len(title_styles) == level:
+            title_styles.append(style)
+            new_level = len(title_styles)
+        else:
+            new_level = None
+        if new_level is None or new_level > level + 1:
+            self.node += text.title_inconsistent(title + "\n" + underline, lineno)
+            return
+
+        # Close the current section and its parents, up to the parent of the new section.
+        del self.sections[new_level:]
+        self.set_parent(self.sections[-1])
+
+        section_node = nodes.section()
+        self.node += section_node
+        textnodes, title_messages = text.inline_text(title, lineno)
+        title_node = nodes.title(title, "", *textnodes)
+        section_node["names"].append(fully_normalize_name(title_node.astext()))
+        section_node += title_node
+        section_node += title_messages
+        self.document.note_implicit_target(section_node, section_node)
+
+        self.sections.append(section_node)
+        self.memo.section_level = new_level
+        self.set_parent(section_node)
+
+    def nested_parse(self):
+        """Parses the constructs starting at the current line with the reST parser,
+        up to the next section title or transition."""
+        start = self.line_offset
+        end = len(self.input_lines)
+        for i in range(start + 1, len(self.input_lines)):
+            line = self.input_lines[i]
+            if line and line[0] != " " and BLANK_REGEX.match(self.input_lines[i - 1]):
+                if LINE_REGEX.match(line) or (i + 1 < end and LINE_REGEX.match(self.input_lines[i + 1])):
+                    end = i
+                    break
+
+        # Lines inserted by directives such as `include` only go into the nested state machine's
+        # copy of the block, so the next construct always starts at `end`.
+        block = self.input_lines[start:end]
+        self.states["Body"].nested_parse(block, self.abs_line_offset(), self.node, match_titles=True)
+        self.line_offset = end - 1
+        self.line = self.input_lines[self.line_offset]
+
+
+class ClassReferenceParser(RSTParser):
+    """reST parser using `ClassReferenceStateMachine` for documents of the class reference."""
+
+    def parse(self, inputstring, document):
+        docname = self.env.docname
+        if (
+            not docname.startswith("classes/")
+            or not isinstance(inputstring, str)
+            # Messages are parsed separately when translating documents.
+            or document["source"] != str(self.env.doc2path(docname))
+        ):
+            super().parse(inputstring, document)
+            return
+
+        self.setup_parse(inputstring, document)
+        lines = string2lines(inputstring, tab_width=document.settings.tab_width, convert_whitespace=True)
+        inputlines = StringList(lines, document.current_source)
+        self.decorate(inputlines)
+
+        if is_supported(inputlines):
+            state_machine_class = ClassReferenceStateMachine
+        else:
+            state_machine_class = states.RSTStateMachine
+        self.statemachine = state_machine_class(
+            state_classes=self.state_classes,
+            initial_state=self.initial_state,
+            debug=document.reporter.debug_flag,
+        )
+        self.statemachine.run(inputlines, document, inliner=self.inliner)
+        self.finish_parse()
+
+
+def setup(app):
+    app.add_source_parser(ClassReferenceParser, override=True)
+
+    return {
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
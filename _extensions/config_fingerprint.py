@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+    config_fingerprint
+    ~~~~~~~~~~~~~~~~~~
+
+    Sphinx extension to avoid reading all documents again when configuration
+    values taken from the environment change, and to explain why a build
+    reads or writes everything again.
+
+    `version` and `release` come from `READTHEDOCS_VERSION`, and Sphinx reads
+    all documents again when they change, as they can be used with the
+    `|version|` and `|release|` substitutions. Only a few documents (if any)
+    use them, so they're tracked in the environment, and only those are read
+    again. Pages are still all written again, as templates use these values.
+
+    At the end of each build, the configuration values are saved next to the
+    doctrees. When a value changed since the previous build, the next one
+    logs it with its consequence (reading documents or writing pages again).
+
+    :copyright: Copyright 2026 by The Godot Engine Community
+    :license: MIT.
+"""
+
+import json
+import os
+
+from docutils import nodes
+from sphinx.config import _Opt
+from sphinx.transforms import SphinxTransform
+from sphinx.util import logging
+from sphinx.util._serialise import stable_str
+from sphinx.util.console import bold
+
+logger = logging.getLogger(__name__)
+
+# Configuration values only used in documents through substitutions of the same name.
+SUBSTITUTED_CONFIG_VALUES = ("version", "release")
+
+REBUILD_CONSEQUENCES = {
+    "env": "all documents are read again",
+    "html": "all pages are written again",
+    "": "nothing is built again",
+}
+
+FINGERPRINT_FILENAME = "config_fingerprint.json"
+
+
+def demote_substituted_values(app, config):
+    # The rebuild kind of a value is only stored in its option, which is replaced with the same
+    # option but for HTML pages (like `html_context`). `_Opt` is private, but only used here.
+    for name in SUBSTITUTED_CONFIG_VALUES:
+        option = config._options[name]
+        config._options[name] = _Opt(option.default, "html", option.valid_types, option.description)
+
+
+class SubstitutedConfigValues(SphinxTransform):
+    """Records the documents using `version` and `release` as substitutions."""
+
+    # Before `DefaultSubstitutions`, which replaces them.
+    default_priority = 209
+
+    def apply(self, **kwargs):
+        names = set(SUBSTITUTED_CONFIG_VALUES) - set(self.document.substitution_defs)
+        used_names = set()
+        for reference in self.document.findall(nodes.substitution_reference):
+            if reference["refname"] in names:
+                used_names.add(reference["refname"])
+        if used_names:
+            if not hasattr(self.env, "godot_substitution_docs"):
+                self.env.godot_substitution_docs = {}
+            self.env.godot_substitution_docs[self.env.docname] = used_names
+
+
+def purge_substitution_docs(app, env, docname):
+    if hasattr(env, "godot_substitution_docs"):
+        env.godot_substitution_docs.pop(docname, None)
+
+
+def merge_substitution_docs(app, env, docnames, other):
+    other_docs = getattr(other, "godot_substitution_docs", {})
+    if not other_docs:
+        return
+    if not hasattr(env, "godot_substitution_docs"):
+        env.godot_substitution_docs = {}
+    for docname in docnames:
+        if docname in other_docs:
+            env.godot_substitution_docs[docname] = other_docs[docname]
+
+
+def get_substitution_docs(app, env, added, changed, removed):
+    """Returns the documents to read again as they use a substituted value that changed."""
+    previous_values = getattr(env, "godot_substituted_values", {})
+    changed_names = {
+        name
+        for name in SUBSTITUTED_CONFIG_VALUES
+        if name in previous_values and previous_values[name] != app.config[name]
+    }
+    if not changed_names:
+        return []
+
+    docnames = [
+        docname for docname, names in getattr(env, "godot_substitution_docs", {}).items() if names & changed_names
+    ]
+    if docnames:
+        logger.info(
+            bold("config fingerprint: ") + "%s changed, reading %d documents using them again",
+            " and ".join(repr(name) for name in sorted(changed_names)),
+            len(docnames),
+        )
+    return docnames
+
+
+def save_substituted_values(app, env):
+    env.godot_substituted_values = {name: app.config[name] for name in SUBSTITUTED_CONFIG_VALUES}
+
+
+def get_fingerprint(app):
+    values = {}
+    for item in app.config:
+        try:
+            values[item.name] = [item.rebuild, stable_str(item.value)]
+        except Exception:
+            # Not serializable (e.g. functions), changes can't be told apart.
+            values[item.name] = [item.rebuild, None]
+    return {"extensions": sorted(app.config.extensions), "values": values}
+
+
+def shorten(value, length=60):
+    return value if value is None or len(value) <= length else value[: length - 3] + "..."
+
+
+def report_config_changes(app):
+    path = os.path.join(app.doctreedir, FINGERPRINT_FILENAME)
+    try:
+        with open(path, encoding="utf-8") as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        return
+
+    current = get_fingerprint(app)
+    lines = []
+    for extension in sorted(set(previous["extensions"]) ^ set(current["extensions"])):
+        change = "added" if extension in current["extensions"] else "removed"
+        lines.append(f"extension {extension!r} {change}: {REBUILD_CONSEQUENCES['env']}")
+
+    # Extensions are listed above.
+    names = (previous["values"].keys() | current["values"].keys()) - {"extensions"}
+    for name in sorted(names):
+        old_rebuild, old_value = previous["values"].get(name, ["", None])
+        rebuild, value = current["values"].get(name, [old_rebuild, None])
+        if name in previous["values"] and name in current["values"] and old_value == value:
+            continue
+        consequence = REBUILD_CONSEQUENCES.get(rebuild, f"rebuild {rebuild!r}")
+        if name in SUBSTITUTED_CONFIG_VALUES:
+            consequence += f", and the documents using |{name}|"
+        lines.append(f"{name!r} changed from {shorten(old_value)} to {shorten(value)}: {consequence}")
+
+    if lines:
+        logger.info(
+            bold("config fingerprint: ") + "the configuration changed since the last build:\n%s",
+            "\n".join("  " + line for line in lines),
+        )
+
+
+def save_fingerprint(app, exception):
+    if exception is not None:
+        return
+    os.makedirs(app.doctreedir, exist_ok=True)
+    with open(os.path.join(app.doctreedir, FINGERPRINT_FILENAME), "w", encoding="utf-8") as f:
+        json.dump(get_fingerprint(app), f, indent=1)
+
+
+def setup(app):
+    app.add_transform(SubstitutedConfigValues)
+
+    app.connect("config-inited", demote_substituted_values)
+    app.connect("builder-inited", report_config_changes)
+    app.connect("env-purge-doc", purge_substitution_docs)
+    app.connect("env-merge-info", merge_substitution_docs)
+    app.connect("env-get-outdated", get_substitution_docs)
+    app.connect("env-updated", save_substituted_values)
+    app.connect("build-finished", save_fingerprint)
+
+    return {
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
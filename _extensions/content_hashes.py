@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+    content_hashes
+    ~~~~~~~~~~~~~~
+
+    Sphinx extension to decide which documents are outdated from their
+    content instead of modification times.
+
+    Sphinx rereads a document when its source or a dependency (included
+    file, image, etc.) was modified after the document was last read. A fresh
+    checkout gives all files a new modification time, so doctrees restored
+    from a CI cache would all be read again. This records a hash of the
+    source and dependencies of each document (and `rst_prolog`/`rst_epilog`)
+    in the environment, and documents Sphinx considers outdated are only
+    read again if their hash changed.
+
+    Hashes are always recorded, and documents are only skipped when
+    `content_hashes_enabled` is set, so enabling it doesn't change the list
+    of extensions (which would make Sphinx read all documents again), and
+    the hashes of the previous builds are already there to compare with.
+
+    :copyright: Copyright 2026 by The Godot Engine Community
+    :license: MIT.
+"""
+
+import hashlib
+import os
+import time
+
+from sphinx.util import logging
+from sphinx.util.console import bold
+
+logger = logging.getLogger(__name__)
+
+
+def hash_file(path, file_hashes):
+    if path not in file_hashes:
+        try:
+            with open(path, "rb") as f:
+                file_hashes[path] = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            file_hashes[path] = None
+    return file_hashes[path]
+
+
+def hash_document(app, env, docname, file_hashes):
+    """Returns the hash of the content a document is read from, or `None` if a file is missing."""
+    digest = hashlib.sha256()
+    digest.update(f"{app.config.rst_prolog}\0{app.config.rst_epilog}\0".encode())
+    paths = [str(env.doc2path(docname))]
+    # Dependencies are relative to the source directory, or absolute.
+    paths += sorted(os.path.join(app.srcdir, dependency) for dependency in env.dependencies.get(docname, ()))
+    for path in paths:
+        file_hash = hash_file(path, file_hashes)
+        if file_hash is None:
+            return None
+        digest.update(f"{os.path.relpath(path, app.srcdir)}\0{file_hash}\0".encode())
+    return digest.hexdigest()
+
+
+def record_hash(app, doctree):
+    env = app.env
+    if not hasattr(env, "godot_content_hashes"):
+        env.godot_content_hashes = {}
+    # Dependencies are all known once the document is read.
+    env.godot_content_hashes[env.docname] = hash_document(app, env, env.docname, {})
+
+
+def purge_hash(app, env, docname):
+    if hasattr(env, "godot_content_hashes"):
+        env.godot_content_hashes.pop(docname, None)
+
+
+def merge_hashes(app, env, docnames, other):
+    if not hasattr(env, "godot_content_hashes"):
+        env.godot_content_hashes = {}
+    other_hashes = getattr(other, "godot_content_hashes", {})
+    for docname in docnames:
+        if docname in other_hashes:
+            env.godot_content_hashes[docname] = other_hashes[docname]
+
+
+def skip_unchanged_documents(app, env, added, changed, removed):
+    if not app.config.content_hashes_enabled:
+        return []
+
+    hashes = getattr(env, "godot_content_hashes", {})
+    file_hashes = {}
+    unchanged = 0
+    for docname in sorted(changed):
+        if docname in env.reread_always or hashes.get(docname) is None:
+            continue
+        if not os.path.isfile(os.path.join(env.doctreedir, docname + ".doctree")):
+            continue
+        if hash_document(app, env, docname, file_hashes) != hashes[docname]:
+            continue
+
+        # `changed` is the set of documents Sphinx is about to read.
+        changed.discard(docname)
+        # Same as when reading the document, so modification times are checked first on the next build.
+        env.all_docs[docname] = time.time_ns() // 1_000
+        unchanged += 1
+
+    if unchanged:
+        logger.info(bold("content hashes: ") + "not reading %d outdated documents with the same content", unchanged)
+    return []
+
+
+def setup(app):
+    app.add_config_value("content_hashes_enabled", False, "")
+
+    app.connect("doctree-read", record_hash)
+    app.connect("env-purge-doc", purge_hash)
+    app.connect("env-merge-info", merge_hashes)
+    app.connect("env-get-outdated", skip_unchanged_documents)
+
+    return {
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+    gdscript_builtins
+    ~~~~~~~~~~~~~~~~~
+
+    Builtin names highlighted by the GDScript lexer (see gdscript.py).
+
+    DO NOT EDIT THIS FILE!!!
+    Generated automatically from the class reference in classes/
+    by _tools/generate_gdscript_builtins.py.
+"""
+
+# Methods of @GlobalScope and @GDScript.
+GLOBAL_FUNCTIONS = (
+    "Color8", "abs", "absf", "absi", "acos", "acosh", "angle_difference", "asin", "asinh", "assert", "atan", "atan2",
+    "atanh", "bezier_derivative", "bezier_interpolate", "bytes_to_var", "bytes_to_var_with_objects", "ceil", "ceilf",
+    "ceili", "char", "clamp", "clampf", "clampi", "convert", "cos", "cosh", "cubic_interpolate",
+    "cubic_interpolate_angle", "cubic_interpolate_angle_in_time", "cubic_interpolate_in_time", "db_to_linear",
+    "deg_to_rad", "dict_to_inst", "ease", "error_string", "exp", "floor", "floorf", "floori", "fmod", "fposmod",
+    "get_stack", "hash", "inst_to_dict", "instance_from_id", "inverse_lerp", "is_equal_approx", "is_finite", "is_inf",
+    "is_instance_id_valid", "is_instance_of", "is_instance_valid", "is_nan", "is_same", "is_zero_approx", "len", "lerp",
+    "lerp_angle", "lerpf", "linear_to_db", "load", "log", "max", "maxf", "maxi", "min", "minf", "mini", "move_toward",
+    "nearest_po2", "ord", "pingpong", "posmod", "pow", "preload", "print", "print_debug", "print_rich", "print_stack",
+    "print_verbose", "printerr", "printraw", "prints", "printt", "push_error", "push_warning", "rad_to_deg",
+    "rand_from_seed", "randf", "randf_range", "randfn", "randi", "randi_range", "randomize", "range", "remap",
+    "rid_allocate_id", "rid_from_int64", "rotate_toward", "round", "roundf", "roundi", "seed", "sign", "signf", "signi",
+    "sin", "sinh", "smoothstep", "snapped", "snappedf", "snappedi", "sqrt", "step_decimals", "str", "str_to_var", "tan",
+    "tanh", "type_convert", "type_exists", "type_string", "typeof", "var_to_bytes", "var_to_bytes_with_objects",
+    "var_to_str", "weakref", "wrap", "wrapf", "wrapi",
+)
+
+# Classes listed under Variant types in classes/index.rst.
+VARIANT_TYPES = (
+    "Variant", "AABB", "Array", "Basis", "bool", "Callable", "Color", "Dictionary", "float", "int", "NodePath",
+    "Object", "PackedByteArray", "PackedColorArray", "PackedFloat32Array", "PackedFloat64Array", "PackedInt32Array",
+    "PackedInt64Array", "PackedStringArray", "PackedVector2Array", "PackedVector3Array", "PackedVector4Array", "Plane",
+    "Projection", "Quaternion", "Rect2", "Rect2i", "RID", "Signal", "String", "StringName", "Transform2D",
+    "Transform3D", "Vector2", "Vector2i", "Vector3", "Vector3i", "Vector4", "Vector4i",
+)
+
+# Classes listed under Nodes, Resources, Other objects, Editor-only in classes/index.rst.
+CLASSES = (
+    "Node", "AcceptDialog", "AimModifier3D", "AnimatableBody2D", "AnimatableBody3D", "AnimatedSprite2D",
+    "AnimatedSprite3D", "AnimationMixer", "AnimationPlayer", "AnimationTree", "Area2D", "Area3D", "AreaLight3D",
+    "AspectRatioContainer", "AudioListener2D", "AudioListener3D", "AudioStreamPlayer", "AudioStreamPlayer2D",
+    "AudioStreamPlayer3D", "BackBufferCopy", "BaseButton", "Bone2D", "BoneAttachment3D", "BoneConstraint3D",
+    "BoneTwistDisperser3D", "BoxContainer", "Button", "Camera2D", "Camera3D", "CanvasGroup", "CanvasItem",
+    "CanvasLayer", "CanvasModulate", "CCDIK3D", "CenterContainer", "ChainIK3D", "CharacterBody2D", "CharacterBody3D",
+    "CheckBox", "CheckButton", "CodeEdit", "CollisionObject2D", "CollisionObject3D", "CollisionPolygon2D",
+    "CollisionPolygon3D", "CollisionShape2D", "CollisionShape3D", "ColorPicker", "ColorPickerButton", "ColorRect",
+    "ConeTwistJoint3D", "ConfirmationDialog", "Container", "Control", "ConvertTransformModifier3D",
+    "CopyTransformModifier3D", "CPUParticles2D", "CPUParticles3D", "CSGBox3D", "CSGCombiner3D", "CSGCylinder3D",
+    "CSGMesh3D", "CSGPolygon3D", "CSGPrimitive3D", "CSGShape3D", "CSGSphere3D", "CSGTorus3D", "DampedSpringJoint2D",
+    "Decal", "DirectionalLight2D", "DirectionalLight3D", "EditorCommandPalette", "EditorDock", "EditorFileDialog",
+    "EditorFileSystem", "EditorInspector", "EditorPlugin", "EditorProperty", "EditorResourcePicker",
+    "EditorResourcePreview", "EditorScriptPicker", "EditorSpinSlider", "EditorToaster", "FABRIK3D", "FileDialog",
+    "FileSystemDock", "FlowContainer", "FogVolume", "FoldableContainer", "Generic6DOFJoint3D", "GeometryInstance3D",
+    "GPUParticles2D", "GPUParticles3D", "GPUParticlesAttractor3D", "GPUParticlesAttractorBox3D",
+    "GPUParticlesAttractorSphere3D", "GPUParticlesAttractorVectorField3D", "GPUParticlesCollision3D",
+    "GPUParticlesCollisionBox3D", "GPUParticlesCollisionHeightField3D", "GPUParticlesCollisionSDF3D",
+    "GPUParticlesCollisionSphere3D", "GraphEdit", "GraphElement", "GraphFrame", "GraphNode", "GridContainer", "GridMap",
+    "GridMapEditorPlugin", "GrooveJoint2D", "HBoxContainer", "HFlowContainer", "HingeJoint3D", "HScrollBar",
+    "HSeparator", "HSlider", "HSplitContainer", "HTTPRequest", "IKModifier3D", "ImporterMeshInstance3D",
+    "InstancePlaceholder", "ItemList", "IterateIK3D", "JacobianIK3D", "Joint2D", "Joint3D", "Label", "Label3D",
+    "Light2D", "Light3D", "LightmapGI", "LightmapProbe", "LightOccluder2D", "LimitAngularVelocityModifier3D", "Line2D",
+    "LineEdit", "LinkButton", "LookAtModifier3D", "MarginContainer", "Marker2D", "Marker3D", "MenuBar", "MenuButton",
+    "MeshInstance2D", "MeshInstance3D", "MissingNode", "ModifierBoneTarget3D", "MultiMeshInstance2D",
+    "MultiMeshInstance3D", "MultiplayerSpawner", "MultiplayerSynchronizer", "NavigationAgent2D", "NavigationAgent3D",
+    "NavigationLink2D", "NavigationLink3D", "NavigationObstacle2D", "NavigationObstacle3D", "NavigationRegion2D",
+    "NavigationRegion3D", "NinePatchRect", "Node2D", "Node3D", "OccluderInstance3D", "OmniLight3D",
+    "OpenXRBindingModifierEditor", "OpenXRCompositionLayer", "OpenXRCompositionLayerCylinder",
+    "OpenXRCompositionLayerEquirect", "OpenXRCompositionLayerQuad", "OpenXRHand", "OpenXRInteractionProfileEditor",
+    "OpenXRInteractionProfileEditorBase", "OpenXRRenderModel", "OpenXRRenderModelManager", "OpenXRVisibilityMask",
+    "OptionButton", "Panel", "PanelContainer", "Parallax2D", "ParallaxBackground", "ParallaxLayer", "Path2D", "Path3D",
+    "PathFollow2D", "PathFollow3D", "PhysicalBone2D", "PhysicalBone3D", "PhysicalBoneSimulator3D", "PhysicsBody2D",
+    "PhysicsBody3D", "PinJoint2D", "PinJoint3D", "PointLight2D", "Polygon2D", "Popup", "PopupMenu", "PopupPanel",
+    "ProgressBar", "Range", "RayCast2D", "RayCast3D", "ReferenceRect", "ReflectionProbe", "RemoteTransform2D",
+    "RemoteTransform3D", "ResourcePreloader", "RetargetModifier3D", "RichTextLabel", "RigidBody2D", "RigidBody3D",
+    "RootMotionView", "ScriptCreateDialog", "ScriptEditor", "ScriptEditorBase", "ScrollBar", "ScrollContainer",
+    "Separator", "ShaderGlobalsOverride", "ShapeCast2D", "ShapeCast3D", "Skeleton2D", "Skeleton3D", "SkeletonIK3D",
+    "SkeletonModifier3D", "Slider", "SliderJoint3D", "SoftBody3D", "SpinBox", "SplineIK3D", "SplitContainer",
+    "SpotLight3D", "SpringArm3D", "SpringBoneCollision3D", "SpringBoneCollisionCapsule3D", "SpringBoneCollisionPlane3D",
+    "SpringBoneCollisionSphere3D", "SpringBoneSimulator3D", "Sprite2D", "Sprite3D", "SpriteBase3D", "StaticBody2D",
+    "StaticBody3D", "StatusIndicator", "SubViewport", "SubViewportContainer", "TabBar", "TabContainer", "TextEdit",
+    "TextureButton", "TextureProgressBar", "TextureRect", "TileMap", "TileMapLayer", "Timer", "TouchScreenButton",
+    "Tree", "TwoBoneIK3D", "VBoxContainer", "VehicleBody3D", "VehicleWheel3D", "VFlowContainer", "VideoStreamPlayer",
+    "Viewport", "VirtualJoystick", "VisibleOnScreenEnabler2D", "VisibleOnScreenEnabler3D", "VisibleOnScreenNotifier2D",
+    "VisibleOnScreenNotifier3D", "VisualInstance3D", "VoxelGI", "VScrollBar", "VSeparator", "VSlider",
+    "VSplitContainer", "Window", "WorldEnvironment", "XRAnchor3D", "XRBodyModifier3D", "XRCamera3D", "XRController3D",
+    "XRFaceModifier3D", "XRHandModifier3D", "XRNode3D", "XROrigin3D", "Resource", "AnimatedTexture", "Animation",
+    "AnimationLibrary", "AnimationNode", "AnimationNodeAdd2", "AnimationNodeAdd3", "AnimationNodeAnimation",
+    "AnimationNodeBlend2", "AnimationNodeBlend3", "AnimationNodeBlendSpace1D", "AnimationNodeBlendSpace2D",
+    "AnimationNodeBlendTree", "AnimationNodeExtension", "AnimationNodeOneShot", "AnimationNodeOutput",
+    "AnimationNodeStateMachine", "AnimationNodeStateMachinePlayback", "AnimationNodeStateMachineTransition",
+    "AnimationNodeSub2", "AnimationNodeSync", "AnimationNodeTimeScale", "AnimationNodeTimeSeek",
+    "AnimationNodeTransition", "AnimationRootNode", "ArrayMesh", "ArrayOccluder3D", "AtlasTexture", "AudioBusLayout",
+    "AudioEffect", "AudioEffectAmplify", "AudioEffectBandLimitFilter", "AudioEffectBandPassFilter",
+    "AudioEffectCapture", "AudioEffectChorus", "AudioEffectCompressor", "AudioEffectDelay", "AudioEffectDistortion",
+    "AudioEffectEQ", "AudioEffectEQ10", "AudioEffectEQ21", "AudioEffectEQ6", "AudioEffectFilter",
+    "AudioEffectHardLimiter", "AudioEffectHighPassFilter", "AudioEffectHighShelfFilter", "AudioEffectLimiter",
+    "AudioEffectLowPassFilter", "AudioEffectLowShelfFilter", "AudioEffectNotchFilter", "AudioEffectPanner",
+    "AudioEffectPhaser", "AudioEffectPitchShift", "AudioEffectRecord", "AudioEffectReverb",
+    "AudioEffectSpectrumAnalyzer", "AudioEffectStereoEnhance", "AudioStream", "AudioStreamGenerator",
+    "AudioStreamInteractive", "AudioStreamMicrophone", "AudioStreamMP3", "AudioStreamOggVorbis", "AudioStreamPlaylist",
+    "AudioStreamPolyphonic", "AudioStreamRandomizer", "AudioStreamSynchronized", "AudioStreamWAV", "BaseMaterial3D",
+    "BitMap", "BlitMaterial", "BoneMap", "BoxMesh", "BoxOccluder3D", "BoxShape3D", "ButtonGroup", "CameraAttributes",
+    "CameraAttributesPhysical", "CameraAttributesPractical", "CameraTexture", "CanvasItemMaterial", "CanvasTexture",
+    "CapsuleMesh", "CapsuleShape2D", "CapsuleShape3D", "CircleShape2D", "CodeHighlighter", "ColorPalette", "Compositor",
+    "CompositorEffect", "CompressedCubemap", "CompressedCubemapArray", "CompressedTexture2D",
+    "CompressedTexture2DArray", "CompressedTexture3D", "CompressedTextureLayered", "ConcavePolygonShape2D",
+    "ConcavePolygonShape3D", "ConvexPolygonShape2D", "ConvexPolygonShape3D", "CryptoKey", "CSharpScript", "Cubemap",
+    "CubemapArray", "Curve", "Curve2D", "Curve3D", "CurveTexture", "CurveXYZTexture", "CylinderMesh", "CylinderShape3D",
+    "DPITexture", "DrawableTexture2D", "EditorNode3DGizmoPlugin", "EditorSettings", "EditorSyntaxHighlighter",
+    "Environment", "ExternalTexture", "FastNoiseLite", "FBXDocument", "FBXState", "FogMaterial", "FoldableGroup",
+    "Font", "FontFile", "FontVariation", "GDExtension", "GDScript", "GDScriptSyntaxHighlighter", "GLTFAccessor",
+    "GLTFAnimation", "GLTFBufferView", "GLTFCamera", "GLTFDocument", "GLTFDocumentExtension",
+    "GLTFDocumentExtensionConvertImporterMesh", "GLTFLight", "GLTFMesh", "GLTFNode", "GLTFPhysicsBody",
+    "GLTFPhysicsShape", "GLTFSkeleton", "GLTFSkin", "GLTFSpecGloss", "GLTFState", "GLTFTexture", "GLTFTextureSampler",
+    "Gradient", "GradientTexture1D", "GradientTexture2D", "HeightMapShape3D", "Image", "ImageTexture", "ImageTexture3D",
+    "ImageTextureLayered", "ImmediateMesh", "ImporterMesh", "InputEvent", "InputEventAction", "InputEventFromWindow",
+    "InputEventGesture", "InputEventJoypadButton", "InputEventJoypadMotion", "InputEventKey",
+    "InputEventMagnifyGesture", "InputEventMIDI", "InputEventMouse", "InputEventMouseButton", "InputEventMouseMotion",
+    "InputEventPanGesture", "InputEventScreenDrag", "InputEventScreenTouch", "InputEventShortcut",
+    "InputEventWithModifiers", "JointLimitation3D", "JointLimitationCone3D", "JSON", "LabelSettings", "LightmapGIData",
+    "Material", "Mesh", "MeshLibrary", "MeshTexture", "MissingResource", "MultiMesh", "NavigationMesh",
+    "NavigationMeshSourceGeometryData2D", "NavigationMeshSourceGeometryData3D", "NavigationPolygon", "Noise",
+    "NoiseTexture2D", "NoiseTexture3D", "Occluder3D", "OccluderPolygon2D", "OggPacketSequence", "OpenXRAction",
+    "OpenXRActionBindingModifier", "OpenXRActionMap", "OpenXRActionSet", "OpenXRAnalogThresholdModifier",
+    "OpenXRBindingModifier", "OpenXRDpadBindingModifier", "OpenXRHapticBase", "OpenXRHapticVibration",
+    "OpenXRInteractionProfile", "OpenXRIPBinding", "OpenXRIPBindingModifier", "OptimizedTranslation", "ORMMaterial3D",
+    "PackedDataContainer", "PackedScene", "PanoramaSkyMaterial", "ParticleProcessMaterial", "PhysicalSkyMaterial",
+    "PhysicsMaterial", "PlaceholderCubemap", "PlaceholderCubemapArray", "PlaceholderMaterial", "PlaceholderMesh",
+    "PlaceholderTexture2D", "PlaceholderTexture2DArray", "PlaceholderTexture3D", "PlaceholderTextureLayered",
+    "PlaneMesh", "PointMesh", "PolygonOccluder3D", "PolygonPathFinder", "PortableCompressedTexture2D", "PrimitiveMesh",
+    "PrismMesh", "ProceduralSkyMaterial", "QuadMesh", "QuadOccluder3D", "RDShaderFile", "RDShaderSPIRV",
+    "RectangleShape2D", "RibbonTrailMesh", "RichTextEffect", "SceneReplicationConfig", "Script", "ScriptExtension",
+    "SegmentShape2D", "SeparationRayShape2D", "SeparationRayShape3D", "Shader", "ShaderInclude", "ShaderMaterial",
+    "Shape2D", "Shape3D", "Shortcut", "SkeletonModification2D", "SkeletonModification2DCCDIK",
+    "SkeletonModification2DFABRIK", "SkeletonModification2DJiggle", "SkeletonModification2DLookAt",
+    "SkeletonModification2DPhysicalBones", "SkeletonModification2DStackHolder", "SkeletonModification2DTwoBoneIK",
+    "SkeletonModificationStack2D", "SkeletonProfile", "SkeletonProfileHumanoid", "Skin", "Sky", "SphereMesh",
+    "SphereOccluder3D", "SphereShape3D", "SpriteFrames", "StandardMaterial3D", "StyleBox", "StyleBoxEmpty",
+    "StyleBoxFlat", "StyleBoxLine", "StyleBoxTexture", "SyntaxHighlighter", "SystemFont", "TextMesh", "Texture",
+    "Texture2D", "Texture2DArray", "Texture2DArrayRD", "Texture2DRD", "Texture3D", "Texture3DRD",
+    "TextureCubemapArrayRD", "TextureCubemapRD", "TextureLayered", "TextureLayeredRD", "Theme", "TileMapPattern",
+    "TileSet", "TileSetAtlasSource", "TileSetScenesCollectionSource", "TileSetSource", "TorusMesh", "Translation",
+    "TubeTrailMesh", "VideoStream", "VideoStreamPlayback", "VideoStreamTheora", "ViewportTexture", "VisualShader",
+    "VisualShaderNode", "VisualShaderNodeBillboard", "VisualShaderNodeBooleanConstant",
+    "VisualShaderNodeBooleanParameter", "VisualShaderNodeClamp", "VisualShaderNodeColorConstant",
+    "VisualShaderNodeColorFunc", "VisualShaderNodeColorOp", "VisualShaderNodeColorParameter", "VisualShaderNodeComment",
+    "VisualShaderNodeCompare", "VisualShaderNodeConstant", "VisualShaderNodeCubemap",
+    "VisualShaderNodeCubemapParameter", "VisualShaderNodeCurveTexture", "VisualShaderNodeCurveXYZTexture",
+    "VisualShaderNodeCustom", "VisualShaderNodeDerivativeFunc", "VisualShaderNodeDeterminant",
+    "VisualShaderNodeDistanceFade", "VisualShaderNodeDotProduct", "VisualShaderNodeExpression",
+    "VisualShaderNodeFaceForward", "VisualShaderNodeFloatConstant", "VisualShaderNodeFloatFunc",
+    "VisualShaderNodeFloatOp", "VisualShaderNodeFloatParameter", "VisualShaderNodeFrame", "VisualShaderNodeFresnel",
+    "VisualShaderNodeGlobalExpression", "VisualShaderNodeGroupBase", "VisualShaderNodeIf", "VisualShaderNodeInput",
+    "VisualShaderNodeIntConstant", "VisualShaderNodeIntFunc", "VisualShaderNodeIntOp", "VisualShaderNodeIntParameter",
+    "VisualShaderNodeIs", "VisualShaderNodeLinearSceneDepth", "VisualShaderNodeMix", "VisualShaderNodeMultiplyAdd",
+    "VisualShaderNodeOuterProduct", "VisualShaderNodeOutput", "VisualShaderNodeParameter",
+    "VisualShaderNodeParameterRef", "VisualShaderNodeParticleAccelerator", "VisualShaderNodeParticleBoxEmitter",
+    "VisualShaderNodeParticleConeVelocity", "VisualShaderNodeParticleEmit", "VisualShaderNodeParticleEmitter",
+    "VisualShaderNodeParticleMeshEmitter", "VisualShaderNodeParticleMultiplyByAxisAngle",
+    "VisualShaderNodeParticleOutput", "VisualShaderNodeParticleRandomness", "VisualShaderNodeParticleRingEmitter",
+    "VisualShaderNodeParticleSphereEmitter", "VisualShaderNodeProximityFade", "VisualShaderNodeRandomRange",
+    "VisualShaderNodeRemap", "VisualShaderNodeReroute", "VisualShaderNodeResizableBase",
+    "VisualShaderNodeRotationByAxis", "VisualShaderNodeSample3D", "VisualShaderNodeScreenNormalWorldSpace",
+    "VisualShaderNodeScreenUVToSDF", "VisualShaderNodeSDFRaymarch", "VisualShaderNodeSDFToScreenUV",
+    "VisualShaderNodeSmoothStep", "VisualShaderNodeStep", "VisualShaderNodeSwitch", "VisualShaderNodeTexture",
+    "VisualShaderNodeTexture2DArray", "VisualShaderNodeTexture2DArrayParameter", "VisualShaderNodeTexture2DParameter",
+    "VisualShaderNodeTexture3D", "VisualShaderNodeTexture3DParameter", "VisualShaderNodeTextureParameter",
+    "VisualShaderNodeTextureParameterTriplanar", "VisualShaderNodeTextureSDF", "VisualShaderNodeTextureSDFNormal",
+    "VisualShaderNodeTransformCompose", "VisualShaderNodeTransformConstant", "VisualShaderNodeTransformDecompose",
+    "VisualShaderNodeTransformFunc", "VisualShaderNodeTransformOp", "VisualShaderNodeTransformParameter",
+    "VisualShaderNodeTransformVecMult", "VisualShaderNodeUIntConstant", "VisualShaderNodeUIntFunc",
+    "VisualShaderNodeUIntOp", "VisualShaderNodeUIntParameter", "VisualShaderNodeUVFunc", "VisualShaderNodeUVPolarCoord",
+    "VisualShaderNodeVarying", "VisualShaderNodeVaryingGetter", "VisualShaderNodeVaryingSetter",
+    "VisualShaderNodeVec2Constant", "VisualShaderNodeVec2Parameter", "VisualShaderNodeVec3Constant",
+    "VisualShaderNodeVec3Parameter", "VisualShaderNodeVec4Constant", "VisualShaderNodeVec4Parameter",
+    "VisualShaderNodeVectorBase", "VisualShaderNodeVectorCompose", "VisualShaderNodeVectorDecompose",
+    "VisualShaderNodeVectorDistance", "VisualShaderNodeVectorFunc", "VisualShaderNodeVectorLen",
+    "VisualShaderNodeVectorOp", "VisualShaderNodeVectorRefract", "VisualShaderNodeWorldPositionFromDepth",
+    "VoxelGIData", "World2D", "World3D", "WorldBoundaryShape2D", "WorldBoundaryShape3D", "X509Certificate", "Object",
+    "AccessibilityServer", "AESContext", "AStar2D", "AStar3D", "AStarGrid2D", "AudioEffectInstance",
+    "AudioEffectSpectrumAnalyzerInstance", "AudioSample", "AudioSamplePlayback", "AudioServer",
+    "AudioStreamGeneratorPlayback", "AudioStreamPlayback", "AudioStreamPlaybackInteractive",
+    "AudioStreamPlaybackOggVorbis", "AudioStreamPlaybackPlaylist", "AudioStreamPlaybackPolyphonic",
+    "AudioStreamPlaybackResampled", "AudioStreamPlaybackSynchronized", "AwaitTweener", "CallbackTweener", "CameraFeed",
+    "CameraServer", "CharFXTransform", "ClassDB", "ConfigFile", "Crypto", "DirAccess", "DisplayServer", "DTLSServer",
+    "EditorContextMenuPlugin", "EditorDebuggerPlugin", "EditorDebuggerSession", "EditorExportPlatform",
+    "EditorExportPlatformAndroid", "EditorExportPlatformAppleEmbedded", "EditorExportPlatformExtension",
+    "EditorExportPlatformIOS", "EditorExportPlatformLinuxBSD", "EditorExportPlatformMacOS", "EditorExportPlatformPC",
+    "EditorExportPlatformVisionOS", "EditorExportPlatformWeb", "EditorExportPlatformWindows", "EditorExportPlugin",
+    "EditorExportPreset", "EditorFeatureProfile", "EditorFileSystemDirectory",
+    "EditorFileSystemImportFormatSupportQuery", "EditorImportPlugin", "EditorInspectorPlugin", "EditorInterface",
+    "EditorNode3DGizmo", "EditorPaths", "EditorResourceConversionPlugin", "EditorResourcePreviewGenerator",
+    "EditorResourceTooltipPlugin", "EditorSceneFormatImporter", "EditorSceneFormatImporterBlend",
+    "EditorSceneFormatImporterFBX2GLTF", "EditorSceneFormatImporterGLTF", "EditorSceneFormatImporterUFBX",
+    "EditorScenePostImport", "EditorScenePostImportPlugin", "EditorScript", "EditorSelection",
+    "EditorTranslationParserPlugin", "EditorUndoRedoManager", "EditorVCSInterface", "EncodedObjectAsID",
+    "ENetConnection", "ENetMultiplayerPeer", "ENetPacketPeer", "Engine", "EngineDebugger", "EngineProfiler",
+    "Expression", "FileAccess", "FramebufferCacheRD", "GDExtensionManager", "GDScriptLanguageProtocol",
+    "GDScriptTextDocument", "GDScriptWorkspace", "Geometry2D", "Geometry3D", "GLTFObjectModelProperty", "GodotInstance",
+    "HashingContext", "HMACContext", "HTTPClient", "ImageFormatLoader", "ImageFormatLoaderExtension", "Input",
+    "InputMap", "IntervalTweener", "IP", "JavaClass", "JavaClassWrapper", "JavaObject", "JavaScriptBridge",
+    "JavaScriptObject", "JNISingleton", "JSONRPC", "KinematicCollision2D", "KinematicCollision3D", "Lightmapper",
+    "LightmapperRD", "Logger", "MainLoop", "Marshalls", "MeshConvexDecompositionSettings", "MeshDataTool",
+    "MethodTweener", "MobileVRInterface", "MovieWriter", "MultiplayerAPI", "MultiplayerAPIExtension", "MultiplayerPeer",
+    "MultiplayerPeerExtension", "Mutex", "NativeMenu", "NavigationMeshGenerator", "NavigationPathQueryParameters2D",
+    "NavigationPathQueryParameters3D", "NavigationPathQueryResult2D", "NavigationPathQueryResult3D",
+    "NavigationServer2D", "NavigationServer2DManager", "NavigationServer3D", "NavigationServer3DManager", "Node3DGizmo",
+    "OfflineMultiplayerPeer", "OggPacketSequencePlayback", "OpenXRAnchorTracker",
+    "OpenXRAndroidThreadSettingsExtension", "OpenXRAPIExtension", "OpenXRExtensionWrapper",
+    "OpenXRExtensionWrapperExtension", "OpenXRFrameSynthesisExtension", "OpenXRFutureExtension", "OpenXRFutureResult",
+    "OpenXRInteractionProfileMetadata", "OpenXRInterface", "OpenXRMarkerTracker", "OpenXRPlaneTracker",
+    "OpenXRRenderModelExtension", "OpenXRSpatialAnchorCapability", "OpenXRSpatialCapabilityConfigurationAnchor",
+    "OpenXRSpatialCapabilityConfigurationAprilTag", "OpenXRSpatialCapabilityConfigurationAruco",
+    "OpenXRSpatialCapabilityConfigurationBaseHeader", "OpenXRSpatialCapabilityConfigurationMicroQrCode",
+    "OpenXRSpatialCapabilityConfigurationPlaneTracking", "OpenXRSpatialCapabilityConfigurationQrCode",
+    "OpenXRSpatialComponentAnchorList", "OpenXRSpatialComponentBounded2DList", "OpenXRSpatialComponentBounded3DList",
+    "OpenXRSpatialComponentData", "OpenXRSpatialComponentMarkerList", "OpenXRSpatialComponentMesh2DList",
+    "OpenXRSpatialComponentMesh3DList", "OpenXRSpatialComponentParentList", "OpenXRSpatialComponentPersistenceList",
+    "OpenXRSpatialComponentPlaneAlignmentList", "OpenXRSpatialComponentPlaneSemanticLabelList",
+    "OpenXRSpatialComponentPolygon2DList", "OpenXRSpatialContextPersistenceConfig", "OpenXRSpatialEntityExtension",
+    "OpenXRSpatialEntityTracker", "OpenXRSpatialMarkerTrackingCapability", "OpenXRSpatialPlaneTrackingCapability",
+    "OpenXRSpatialQueryResultData", "OpenXRStructureBase", "OS", "PackedDataContainerRef", "PacketPeer",
+    "PacketPeerDTLS", "PacketPeerExtension", "PacketPeerStream", "PacketPeerUDP", "PCKPacker", "Performance",
+    "PhysicsDirectBodyState2D", "PhysicsDirectBodyState2DExtension", "PhysicsDirectBodyState3D",
+    "PhysicsDirectBodyState3DExtension", "PhysicsDirectSpaceState2D", "PhysicsDirectSpaceState2DExtension",
+    "PhysicsDirectSpaceState3D", "PhysicsDirectSpaceState3DExtension", "PhysicsPointQueryParameters2D",
+    "PhysicsPointQueryParameters3D", "PhysicsRayQueryParameters2D", "PhysicsRayQueryParameters3D", "PhysicsServer2D",
+    "PhysicsServer2DExtension", "PhysicsServer2DManager", "PhysicsServer3D", "PhysicsServer3DExtension",
+    "PhysicsServer3DManager", "PhysicsServer3DRenderingServerHandler", "PhysicsShapeQueryParameters2D",
+    "PhysicsShapeQueryParameters3D", "PhysicsTestMotionParameters2D", "PhysicsTestMotionParameters3D",
+    "PhysicsTestMotionResult2D", "PhysicsTestMotionResult3D", "ProjectSettings", "PropertyTweener",
+    "RandomNumberGenerator", "RDAccelerationStructureGeometry", "RDAccelerationStructureInstance", "RDAttachmentFormat",
+    "RDFramebufferPass", "RDHitGroup", "RDPipelineColorBlendState", "RDPipelineColorBlendStateAttachment",
+    "RDPipelineDepthStencilState", "RDPipelineMultisampleState", "RDPipelineRasterizationState", "RDPipelineShader",
+    "RDPipelineSpecializationConstant", "RDSamplerState", "RDShaderSource", "RDTextureFormat", "RDTextureView",
+    "RDUniform", "RDVertexAttribute", "RefCounted", "RegEx", "RegExMatch", "RenderData", "RenderDataExtension",
+    "RenderDataRD", "RenderingDevice", "RenderingServer", "RenderSceneBuffers", "RenderSceneBuffersConfiguration",
+    "RenderSceneBuffersExtension", "RenderSceneBuffersRD", "RenderSceneData", "RenderSceneDataExtension",
+    "RenderSceneDataRD", "ResourceFormatLoader", "ResourceFormatSaver", "ResourceImporter", "ResourceImporterBitMap",
+    "ResourceImporterBMFont", "ResourceImporterCSVTranslation", "ResourceImporterDynamicFont", "ResourceImporterImage",
+    "ResourceImporterImageFont", "ResourceImporterLayeredTexture", "ResourceImporterMP3", "ResourceImporterOBJ",
+    "ResourceImporterOggVorbis", "ResourceImporterScene", "ResourceImporterShaderFile", "ResourceImporterSVG",
+    "ResourceImporterTexture", "ResourceImporterTextureAtlas", "ResourceImporterWAV", "ResourceLoader", "ResourceSaver",
+    "ResourceUID", "SceneMultiplayer", "SceneState", "SceneTree", "SceneTreeTimer", "ScriptBacktrace", "ScriptLanguage",
+    "ScriptLanguageExtension", "Semaphore", "ShaderIncludeDB", "SkinReference", "SocketServer", "StreamPeer",
+    "StreamPeerBuffer", "StreamPeerExtension", "StreamPeerGZIP", "StreamPeerSocket", "StreamPeerTCP", "StreamPeerTLS",
+    "StreamPeerUDS", "SubtweenTweener", "SurfaceTool", "TCPServer", "TextLine", "TextParagraph", "TextServer",
+    "TextServerAdvanced", "TextServerDummy", "TextServerExtension", "TextServerFallback", "TextServerManager",
+    "ThemeDB", "Thread", "TileData", "Time", "TLSOptions", "TranslationDomain", "TranslationServer", "TreeItem",
+    "TriangleMesh", "Tween", "Tweener", "UDPServer", "UDSServer", "UndoRedo", "UniformSetCacheRD", "UPNP", "UPNPDevice",
+    "WeakRef", "WebRTCDataChannel", "WebRTCDataChannelExtension", "WebRTCMultiplayerPeer", "WebRTCPeerConnection",
+    "WebRTCPeerConnectionExtension", "WebSocketMultiplayerPeer", "WebSocketPeer", "WebXRInterface", "WorkerThreadPool",
+    "XMLParser", "XRBodyTracker", "XRControllerTracker", "XRFaceTracker", "XRHandTracker", "XRInterface",
+    "XRInterfaceExtension", "XRPose", "XRPositionalTracker", "XRServer", "XRTracker", "XRVRS", "ZIPPacker", "ZIPReader",
+)
+
+# Annotations of @GDScript.
+ANNOTATIONS = (
+    "@abstract", "@export", "@export_category", "@export_color_no_alpha", "@export_custom", "@export_dir",
+    "@export_enum", "@export_exp_easing", "@export_file", "@export_file_path", "@export_flags",
+    "@export_flags_2d_navigation", "@export_flags_2d_physics", "@export_flags_2d_render", "@export_flags_3d_navigation",
+    "@export_flags_3d_physics", "@export_flags_3d_render", "@export_flags_avoidance", "@export_global_dir",
+    "@export_global_file", "@export_group", "@export_multiline", "@export_node_path", "@export_placeholder",
+    "@export_range", "@export_storage", "@export_subgroup", "@export_tool_button", "@icon", "@onready", "@rpc",
+    "@static_unload", "@tool", "@warning_ignore", "@warning_ignore_restore", "@warning_ignore_start",
+)
@@ -17,6 +17,9 @@ import re
 from docutils import nodes
 from sphinx import addnodes
 
+# Matches runs of whitespace, including newlines.
+WHITESPACE_REGEX = re.compile(r"\s+")
+
 
 class DescriptionGenerator:
     def __init__(self, document, pagename="", n_sections_max=3, max_length=220):
@@ -29,57 +32,68 @@ class DescriptionGenerator:
         self.pagename = pagename
         self.is_class = pagename.startswith("classes/")
         self.stop_word_reached = False
+        # Whether the description depends on the doctree being resolved for
+        # the builder (see `read_description()`).
+        self.needs_resolving = False
 
     def dispatch_visit(self, node):
-        if (
-            self.stop_word_reached
-            or self.current_length > self.max_length
-            or self.n_sections > self.n_sections_max
-        ):
-            return
-
         if isinstance(node, addnodes.compact_paragraph) and node.get("toctree"):
             raise nodes.SkipChildren
 
-        add = True
+        if isinstance(node, addnodes.only):
+            # Only kept or removed once the builder tags are known.
+            self.needs_resolving = True
 
         if isinstance(node, nodes.paragraph):
-            text = node.astext()
-
-            if self.is_class:
-                # Skip OOP hierarchy info for description
-                if (
-                    text.startswith("Inherits:")
-                    or text.startswith("Inherited By:")
-                    or text.strip() == "Example:"
-                ):
-                    add = False
-
-                # If we're in a class doc and reached the first table,
-                # stop adding to the description
-                if text.strip() == "Properties":
-                    self.stop_word_reached = True
-                    add = False
-
-            if add:
-                self.text_list.append(text)
-                self.current_length = self.current_length + len(text)
-
-        if add and isinstance(node, nodes.section):
+            # The paragraph text covers all its children, no need to visit them.
+            self.visit_paragraph(node)
+            self.check_budget()
+            raise nodes.SkipChildren
+
+        if isinstance(node, nodes.section):
             self.n_sections += 1
+            self.check_budget()
+
+    def visit_paragraph(self, node):
+        text = node.astext()
+
+        if self.is_class:
+            stripped = text.strip()
+
+            # If we're in a class doc and reached the first table,
+            # stop adding to the description
+            if stripped == "Properties":
+                self.stop_word_reached = True
+                return
+
+            # Skip OOP hierarchy info for description
+            if text.startswith(("Inherits:", "Inherited By:")) or stripped == "Example:":
+                return
+
+        self.text_list.append(text)
+        self.current_length += len(text)
+
+        if not self.needs_resolving:
+            self.needs_resolving = any(has_pending_title(xref) for xref in node.findall(addnodes.pending_xref))
+
+    def check_budget(self):
+        # Stop the traversal as soon as there's enough text, instead of visiting the rest of the page.
+        if (
+            self.stop_word_reached
+            or self.current_length > self.max_length
+            or self.n_sections > self.n_sections_max
+        ):
+            raise nodes.StopTraversal
 
     def dispatch_departure(self, node):
         pass
 
     def format_description(self, desc):
-        # Replace newlines with spaces
-        desc = re.sub("\r|\n", " ", desc)
-
-        # Replace multiple spaces with single spaces
-        desc = re.sub("\\s+", " ", desc)
+        # Replace newlines and multiple spaces with single spaces
+        desc = WHITESPACE_REGEX.sub(" ", desc)
 
         # Escape double quotes for HTML
-        desc = re.sub('"', "&quot;", desc)
+        desc = desc.replace('"', "&quot;")
 
         return desc
 
@@ -95,27 +109,74 @@ class DescriptionGenerator:
         return text
 
 
+def has_pending_title(xref):
+    # References such as :ref:`label` or :doc:`page` without an explicit title
+    # display the title of their target, which is only filled in when the
+    # references are resolved during the write phase.
+    return not xref.get("refexplicit") and xref.get("reftype") in ("ref", "doc", "numref")
+
+
+def read_description(app, doctree):
+    # Descriptions are computed when a document is read and kept in the
+    # environment, so incremental builds don't have to recompute them for
+    # documents that weren't read again.
+    env = app.env
+    if not hasattr(env, "godot_descriptions"):
+        env.godot_descriptions = {}
+
+    generator = DescriptionGenerator(doctree, env.docname)
+    doctree.walkabout(generator)
+
+    if generator.needs_resolving:
+        # Computed from the resolved doctree in `generate_description()` instead.
+        env.godot_descriptions[env.docname] = None
+    else:
+        env.godot_descriptions[env.docname] = generator.create_description()
+
+
+def purge_description(app, env, docname):
+    if hasattr(env, "godot_descriptions"):
+        env.godot_descriptions.pop(docname, None)
+
+
+def merge_descriptions(app, env, docnames, other):
+    # Documents read by parallel workers are merged into the main environment.
+    if not hasattr(env, "godot_descriptions"):
+        env.godot_descriptions = {}
+    other_descriptions = getattr(other, "godot_descriptions", {})
+    for docname in docnames:
+        if docname in other_descriptions:
+            env.godot_descriptions[docname] = other_descriptions[docname]
+
+
 def generate_description(app, pagename, templatename, context, doctree):
     if not doctree:
         return
 
-    generator = DescriptionGenerator(doctree, pagename)
-    doctree.walkabout(generator)
+    description = getattr(app.env, "godot_descriptions", {}).get(pagename)
+    if description is None:
+        generator = DescriptionGenerator(doctree, pagename)
+        doctree.walkabout(generator)
+        description = generator.create_description()
 
-    description = (
-        '<meta name="description" content="' + generator.create_description() + '" />\n'
-    )
+    description = '<meta name="description" content="' + description + '" />\n'
 
     if not '<meta name="description"' in context["metatags"]:
         context["metatags"] += description
 
 
 def setup(app):
+    app.connect("doctree-read", read_description)
+    app.connect("env-purge-doc", purge_description)
+    app.connect("env-merge-info", merge_descriptions)
+
     # Hook into Sphinx for all pages to
     # generate meta description tag and add to meta tag list
     app.connect("html-page-context", generate_description)
 
     return {
+        # Bump this when the generated descriptions change, so they're computed again.
+        "env_version": 1,
         "parallel_read_safe": True,
         "parallel_write_safe": True,
     }
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+    highlight_cache
+    ~~~~~~~~~~~~~~~
+
+    Sphinx extension to keep a persistent, content-addressed cache of
+    highlighted code blocks, so unchanged code blocks don't have to be
+    tokenized by Pygments again on every build.
+
+    :copyright: Copyright 2026 by The Godot Engine Community
+    :license: MIT.
+"""
+
+import hashlib
+import importlib
+import inspect
+import logging as std_logging
+import multiprocessing
+import os
+import tempfile
+
+import pygments
+from sphinx.highlighting import lexer_classes, lexers
+from sphinx.util import logging
+from sphinx.util.console import bold
+
+logger = logging.getLogger(__name__)
+
+# Bump this whenever the format of the cached entries changes.
+CACHE_VERSION = "1"
+
+# Sphinx warns through this logger when a block can't be lexed in the
+# requested language. Such blocks are never cached, so the warning isn't
+# silently lost on the next build.
+HIGHLIGHTING_LOGGER = "sphinx.sphinx.highlighting"
+
+
+class HighlightingWarningFlag(std_logging.Filter):
+    def __init__(self):
+        super().__init__()
+        self.raised = False
+
+    def filter(self, record):
+        if record.levelno >= std_logging.WARNING:
+            self.raised = True
+        return True
+
+
+class HighlightCache:
+    def __init__(self, path, max_size, style):
+        self.path = path
+        self.max_size = max_size
+        self.style = style
+        self.lexer_fingerprints = {}
+        self.warning_flag = HighlightingWarningFlag()
+        std_logging.getLogger(HIGHLIGHTING_LOGGER).addFilter(self.warning_flag)
+
+        # Writing happens in forked worker processes when building with -j,
+        # so counters live in shared memory to be visible at the end of the build.
+        self.hits = multiprocessing.Value("L", 0)
+        self.misses = multiprocessing.Value("L", 0)
+
+    def lexer_fingerprint(self, lang):
+        """Returns a string that changes whenever the lexer used for `lang` may
+        produce different tokens, i.e. when the Pygments version or the source
+        of a custom lexer (such as our GDScript lexer) changes, or `None` if the
+        source of the lexer can't be read (code blocks aren't cached then)."""
+        fingerprint = self.lexer_fingerprints.get(lang)
+        if fingerprint is not None:
+            return fingerprint
+
+        fingerprint = pygments.__version__
+        # Lexers added with `app.add_lexer` are in `lexer_classes` (possibly as partials),
+        # while `lexers` only has instances set up front.
+        if lang in lexers:
+            lexer_class = type(lexers[lang])
+        else:
+            lexer_class = getattr(lexer_classes.get(lang), "func", lexer_classes.get(lang))
+        if lexer_class is not None:
+            fingerprint += ":" + lexer_class.__module__ + "." + lexer_class.__name__
+            try:
+                paths = [inspect.getsourcefile(lexer_class)]
+                for module in getattr(lexer_class, "source_dependencies", ()):
+                    paths.append(inspect.getsourcefile(importlib.import_module(module)))
+                for path in paths:
+                    with open(path, "rb") as f:
+                        fingerprint += ":" + hashlib.sha256(f.read()).hexdigest()
+            except (ImportError, OSError, TypeError) as e:
+                # Not memoized, so it's tried again for the next code block.
+                logger.debug("highlight cache: could not hash the source of the %s lexer: %s", lang, e)
+                return None
+
+        self.lexer_fingerprints[lang] = fingerprint
+        return fingerprint
+
+    def key(self, source, lang, opts, force, kwargs):
+        fingerprint = self.lexer_fingerprint(lang)
+        if fingerprint is None:
+            return None
+        options = (sorted((opts or {}).items()), sorted(kwargs.items()))
+        digest = hashlib.sha256()
+        for part in (
+            CACHE_VERSION,
+            self.style,
+            lang,
+            fingerprint,
+            repr(force),
+            repr(options),
+            source,
+        ):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.path, key[:2], key + ".html")
+
+    def load(self, key):
+        path = self.entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                html = f.read()
+        except OSError:
+            return None
+
+        # The modification time is used as the "last used" time for eviction.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return html
+
+    def store(self, key, html):
+        path = self.entry_path(key)
+        directory = os.path.dirname(path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            # Write to a temporary file first, as several worker processes may
+            # highlight the same code block at the same time.
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(html)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug("highlight cache: could not store %s: %s", path, e)
+
+    def increment(self, counter):
+        with counter.get_lock():
+            counter.value += 1
+
+    def wrap(self, highlight_block):
+        def cached_highlight_block(source, lang, opts=None, force=False, location=None, **kwargs):
+            if not isinstance(source, str):
+                source = source.decode()
+
+            key = self.key(source, lang, opts, force, kwargs)
+            if key is None:
+                return highlight_block(source, lang, opts, force, location, **kwargs)
+            html = self.load(key)
+            if html is not None:
+                self.increment(self.hits)
+                return html
+
+            self.increment(self.misses)
+            self.warning_flag.raised = False
+            html = highlight_block(source, lang, opts, force, location, **kwargs)
+            if not self.warning_flag.raised:
+                self.store(key, html)
+            return html
+
+        return cached_highlight_block
+
+    def prune(self):
+        """Removes the least recently used entries until the cache fits in `max_size` bytes.
+        Returns the number of removed entries."""
+        entries = []
+        total_size = 0
+        for root, _, files in os.walk(self.path):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if name.endswith(".tmp"):
+                    # Leftover from an interrupted build.
+                    os.remove(path)
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total_size += stat.st_size
+
+        removed = 0
+        if total_size > self.max_size:
+            entries.sort()
+            for _, size, path in entries:
+                if total_size <= self.max_size:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total_size -= size
+                removed += 1
+        return removed
+
+
+def init_cache(app):
+    builder = app.builder
+    if not app.config.highlight_cache_enabled or builder.format != "html" or not hasattr(builder, "highlighter"):
+        return
+
+    path = app.config.highlight_cache_dir
+    if not path:
+        path = os.path.join(os.path.dirname(app.doctreedir), "highlight_cache")
+
+    cache = HighlightCache(path, app.config.highlight_cache_max_size, str(app.config.pygments_style))
+    builder.highlighter.highlight_block = cache.wrap(builder.highlighter.highlight_block)
+    app.godot_highlight_cache = cache
+
+
+def report_cache(app, exception):
+    cache = getattr(app, "godot_highlight_cache", None)
+    if cache is None or exception is not None:
+        return
+
+    removed = cache.prune()
+    hits = cache.hits.value
+    misses = cache.misses.value
+    total = hits + misses
+    logger.info(
+        bold("highlight cache: ") + "%d hits, %d misses (%.1f%% hit rate), %d entries evicted",
+        hits,
+        misses,
+        100.0 * hits / total if total else 0.0,
+        removed,
+    )
+
+
+def setup(app):
+    app.add_config_value("highlight_cache_enabled", True, "")
+    # Defaults to `highlight_cache` next to the doctrees directory (i.e. `_build/highlight_cache`).
+    app.add_config_value("highlight_cache_dir", "", "")
+    app.add_config_value("highlight_cache_max_size", 256 * 1024 * 1024, "")
+
+    app.connect("builder-inited", init_cache)
+    app.connect("build-finished", report_cache)
+
+    return {
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
@@ -1,10 +1,184 @@
 # -*- coding: utf-8 -*-
+"""
+    override_jobs
+    ~~~~~~~~~~~~~
+
+    Sphinx extension to pick the number of parallel jobs of the build.
+
+    Read the Docs doesn't let us pass `-j` to Sphinx, so on Read the Docs, the
+    number of jobs is set here from the CPUs and memory available to the
+    build, taking the cgroup limits of containers into account. `-j` is still
+    honored when it's given, and the `SPHINX_JOBS` environment variable
+    overrides both (either a number of jobs or `auto`), on any builder.
+
+    The number of jobs and the wall time of the read and write phases are
+    logged, to tune this on builders.
+
+    Sphinx splits documents into chunks handled by parallel jobs by count,
+    but the class reference has a few very large pages, and one job ends up
+    working alone at the end of the read phase. With `SPHINX_BALANCED_CHUNKS`
+    set, documents are instead read in one chunk per job, distributed by
+    their estimated cost, so chunks take about the same time. All of these
+    chunks start at once, so their order doesn't matter. Chunks of the write
+    phase are left to Sphinx: they start as doctrees are resolved, and the
+    waiting ones last added first, so balancing them isn't as predictable.
+
+    :copyright: Copyright 2026 by The Godot Engine Community
+    :license: MIT.
+"""
+
+import heapq
+import math
+import os
+import time
+
+import sphinx.builders
+from sphinx.util import logging
+from sphinx.util.build_phase import BuildPhase
+from sphinx.util.parallel import make_chunks
+
+logger = logging.getLogger(__name__)
+
+# Peak memory used by each job when building the whole documentation.
+MEMORY_PER_JOB = 1536 * 1024 * 1024
+
+# Estimated fixed cost of reading a document in bytes of source, on top of the size of its source,
+# measured with the build_profiler extension.
+READ_DOCUMENT_OVERHEAD = 8 * 1024
+
+phase_start_times = {}
+
+
+def read_cgroup_values(path):
+    try:
+        with open(path, encoding="utf-8") as file:
+            return file.read().split()
+    except OSError:
+        return None
+
+
+def get_cpu_count():
+    if hasattr(os, "sched_getaffinity"):
+        count = len(os.sched_getaffinity(0))
+    else:
+        count = os.cpu_count() or 1
+
+    # CPU quota of the container, with cgroup v2 ("<quota> <period>" or "max <period>") or v1.
+    quota = read_cgroup_values("/sys/fs/cgroup/cpu.max")
+    if quota is None:
+        quota = read_cgroup_values("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+        period = read_cgroup_values("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+        if quota and period:
+            quota += period
+    if quota and len(quota) == 2 and quota[0].isdigit() and quota[1].isdigit() and int(quota[1]) > 0:
+        count = min(count, math.ceil(int(quota[0]) / int(quota[1])))
+
+    return max(count, 1)
+
+
+def get_memory_size():
+    """Returns the memory available to the build in bytes, or `None` if unknown."""
+    try:
+        memory = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        memory = None
+
+    # Memory limit of the container, with cgroup v2 ("max" if unlimited) or v1.
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        limit = read_cgroup_values(path)
+        if limit is not None:
+            if limit and limit[0].isdigit():
+                memory = int(limit[0]) if memory is None else min(memory, int(limit[0]))
+            break
+
+    return memory
+
+
+def get_job_count():
+    """Returns the number of jobs to use when nothing is specified, and why."""
+    cpu_count = get_cpu_count()
+    memory = get_memory_size()
+    if memory is None:
+        return cpu_count, f"{cpu_count} CPUs"
+
+    jobs = max(1, min(cpu_count, memory // MEMORY_PER_JOB))
+    return jobs, f"{cpu_count} CPUs, {memory / 1024**3:.1f} GiB of memory"
+
+
+def make_balanced_chunks(docnames, chunk_count, cost):
+    """Distributes `docnames` into `chunk_count` chunks of similar total cost,
+    starting with the most costly documents, and returns the chunks from the
+    most costly."""
+    chunks = [(0, i, []) for i in range(min(chunk_count, len(docnames)))]
+    for docname in sorted(docnames, key=cost, reverse=True):
+        chunk_cost, i, chunk = heapq.heappop(chunks)
+        chunk.append(docname)
+        heapq.heappush(chunks, (chunk_cost + cost(docname), i, chunk))
+    return [chunk for _, _, chunk in sorted(chunks, reverse=True)]
+
+
+def install_balanced_chunks(app):
+    def get_source_size(docname):
+        try:
+            return os.path.getsize(app.env.doc2path(docname))
+        except OSError:
+            return 0
+
+    def make_cost_balanced_chunks(arguments, nproc, maxbatch=10):
+        if app.phase != BuildPhase.READING:
+            return make_chunks(arguments, nproc, maxbatch)
+        # Jobs send the whole environment back, so fewer chunks are cheaper.
+        return make_balanced_chunks(
+            arguments, nproc, lambda docname: get_source_size(docname) + READ_DOCUMENT_OVERHEAD
+        )
+
+    # Used by `Builder._read_parallel()` (and `Builder._write_parallel()`, which gets the chunks of Sphinx).
+    sphinx.builders.make_chunks = make_cost_balanced_chunks
+
+
+def on_env_before_read_docs(app, env, docnames):
+    phase_start_times.clear()
+    phase_start_times["reading"] = time.perf_counter()
+
+
+def on_env_updated(app, env):
+    phase_start_times["writing"] = time.perf_counter()
+
+
+def on_build_finished(app, exception):
+    if exception is not None or "writing" not in phase_start_times:
+        return
+
+    reading = phase_start_times["writing"] - phase_start_times["reading"]
+    writing = time.perf_counter() - phase_start_times["writing"]
+    logger.info(
+        f"override_jobs: {app.parallel} jobs, read phase {reading:.1f} s, write phase {writing:.1f} s, "
+        f"total {reading + writing:.1f} s."
+    )
 
-# Hackily injects -j4 into the RTD build process.
-# Can be removed if we find an easier way to inject it.
 
 def setup(app):
-    app.parallel = 4
+    jobs = os.getenv("SPHINX_JOBS", "")
+    if jobs.isdigit() and int(jobs) > 0:
+        app.parallel = int(jobs)
+        reason = "from SPHINX_JOBS"
+    else:
+        if jobs and jobs != "auto":
+            logger.warning(f"Invalid SPHINX_JOBS value {jobs!r}, expected a number or 'auto'.")
+        if jobs != "auto" and app.parallel > 1:
+            reason = "from the command line"
+        elif jobs == "auto" or os.getenv("READTHEDOCS") == "True":
+            app.parallel, reason = get_job_count()
+        else:
+            reason = "default, set SPHINX_JOBS to change it"
+    logger.info(f"override_jobs: using {app.parallel} jobs ({reason}).")
+
+    if os.getenv("SPHINX_BALANCED_CHUNKS"):
+        install_balanced_chunks(app)
+
+    app.connect("env-before-read-docs", on_env_before_read_docs)
+    app.connect("env-updated", on_env_updated)
+    app.connect("build-finished", on_build_finished)
 
     return {
         "parallel_read_safe": True,
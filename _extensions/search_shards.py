@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+    search_shards
+    ~~~~~~~~~~~~~
+
+    Sphinx extension to split the search index into shards, so the search
+    page only loads the part of the index a query needs.
+
+    `searchindex.js` contains every term of every page, mostly from the class
+    reference, and has to be downloaded and parsed before the first result is
+    shown. This writes the same index into `searchindex/` as well, split into:
+      - a base shard with the names and titles of the documents, and the
+        objects (used by every query, and needed to show any result);
+      - shards of section titles and index entries, split by length (they're
+        matched by queries containing at least half of them, so short queries
+        only need short titles);
+      - shards of full-text terms, each with a range of the sorted terms (by
+        prefix), of about `search_shards_size` bytes;
+      - the list of all terms, without the documents they're in, so partial
+        matches are found among all terms containing a word of the query, as
+        Sphinx does, and only the shards with these terms are loaded.
+    `manifest.json` lists the shards, with the first term or the minimum title
+    length of each.
+
+    `_static/js/search.js` and `_static/js/search_worker.js` load the shards
+    the query needs in a worker instead of `searchindex.js`. If the shards
+    can't be loaded (e.g. when the documentation is opened from local files),
+    or the search of Sphinx doesn't have the methods this relies on (some of
+    them are private), `searchindex.js` is used.
+
+    The shards are only written and used when `search_shards_enabled` is set.
+    It's an "html" configuration value, so toggling it writes all pages again
+    without reading any document again.
+
+    :copyright: Copyright 2026 by The Godot Engine Community
+    :license: MIT.
+"""
+
+import hashlib
+import json
+import os
+
+from sphinx.util import logging
+from sphinx.util.console import bold
+
+logger = logging.getLogger(__name__)
+
+# Builders writing a search page with the search index of the theme.
+HTML_BUILDERS = ("html", "dirhtml")
+SHARDS_DIRECTORY = "searchindex"
+MANIFEST_FILENAME = "manifest.json"
+# Entries of the index in the base and title shards, the others are split into term shards.
+BASE_KEYS = ("docnames", "filenames", "titles", "objects", "objnames", "objtypes", "envversion")
+TITLE_KEYS = ("alltitles", "indexentries")
+TERM_KEYS = ("terms", "titleterms")
+# Minimum length of the titles of each title shard.
+TITLE_SHARD_LENGTHS = (0, 9, 17, 33)
+
+
+def dump_shard(shard):
+    # Same format as `searchindex.js`.
+    return json.dumps(shard, separators=(",", ":"), sort_keys=True).encode()
+
+
+# Strings are compared and measured by UTF-16 code units in JavaScript.
+def sort_key(term):
+    return term.encode("utf-16-be")
+
+
+def get_length(title):
+    return len(title.encode("utf-16-le")) // 2
+
+
+def split_titles(index):
+    """Returns the title shards of `index` with the minimum title length of each."""
+    shards = [(length, {key: {} for key in TITLE_KEYS}) for length in TITLE_SHARD_LENGTHS]
+    for key in TITLE_KEYS:
+        for title, entries in index[key].items():
+            length = get_length(title)
+            shard = next(shard for minimum, shard in reversed(shards) if length >= minimum)
+            shard[key][title] = entries
+    return shards
+
+
+def split_terms(index, shard_size):
+    """Returns the term shards of `index` with the first term of each, splitting the sorted
+    terms into shards of about `shard_size` bytes."""
+    terms = sorted(set().union(*(index[key] for key in TERM_KEYS)), key=sort_key)
+    shards = []
+    shard = None
+    size = 0
+    for term in terms:
+        if shard is None or size >= shard_size:
+            shard = {key: {} for key in TERM_KEYS}
+            shards.append((term, shard))
+            size = 0
+        for key in TERM_KEYS:
+            if term in index[key]:
+                shard[key][term] = index[key][term]
+                size += len(term) + len(json.dumps(index[key][term], separators=(",", ":"))) + 4
+    if shards:
+        # So terms sorted before the first one are looked up in the first shard.
+        shards[0] = ("", shards[0][1])
+    return shards
+
+
+def write_search_shards(app, exception):
+    builder = app.builder
+    if not app.config.search_shards_enabled:
+        return
+    if exception is not None or builder.name not in HTML_BUILDERS or getattr(builder, "indexer", None) is None:
+        return
+
+    index = builder.indexer.freeze()
+    path = os.path.join(builder.outdir, SHARDS_DIRECTORY)
+    os.makedirs(path, exist_ok=True)
+    written = {}
+
+    def write(name, shard):
+        content = dump_shard(shard)
+        filename = f"{name}.{hashlib.sha256(content).hexdigest()[:16]}.json"
+        with open(os.path.join(path, filename), "wb") as f:
+            f.write(content)
+        written[filename] = len(content)
+        return filename
+
+    manifest = {
+        "base": write("base", {key: index[key] for key in BASE_KEYS}),
+        "titles": [[length, write("titles", shard)] for length, shard in split_titles(index)],
+        "terms": [[term, write("terms", shard)] for term, shard in split_terms(index, app.config.search_shards_size)],
+        "termlist": write("termlist", {key: sorted(index[key], key=sort_key) for key in TERM_KEYS}),
+    }
+    with open(os.path.join(path, MANIFEST_FILENAME), "wb") as f:
+        f.write(dump_shard(manifest))
+
+    # Only the search page uses the shards, and it's written by every build.
+    for filename in os.listdir(path):
+        if filename not in written and filename != MANIFEST_FILENAME:
+            os.remove(os.path.join(path, filename))
+
+    term_sizes = [written[filename] for _, filename in manifest["terms"]]
+    logger.info(
+        bold("search shards: ")
+        + "base %.1f KB, %d title shards, %d term shards of %.1f KB at most, term list %.1f KB (%.1f KB in all)",
+        written[manifest["base"]] / 1024,
+        len(manifest["titles"]),
+        len(term_sizes),
+        max(term_sizes, default=0) / 1024,
+        written[manifest["termlist"]] / 1024,
+        sum(written.values()) / 1024,
+    )
+
+
+def add_manifest_url(app, pagename, templatename, context, doctree):
+    if not app.config.search_shards_enabled:
+        return
+    if pagename == "search" and app.builder.name in HTML_BUILDERS and app.builder.search:
+        context["godot_search_manifest_url"] = context["pathto"](f"{SHARDS_DIRECTORY}/{MANIFEST_FILENAME}", 1)
+
+
+def setup(app):
+    app.add_config_value("search_shards_enabled", False, "html")
+    app.add_config_value("search_shards_size", 64 * 1024, "")
+
+    app.connect("html-page-context", add_manifest_url)
+    app.connect("build-finished", write_search_shards)
+
+    return {
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
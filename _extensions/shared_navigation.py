@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+    shared_navigation
+    ~~~~~~~~~~~~~~~~~
+
+    Sphinx extension to render the global navigation once per build, instead
+    of into every page.
+
+    With `collapse_navigation` disabled, the sidebar of each page contains the
+    whole table of contents, with every class reference page and the sections
+    of all pages. This is most of the HTML of each page, and most of the time
+    spent writing it. Instead, the navigation is rendered once when writing
+    starts, into a file of `_static` named after its content (so it can be
+    cached for good), and pages only contain a placeholder pointing to it.
+    `_static/js/custom.js` loads the navigation into the placeholder, and
+    marks the current page in it like Sphinx would.
+
+    Pages are only written this way when `shared_navigation_enabled` is set.
+    It's an "html" configuration value, so toggling it writes all pages again
+    without reading any document again.
+
+    :copyright: Copyright 2026 by The Godot Engine Community
+    :license: MIT.
+"""
+
+import hashlib
+import os
+
+from sphinx.environment.adapters.toctree import global_toctree_for_doc
+from sphinx.util import logging
+from sphinx.util.console import bold
+
+logger = logging.getLogger(__name__)
+
+# Builders writing pages with the navigation of the theme.
+HTML_BUILDERS = ("html", "dirhtml")
+
+
+def to_bool(value):
+    # Same as the `tobool` filter of templates, as theme options can be strings.
+    if isinstance(value, str):
+        return value.lower() in ("true", "1", "yes", "on")
+    return bool(value)
+
+
+def render_navigation(app, builder):
+    if not app.config.shared_navigation_enabled or builder.name not in HTML_BUILDERS:
+        return
+
+    # Same arguments as the `toctree()` call of the theme's `layout.html`.
+    options = builder.theme.get_options(builder.theme_options)
+    kwargs = {
+        "collapse": to_bool(options.get("collapse_navigation", True)),
+        "includehidden": to_bool(options.get("includehidden", True)),
+        "titles_only": to_bool(options.get("titles_only", False)),
+    }
+    if options.get("navigation_depth", "") != "":
+        kwargs["maxdepth"] = int(options["navigation_depth"])
+
+    # Rendered for the root document, so links are relative to the root of the output.
+    toctree = global_toctree_for_doc(app.env, app.config.root_doc, builder, **kwargs)
+    fragment = builder.render_partial(toctree)["fragment"] if toctree is not None else ""
+    content = fragment.encode()
+
+    filename = f"navigation.{hashlib.sha256(content).hexdigest()[:16]}.html"
+    os.makedirs(os.path.join(builder.outdir, "_static"), exist_ok=True)
+    # Pages which aren't written again keep using the files of previous builds.
+    with open(os.path.join(builder.outdir, "_static", filename), "wb") as f:
+        f.write(content)
+    app.godot_navigation_path = "_static/" + filename
+    logger.info(bold("shared navigation: ") + "rendered once into %s (%.1f KB)", filename, len(content) / 1024)
+
+
+def add_navigation_url(app, pagename, templatename, context, doctree):
+    path = getattr(app, "godot_navigation_path", None)
+    if path is not None:
+        context["godot_navigation_url"] = context["pathto"](path, 1)
+
+
+def setup(app):
+    app.add_config_value("shared_navigation_enabled", False, "html")
+
+    app.connect("write-started", render_navigation)
+    app.connect("html-page-context", add_navigation_url)
+
+    return {
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
@@ -1,3 +1,24 @@
+/**
+ * Wraps a handler of frequent events (such as scrolling) so it runs at most once per frame,
+ * right before the next repaint.
+ * @param {Function} callback The handler.
+ * @returns {Function} The throttled handler.
+ */
+const throttleToAnimationFrame = function (callback) {
+  let scheduled = false;
+  return () => {
+    if (scheduled) {
+      return;
+    }
+
+    scheduled = true;
+    requestAnimationFrame(() => {
+      scheduled = false;
+      callback();
+    });
+  };
+};
+
 // Handle page scroll and adjust sidebar accordingly.
 
 // Each page has two scrolls: the main scroll, which is moving the content of the page;
@@ -20,6 +41,18 @@ const registerOnScrollEvent = (function(){
   // The distance between the two max-height offset values above; used for intermediate values.
   const menuHeightOffset_diff = (menuHeightOffset_default - menuHeightOffset_fixed);
 
+  // Scroll handlers, kept to remove them when this runs again (e.g. when the sidebar changes).
+  let windowScrollHandler = null;
+  let menuScrollHandler = null;
+  const removeScrollHandlers = (menuElement) => {
+    if (windowScrollHandler != null) {
+      window.removeEventListener('scroll', windowScrollHandler);
+      menuElement.removeEventListener('scroll', menuScrollHandler);
+      windowScrollHandler = null;
+      menuScrollHandler = null;
+    }
+  };
+
   // Media query handler.
   return function(mediaQuery) {
     // We only apply this logic to the "desktop" resolution (defined by a media query at the bottom).
@@ -108,14 +141,16 @@ const registerOnScrollEvent = (function(){
         $menuPadding.css('height', `0px`);
       }
 
-      $window.scroll(function() {
+      // Layout is read and changed at most once per frame, and passive listeners let the
+      // browser scroll without waiting for the handlers.
+      removeScrollHandlers($menu.get(0));
+      windowScrollHandler = throttleToAnimationFrame(() => {
         handleMainScroll(window.scrollY);
         handleSidebarScroll();
       });
-
-      $menu.scroll(function() {
-        handleSidebarScroll();
-      });
+      menuScrollHandler = throttleToAnimationFrame(handleSidebarScroll);
+      window.addEventListener('scroll', windowScrollHandler, { passive: true });
+      $menu.get(0).addEventListener('scroll', menuScrollHandler, { passive: true });
 
       handleMainScroll(window.scrollY);
       handleSidebarScroll();
@@ -124,6 +159,7 @@ const registerOnScrollEvent = (function(){
 
       $window.unbind('scroll');
       $menu.unbind('scroll');
+      removeScrollHandlers($menu.get(0));
 
       $search.removeClass('fixed');
       $ethical.removeClass('fixed');
@@ -237,6 +273,188 @@ const registerSidebarObserver = (function(){
   };
 })();
 
+// Keep only the visible part of the sidebar navigation in the DOM.
+//
+// The navigation has over a thousand class reference pages, each with their sections, which
+// makes the sidebar slow to lay out and to scroll when they're all in the DOM. Instead, the
+// subtree of an item is only added to the DOM when the item is unfolded, and long lists only
+// contain the items in view (and some around them), with spacers taking the height of the
+// others. Current and unfolded items are always kept, so the theme finds them when folding
+// items or following links to sections, and heights are measured rather than estimated, so
+// the position of items in view doesn't depend on whether the others are in the DOM.
+//
+// Items out of the DOM can't be found with the search of the browser, so this is only
+// enabled when building with `SPHINX_VIRTUAL_NAVIGATION` (see `html_context` in `conf.py`).
+const virtualizeNavigation = (function(){
+  // Configuration.
+
+  // Lists with at least this many items only contain the items in view.
+  const virtualListMinItems = 100;
+  // The number of pixels above and below the view with items as well, so scrolling doesn't show gaps.
+  const overscanPixels = 600;
+
+  // Subtrees removed from the DOM, by the item they belong to.
+  const detachedSubtrees = new WeakMap();
+  // Items and update function of the virtualized lists, by list.
+  const virtualLists = new Map();
+
+  const updateVirtualLists = throttleToAnimationFrame(() => {
+    virtualLists.forEach(virtualList => virtualList.update());
+  });
+
+  // Items which must stay in the DOM wherever they are.
+  const isPinned = (item) => {
+    return item.classList.contains('current') || item.contains(document.activeElement);
+  };
+
+  const createSpacer = (height) => {
+    const spacer = document.createElement('li');
+    spacer.className = 'virtual-spacer';
+    spacer.setAttribute('aria-hidden', 'true');
+    spacer.style.height = `${height}px`;
+    return spacer;
+  };
+
+  const createVirtualList = (list, items) => {
+    // Measured when the list is first shown, and again when its width changes (as items wrap).
+    const heights = items.map(() => 0);
+    let measuredWidth = null;
+    // Whether each item is in the DOM, which they all are to begin with.
+    const mounted = items.map(() => true);
+
+    // Puts the items which should be in the DOM there, without moving those already there
+    // (which would lose their focus or state), and spacers in place of the others.
+    const render = (shouldMount) => {
+      list.querySelectorAll(':scope > li.virtual-spacer').forEach(spacer => spacer.remove());
+
+      let previous = null;
+      let gap = 0;
+      items.forEach((item, i) => {
+        if (!shouldMount[i]) {
+          if (mounted[i]) {
+            item.remove();
+            mounted[i] = false;
+          }
+          gap += heights[i];
+          return;
+        }
+
+        if (!mounted[i]) {
+          if (previous == null) {
+            list.prepend(item);
+          } else {
+            previous.after(item);
+          }
+          mounted[i] = true;
+        }
+        if (gap > 0) {
+          item.before(createSpacer(gap));
+          gap = 0;
+        }
+        previous = item;
+      });
+      if (gap > 0) {
+        list.append(createSpacer(gap));
+      }
+    };
+
+    return () => {
+      // Not in the DOM, or in a folded section.
+      if (!list.isConnected || list.offsetParent === null) {
+        return;
+      }
+
+      if (list.clientWidth !== measuredWidth) {
+        render(items.map(() => true));
+        measuredWidth = list.clientWidth;
+      }
+      // Items in the DOM may have been unfolded or folded since they were measured.
+      items.forEach((item, i) => {
+        if (mounted[i]) {
+          heights[i] = item.offsetHeight;
+        }
+      });
+
+      // The view in the coordinates of the list, in the menu and in the window.
+      const menuRect = list.closest('.wy-menu-vertical').getBoundingClientRect();
+      const listTop = list.getBoundingClientRect().top;
+      const viewTop = Math.max(menuRect.top, 0) - listTop - overscanPixels;
+      const viewBottom = Math.min(menuRect.bottom, window.innerHeight) - listTop + overscanPixels;
+
+      let offset = 0;
+      const shouldMount = items.map((item, i) => {
+        const inView = offset + heights[i] >= viewTop && offset < viewBottom;
+        offset += heights[i];
+        return inView || isPinned(item);
+      });
+      if (shouldMount.some((value, i) => value !== mounted[i])) {
+        render(shouldMount);
+      }
+    };
+  };
+
+  // Removes the subtrees of the items of the list which aren't unfolded, and only keeps
+  // the items in view if the list is long.
+  const prepareList = (list) => {
+    const items = Array.from(list.children).filter(it => it.tagName === 'LI');
+    for (const item of items) {
+      const subtree = item.querySelector(':scope > ul');
+      if (subtree == null) {
+        continue;
+      }
+
+      if (item.classList.contains('current')) {
+        prepareList(subtree);
+      } else {
+        detachedSubtrees.set(item, subtree);
+        subtree.remove();
+      }
+    }
+
+    if (items.length >= virtualListMinItems) {
+      virtualLists.set(list, { items: items, update: createVirtualList(list, items) });
+    }
+  };
+
+  // Adds the subtree of an item back to the DOM, before the theme unfolds it.
+  const attachSubtree = (item) => {
+    const subtree = detachedSubtrees.get(item);
+    if (subtree == null) {
+      return;
+    }
+
+    detachedSubtrees.delete(item);
+    prepareList(subtree);
+    item.append(subtree);
+  };
+
+  return function() {
+    const menu = document.querySelector('.wy-menu-vertical');
+    // The meta tag is only in pages built with `SPHINX_VIRTUAL_NAVIGATION`.
+    if (menu == null || document.querySelector('meta[name=doc_virtual_navigation]') == null) {
+      return;
+    }
+
+    menu.querySelectorAll(':scope > ul').forEach(prepareList);
+
+    // Captured before the handlers of the theme, which unfold items when clicking their link
+    // or their button.
+    menu.addEventListener('click', (event) => {
+      // Lists come into view when unfolding sections as well.
+      updateVirtualLists();
+
+      const item = event.target.closest('li');
+      if (item != null && menu.contains(item)) {
+        attachSubtree(item);
+      }
+    }, true);
+
+    document.addEventListener('scroll', updateVirtualLists, { capture: true, passive: true });
+    window.addEventListener('resize', updateVirtualLists, { passive: true });
+    updateVirtualLists();
+  };
+})();
+
 /**
  * Registers Giscus if there's an #godot-giscus container.
  * @returns {void} Nothing.
@@ -296,35 +514,82 @@ const registerGiscus = function () {
   giscusContainer.append(scriptElement);
 };
 
-$(document).ready(() => {
-  // Remove the search match highlights from the page, and adjust the URL in the
-  // navigation history.
-  const url = new URL(location.href);
-  if (url.searchParams.has('highlight')) {
-    Documentation.hideSearchWords();
+/**
+ * Loads the navigation into the sidebar when it's shared between pages instead of
+ * being part of each of them (see `_extensions/shared_navigation.py`), and marks the
+ * current page in it, like Sphinx does for the navigation of each page.
+ * @returns {Promise} Resolved once the navigation is in the sidebar (if it loaded).
+ */
+const loadSharedNavigation = function () {
+  const placeholder = document.querySelector('.godot-navigation[data-src]');
+  if (placeholder == null) {
+    return Promise.resolve();
   }
 
-  window.addEventListener('keydown', function(event) {
-    if (event.key === '/') {
-        var searchField = document.querySelector('#rtd-search-form input[type=text]');
-        if (document.activeElement !== searchField) {
-            searchField.focus();
-            searchField.select();
-            event.preventDefault();
+  // Ignore the query, the fragment, and the index page of directories.
+  const normalizeUrl = (url) => {
+    return (url.protocol + '//' + url.host + url.pathname).replace(/\/index\.html$/, '/');
+  };
+
+  return fetch(placeholder.dataset.src)
+    .then((res) => {
+      if (!res.ok) {
+        throw Error('Bad request');
+      }
+      return res.text();
+    })
+    .then((html) => {
+      const template = document.createElement('template');
+      template.innerHTML = html;
+      const navigation = template.content;
+
+      // Links are relative to the root of the documentation.
+      const rootUrl = new URL(document.documentElement.dataset.content_root || './', location.href);
+      const pageUrl = normalizeUrl(location);
+      let currentLink = null;
+      navigation.querySelectorAll('a[href]').forEach(link => {
+        const url = new URL(link.getAttribute('href'), rootUrl);
+        if (normalizeUrl(url) !== pageUrl) {
+          link.setAttribute('href', url.href);
+          return;
         }
-    }
-  });
 
-  // Initialize handlers for page scrolling and our custom sidebar.
-  const mediaQuery = window.matchMedia('only screen and (min-width: 769px)');
+        // Links to the current page only keep their fragment.
+        link.setAttribute('href', url.hash || '#');
+        if (!url.hash) {
+          currentLink = link;
+        }
+      });
 
-  registerOnScrollEvent(mediaQuery);
-  mediaQuery.addListener(registerOnScrollEvent);
+      if (currentLink != null) {
+        currentLink.classList.add('current');
+        for (let element = currentLink.parentElement; element != null; element = element.parentElement) {
+          if (element.tagName === 'LI' || element.tagName === 'UL') {
+            element.classList.add('current');
+          }
+        }
+      }
 
-  registerSidebarObserver(() => {
-    registerOnScrollEvent(mediaQuery);
-  });
+      placeholder.replaceWith(navigation);
+
+      // The theme adds buttons to unfold sections as the page loads, before the navigation is there.
+      $('.wy-menu-vertical ul').not('.simple').siblings('a').each(function() {
+        const $link = $(this);
+        const $expand = $('<button class="toctree-expand" title="Open/close menu"></button>');
+        $expand.on('click', (event) => {
+          SphinxRtdTheme.Navigation.toggleCurrent($link);
+          event.stopPropagation();
+          return false;
+        });
+        $link.prepend($expand);
+      });
+    })
+    .catch((err) => {
+      console.error('Could not load the navigation:', err);
+    });
+};
 
+const addClassReferenceLineBreaks = function () {
   // Add line-break suggestions to the sidebar navigation items in the class reference section.
   //
   // Some class reference pages have very long PascalCase names, such as
@@ -359,6 +624,88 @@ $(document).ready(() => {
         linkItem.insertAdjacentHTML('beforeend', text);
     }
   }
+};
+
+const registerSidebarSections = function (mediaQuery) {
+  // Make sections in the sidebar togglable.
+  let hasCurrent = false;
+  let menuHeaders = document.querySelectorAll('.wy-menu-vertical .caption[role=heading]');
+  menuHeaders.forEach(it => {
+      let connectedMenu = it.nextElementSibling;
+
+      // Enable toggling.
+      it.addEventListener('click', () => {
+          if (connectedMenu.classList.contains('active')) {
+            connectedMenu.classList.remove('active');
+            it.classList.remove('active');
+          } else {
+            connectedMenu.classList.add('active');
+            it.classList.add('active');
+          }
+
+          // Hide other sections.
+          menuHeaders.forEach(other => {
+            if (other !== it && other.classList.contains('active')) {
+              other.nextElementSibling.classList.remove('active');
+              other.classList.remove('active');
+            }
+          });
+
+          registerOnScrollEvent(mediaQuery);
+      }, true);
+
+      // Set the default state, expand our current section.
+      if (connectedMenu.classList.contains('current')) {
+        connectedMenu.classList.add('active');
+        it.classList.add('active');
+
+        hasCurrent = true;
+      }
+  });
+
+  // Unfold the first (general information) section on the home page.
+  if (!hasCurrent && menuHeaders.length > 0) {
+    menuHeaders[0].classList.add('active');
+    menuHeaders[0].nextElementSibling.classList.add('active');
+
+    registerOnScrollEvent(mediaQuery);
+  }
+};
+
+$(document).ready(() => {
+  // Remove the search match highlights from the page, and adjust the URL in the
+  // navigation history.
+  const url = new URL(location.href);
+  if (url.searchParams.has('highlight')) {
+    Documentation.hideSearchWords();
+  }
+
+  window.addEventListener('keydown', function(event) {
+    if (event.key === '/') {
+        var searchField = document.querySelector('#rtd-search-form input[type=text]');
+        if (document.activeElement !== searchField) {
+            searchField.focus();
+            searchField.select();
+            event.preventDefault();
+        }
+    }
+  });
+
+  // Initialize handlers for page scrolling and our custom sidebar, once the navigation is there.
+  const mediaQuery = window.matchMedia('only screen and (min-width: 769px)');
+
+  loadSharedNavigation().finally(() => {
+    registerOnScrollEvent(mediaQuery);
+    mediaQuery.addListener(registerOnScrollEvent);
+
+    registerSidebarObserver(() => {
+      registerOnScrollEvent(mediaQuery);
+    });
+
+    addClassReferenceLineBreaks();
+    registerSidebarSections(mediaQuery);
+    virtualizeNavigation();
+  });
 
   // Change indentation from spaces to tabs for codeblocks.
   const codeBlocks = document.querySelectorAll('.rst-content div[class^="highlight"] pre');
@@ -440,50 +787,6 @@ $(document).ready(() => {
   instantPageScript.innerText = 'let t,e,n,o,i,a=null,s=65,c=new Set;const r=1111;function d(t){o=performance.now();const e=t.target.closest("a");m(e)&&p(e.href,"high")}function u(t){if(performance.now()-o<r)return;if(!("closest"in t.target))return;const e=t.target.closest("a");m(e)&&(e.addEventListener("mouseout",f,{passive:!0}),i=setTimeout(()=>{p(e.href,"high"),i=void 0},s))}function l(t){const e=t.target.closest("a");m(e)&&p(e.href,"high")}function f(t){t.relatedTarget&&t.target.closest("a")==t.relatedTarget.closest("a")||i&&(clearTimeout(i),i=void 0)}function h(t){if(performance.now()-o<r)return;const e=t.target.closest("a");if(t.which>1||t.metaKey||t.ctrlKey)return;if(!e)return;e.addEventListener("click",function(t){1337!=t.detail&&t.preventDefault()},{capture:!0,passive:!1,once:!0});const n=new MouseEvent("click",{view:window,bubbles:!0,cancelable:!1,detail:1337});e.dispatchEvent(n)}function m(o){if(o&&o.href&&(!n||"instant"in o.dataset)){if(o.origin!=location.origin){if(!(e||"instant"in o.dataset)||!a)return}if(["http:","https:"].includes(o.protocol)&&("http:"!=o.protocol||"https:"!=location.protocol)&&(t||!o.search||"instant"in o.dataset)&&!(o.hash&&o.pathname+o.search==location.pathname+location.search||"noInstant"in o.dataset))return!0}}function p(t,e="auto"){if(c.has(t))return;const n=document.createElement("link");n.rel="prefetch",n.href=t,n.fetchPriority=e,n.as="document",document.head.appendChild(n),c.add(t)}!function(){if(!document.createElement("link").relList.supports("prefetch"))return;const o="instantVaryAccept"in document.body.dataset||"Shopify"in window,i=navigator.userAgent.indexOf("Chrome/");i>-1&&(a=parseInt(navigator.userAgent.substring(i+"Chrome/".length)));if(o&&a&&a<110)return;const c="instantMousedownShortcut"in document.body.dataset;t="instantAllowQueryString"in document.body.dataset,e="instantAllowExternalLinks"in document.body.dataset,n="instantWhitelist"in document.body.dataset;const r={capture:!0,passive:!0};let f=!1,v=!1,g=!1;if("instantIntensity"in document.body.dataset){const t=document.body.dataset.instantIntensity;if(t.startsWith("mousedown"))f=!0,"mousedown-only"==t&&(v=!0);else if(t.startsWith("viewport")){const e=navigator.connection&&navigator.connection.saveData,n=navigator.connection&&navigator.connection.effectiveType&&navigator.connection.effectiveType.includes("2g");e||n||("viewport"==t?document.documentElement.clientWidth*document.documentElement.clientHeight<45e4&&(g=!0):"viewport-all"==t&&(g=!0))}else{const e=parseInt(t);isNaN(e)||(s=e)}}v||document.addEventListener("touchstart",d,r);f?c||document.addEventListener("mousedown",l,r):document.addEventListener("mouseover",u,r);c&&document.addEventListener("mousedown",h,r);if(g){let t=window.requestIdleCallback;t||(t=(t=>{t()})),t(function(){const t=new IntersectionObserver(e=>{e.forEach(e=>{if(e.isIntersecting){const n=e.target;t.unobserve(n),p(n.href)}})});document.querySelectorAll("a").forEach(e=>{m(e)&&t.observe(e)})},{timeout:1500})}}();';
   document.head.appendChild(instantPageScript);
 
-  // Make sections in the sidebar togglable.
-  let hasCurrent = false;
-  let menuHeaders = document.querySelectorAll('.wy-menu-vertical .caption[role=heading]');
-  menuHeaders.forEach(it => {
-      let connectedMenu = it.nextElementSibling;
-
-      // Enable toggling.
-      it.addEventListener('click', () => {
-          if (connectedMenu.classList.contains('active')) {
-            connectedMenu.classList.remove('active');
-            it.classList.remove('active');
-          } else {
-            connectedMenu.classList.add('active');
-            it.classList.add('active');
-          }
-
-          // Hide other sections.
-          menuHeaders.forEach(other => {
-            if (other !== it && other.classList.contains('active')) {
-              other.nextElementSibling.classList.remove('active');
-              other.classList.remove('active');
-            }
-          });
-
-          registerOnScrollEvent(mediaQuery);
-      }, true);
-
-      // Set the default state, expand our current section.
-      if (connectedMenu.classList.contains('current')) {
-        connectedMenu.classList.add('active');
-        it.classList.add('active');
-
-        hasCurrent = true;
-      }
-  });
-
-  // Unfold the first (general information) section on the home page.
-  if (!hasCurrent && menuHeaders.length > 0) {
-    menuHeaders[0].classList.add('active');
-    menuHeaders[0].nextElementSibling.classList.add('active');
-
-    registerOnScrollEvent(mediaQuery);
-  }
-
   // Giscus
   registerGiscus();
 
@@ -0,0 +1,93 @@
+// Load only the shards of the search index needed by the query, instead of the whole index.
+// See `_extensions/search_shards.py`.
+//
+// The shards are fetched and parsed by a worker, which sends back only the entries which can
+// match the query (along with the names and titles of the documents), so the search page
+// never parses the whole index. If the shards can't be loaded, for example when the
+// documentation is opened from local files, the whole index is loaded as usual.
+//
+// This relies on `Search._parseQuery()`, which is private, and on `Search.setIndex()` and
+// `Search.loadIndex()` from `searchtools.js` of Sphinx 8.1 (see `requirements.txt`). The whole
+// index is loaded if they're missing, but check the search in a browser when updating Sphinx.
+
+/**
+ * Loads the index for the query of the search page, and passes it to the search of Sphinx.
+ * @param {string} manifestUrl The URL of the manifest listing the shards.
+ * @param {string} workerUrl The URL of `search_worker.js`.
+ * @param {string} indexUrl The URL of the whole index, used if the shards can't be loaded.
+ */
+const loadSearchIndexShards = function(manifestUrl, workerUrl, indexUrl) {
+  const query = new URLSearchParams(window.location.search).get('q');
+  if (!query) {
+    // Nothing to search for.
+    return;
+  }
+
+  let worker = null;
+  const loadWholeIndex = (error) => {
+    console.warn('Could not load the shards of the search index, loading the whole index instead.', error);
+    if (worker != null) {
+      worker.terminate();
+    }
+    if (typeof Search.loadIndex === 'function') {
+      Search.loadIndex(indexUrl);
+    } else {
+      // Same as `Search.loadIndex()`, `searchindex.js` calls `Search.setIndex()`.
+      document.body.appendChild(document.createElement('script')).src = indexUrl;
+    }
+  };
+
+  if (typeof Search._parseQuery !== 'function' || typeof Search.setIndex !== 'function') {
+    loadWholeIndex('The search of Sphinx has changed.');
+    return;
+  }
+
+  // Stemmed the same way as when searching, so the worker looks up the same terms.
+  let searchTerms;
+  let excludedTerms;
+  try {
+    [, searchTerms, excludedTerms] = Search._parseQuery(query);
+    searchTerms = [...searchTerms];
+    excludedTerms = [...excludedTerms];
+  } catch (error) {
+    loadWholeIndex(error);
+    return;
+  }
+
+  try {
+    worker = new Worker(workerUrl);
+  } catch (error) {
+    loadWholeIndex(error);
+    return;
+  }
+
+  worker.addEventListener('message', (event) => {
+    if (event.data.error != null) {
+      loadWholeIndex(event.data.error);
+      return;
+    }
+
+    worker.terminate();
+    Search.setIndex(event.data.index);
+  });
+  worker.addEventListener('error', (event) => loadWholeIndex(event.message));
+
+  // The manifest is preloaded by the page (see `_templates/search.html`), while the worker starts.
+  fetch(manifestUrl)
+    .then((response) => {
+      if (!response.ok) {
+        throw Error(`${response.status} ${response.statusText}`);
+      }
+      return response.json();
+    })
+    .then((manifest) => {
+      worker.postMessage({
+        manifest: manifest,
+        manifestUrl: new URL(manifestUrl, window.location.href).href,
+        query: query,
+        searchTerms: searchTerms,
+        excludedTerms: excludedTerms,
+      });
+    })
+    .catch(loadWholeIndex);
+};
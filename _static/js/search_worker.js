@@ -0,0 +1,102 @@
+// Fetch and parse the shards of the search index needed by a query, off the main thread.
+// See `_static/js/search.js` and `_extensions/search_shards.py`.
+//
+// Only the entries of the shards which can match the query are sent back, and the search of
+// Sphinx then matches them as it would with the whole index. The conditions here only need
+// to keep every entry it could match, and the terms are the same it looks up.
+
+const fetchShard = async (file, manifestUrl) => {
+  const response = await fetch(new URL(file, manifestUrl));
+  if (!response.ok) {
+    throw Error(`${file}: ${response.status} ${response.statusText}`);
+  }
+  return response.json();
+};
+
+/**
+ * Returns the files of the term shards with terms between `first` and `last`.
+ * @param {Array} shards The first term and file of each shard, sorted by term.
+ * @param {string} first The first term.
+ * @param {string} last The last term.
+ * @returns {Array<string>} The files of the shards.
+ */
+const findTermShards = (shards, first, last) => {
+  return shards
+    .filter(([start], i) => start <= last && (i + 1 === shards.length || shards[i + 1][0] > first))
+    .map(([, file]) => file);
+};
+
+/**
+ * Returns the terms of each key of the index the search of Sphinx looks up for `word`: the
+ * word itself, and the terms containing it if it has more than two letters and isn't a term.
+ * @param {string} word A word of the query.
+ * @param {Object} termList The sorted terms of each key of the index, if needed.
+ * @returns {Object} The terms, by key.
+ */
+const findMatchingTerms = (word, termList) => {
+  const matching = { terms: [word], titleterms: [word] };
+  if (word.length > 2) {
+    for (const key of ['terms', 'titleterms']) {
+      if (!termList[key].includes(word)) {
+        matching[key].push(...termList[key].filter((term) => term.includes(word)));
+      }
+    }
+  }
+  return matching;
+};
+
+self.addEventListener('message', async (event) => {
+  const { manifest, manifestUrl, query, searchTerms, excludedTerms } = event.data;
+  const queryLower = query.toLowerCase().trim();
+
+  // Titles and index entries only match queries of at least half their length.
+  const titleShards = manifest.titles
+    .filter(([minimumLength]) => minimumLength <= queryLower.length * 2)
+    .map(([, file]) => file);
+
+  try {
+    // Sphinx matches the terms containing words of more than two letters as well, which are
+    // found in the list of all terms.
+    const termList = searchTerms.some((term) => term.length > 2)
+      ? await fetchShard(manifest.termlist, manifestUrl)
+      : null;
+    const wantedTerms = { terms: new Set(excludedTerms), titleterms: new Set(excludedTerms) };
+    for (const word of searchTerms) {
+      const matching = findMatchingTerms(word, termList);
+      for (const key of ['terms', 'titleterms']) {
+        matching[key].forEach((term) => wantedTerms[key].add(term));
+      }
+    }
+
+    const termShards = new Set();
+    for (const term of new Set([...wantedTerms.terms, ...wantedTerms.titleterms])) {
+      findTermShards(manifest.terms, term, term).forEach((file) => termShards.add(file));
+    }
+
+    const [base, ...shards] = await Promise.all(
+      [manifest.base, ...titleShards, ...termShards].map((file) => fetchShard(file, manifestUrl))
+    );
+
+    const index = { ...base, alltitles: {}, indexentries: {}, terms: {}, titleterms: {} };
+    for (const shard of shards) {
+      for (const key of ['alltitles', 'indexentries']) {
+        for (const [title, entries] of Object.entries(shard[key] || {})) {
+          if (title.toLowerCase().includes(queryLower)) {
+            index[key][title] = entries;
+          }
+        }
+      }
+      for (const key of ['terms', 'titleterms']) {
+        for (const [term, files] of Object.entries(shard[key] || {})) {
+          if (wantedTerms[key].has(term)) {
+            index[key][term] = files;
+          }
+        }
+      }
+    }
+
+    self.postMessage({ index: index });
+  } catch (error) {
+    self.postMessage({ error: String(error) });
+  }
+});
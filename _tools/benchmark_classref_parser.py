@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+
+"""Compares the parser of `_extensions/classref_parser.py` with the stock reST
+parser of Sphinx on the class reference.
+
+Each document of `classes/` is read with both parsers, using the configuration
+of the documentation. The time spent parsing and reading (which includes
+transforms and extensions) is reported for each parser, and the doctrees they
+produce are compared right after parsing, including line numbers, sources and
+the targets registered in the document. The program exits with an error code
+if any doctree differs:
+  python _tools/benchmark_classref_parser.py
+  python _tools/benchmark_classref_parser.py --limit 100
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+
+ROOT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT_PATH, "_extensions"))
+
+from docutils import nodes  # noqa: E402
+from sphinx.application import Sphinx  # noqa: E402
+from sphinx.parsers import RSTParser  # noqa: E402
+
+from classref_parser import ClassReferenceParser, ClassReferenceStateMachine  # noqa: E402
+
+
+def parse_command_line_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=0,
+        help="Only read the first N documents of the class reference (0 to read all of them).",
+    )
+    parser.add_argument(
+        "--show-differences",
+        type=int,
+        default=10,
+        help="Number of differing doctrees to report.",
+    )
+    return parser.parse_args()
+
+
+def dump_node(node, output):
+    """Appends a description of `node` and its children to `output`, including
+    what `pformat()` leaves out."""
+    if isinstance(node, nodes.Text):
+        output.append(("#text", str(node)))
+        return
+    attributes = sorted((key, repr(value)) for key, value in node.attributes.items())
+    output.append((node.tagname, attributes, node.source, node.line, node.rawsource))
+    for child in node.children:
+        dump_node(child, output)
+
+
+def dump_document(document):
+    output = []
+    dump_node(document, output)
+    for name in ("ids", "nameids", "nametypes", "refnames", "refids", "substitution_defs", "substitution_names"):
+        output.append((name, sorted(getattr(document, name))))
+    transforms = document.transformer.transforms
+    output.append(("transforms", [(priority, repr(transform)) for priority, transform, _, _ in transforms]))
+    return output
+
+
+class Measurement:
+    def __init__(self, name, parser):
+        self.name = name
+        self.parser = parser
+        self.parse_seconds = 0.0
+        self.read_seconds = 0.0
+        self.dump = None
+
+        original_parse = parser.parse
+
+        def parse(inputstring, document):
+            start = time.perf_counter()
+            original_parse(inputstring, document)
+            self.parse_seconds += time.perf_counter() - start
+            self.dump = dump_document(document)
+
+        parser.parse = parse
+
+
+def first_difference(a, b):
+    for i, (item_a, item_b) in enumerate(zip(a, b)):
+        if item_a != item_b:
+            return i, item_a, item_b
+    return min(len(a), len(b)), "(end)" if len(a) < len(b) else None, "(end)" if len(b) < len(a) else None
+
+
+def main():
+    args = parse_command_line_args()
+
+    docnames = sorted(
+        "classes/" + filename[:-4]
+        for filename in os.listdir(os.path.join(ROOT_PATH, "classes"))
+        if filename.endswith(".rst")
+    )
+    if args.limit:
+        docnames = docnames[: args.limit]
+
+    with tempfile.TemporaryDirectory() as build_path:
+        warnings = io.StringIO()
+        app = Sphinx(
+            ROOT_PATH,
+            ROOT_PATH,
+            os.path.join(build_path, "dummy"),
+            os.path.join(build_path, "doctrees"),
+            "dummy",
+            status=None,
+            warning=warnings,
+            freshenv=True,
+        )
+        publisher = app.registry.get_publisher(app, "restructuredtext")
+
+        measurements = []
+        for name, parser_class in (("stock", RSTParser), ("classref", ClassReferenceParser)):
+            parser = parser_class()
+            parser.set_application(app)
+            measurements.append(Measurement(name, parser))
+
+        differences = []
+        fallbacks = []
+        for i, docname in enumerate(docnames):
+            # Alternate the order of the parsers to even out caching effects.
+            for measurement in measurements if i % 2 == 0 else reversed(measurements):
+                # The reader keeps the parser it was first given.
+                publisher.parser = publisher.reader.parser = measurement.parser
+                start = time.perf_counter()
+                app.builder.read_doc(docname, _cache=False)
+                measurement.read_seconds += time.perf_counter() - start
+
+            stock, classref = measurements
+            if not isinstance(classref.parser.statemachine, ClassReferenceStateMachine):
+                fallbacks.append(docname)
+            if stock.dump != classref.dump:
+                differences.append((docname, first_difference(stock.dump, classref.dump)))
+
+    print(f"Read {len(docnames)} documents of the class reference.")
+    for measurement in measurements:
+        print(
+            f"  {measurement.name:>8} parser: parsing {measurement.parse_seconds:7.2f} s, "
+            f"reading {measurement.read_seconds:7.2f} s"
+        )
+    stock, classref = measurements
+    if classref.parse_seconds and classref.read_seconds:
+        print(
+            f"Speedup: {stock.parse_seconds / classref.parse_seconds:.2f}x parsing, "
+            f"{stock.read_seconds / classref.read_seconds:.2f}x reading."
+        )
+    print(f"{len(fallbacks)} documents were parsed with the stock parser, as their structure is unexpected.")
+    for docname in fallbacks[: args.show_differences]:
+        print(f"  {docname}")
+
+    if differences:
+        print(f"{len(differences)} doctrees differ between parsers:")
+        for docname, (index, expected, found) in differences[: args.show_differences]:
+            print(f"  {docname}, item {index}:\n    stock:    {expected}\n    classref: {found}")
+        exit(1)
+    print("All doctrees are identical.")
+
+
+if __name__ == "__main__":
+    main()
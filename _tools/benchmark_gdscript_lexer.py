@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+
+"""Measures the throughput of the GDScript lexer used to highlight code blocks
+in the documentation, to catch performance regressions when editing the token
+tables in `_extensions/gdscript.py`.
+
+Every `gdscript`/`gd` code block found in the reST files of the documentation
+(including the class reference) is extracted, then lexed with `GDScriptLexer`.
+The total time, throughput, per-block latency percentiles and the slowest
+blocks are reported. Each block is lexed `--repeat` times and its fastest run
+is kept, to reduce noise.
+
+Results can be saved as JSON and compared between commits:
+  python _tools/benchmark_gdscript_lexer.py --json before.json
+  (apply changes)
+  python _tools/benchmark_gdscript_lexer.py --json after.json --compare before.json
+
+With --profile, every rule of the lexer is instrumented to report match
+attempts and time per state and per rule, and code blocks exceeding the given
+threshold are flagged along with the rule that took the most time:
+  python _tools/benchmark_gdscript_lexer.py --profile 1
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+ROOT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT_PATH, "_extensions"))
+
+from gdscript import GDScriptLexer, InstrumentedGDScriptLexer  # noqa: E402
+
+LANGUAGES = ("gdscript", "gd")
+CODE_DIRECTIVE_REGEX = re.compile(r"^(\s*)\.\. (?:code-block|code-tab|sourcecode|code)::\s*(\S+)")
+OPTION_REGEX = re.compile(r"^\s*:[\w-]+:")
+
+
+def parse_command_line_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--root",
+        default=ROOT_PATH,
+        help="Path to the documentation root, where reST files are looked up.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Number of times each code block is lexed. The fastest run is kept.",
+    )
+    parser.add_argument(
+        "--slowest",
+        type=int,
+        default=10,
+        help="Number of slowest code blocks to report.",
+    )
+    parser.add_argument(
+        "--json",
+        metavar="file",
+        help="Path to a JSON file to write the results to.",
+    )
+    parser.add_argument(
+        "--compare",
+        metavar="file",
+        help="Path to a JSON file written by a previous run, to compare the results against.",
+    )
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=10.0,
+        help="Maximum allowed throughput regression in percent when using --compare. "
+        "The program exits with an error code if it is exceeded.",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="threshold",
+        type=float,
+        help="Instruments the lexer rules, and flags code blocks taking more than this many milliseconds to lex. "
+        "Timings are much higher than without instrumentation.",
+    )
+    return parser.parse_args()
+
+
+def find_rst_files(root):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith((".", "_")))
+        for filename in sorted(filenames):
+            if filename.endswith(".rst"):
+                yield os.path.join(dirpath, filename)
+
+
+def extract_code_blocks(lines):
+    """Yields (line number, source) for every GDScript code block in `lines`."""
+    i = 0
+    while i < len(lines):
+        match = CODE_DIRECTIVE_REGEX.match(lines[i])
+        i += 1
+        if not match or match[2] not in LANGUAGES:
+            continue
+
+        indent = len(match[1])
+        # Skip directive options.
+        while i < len(lines) and OPTION_REGEX.match(lines[i]):
+            i += 1
+
+        start = i
+        content = []
+        while i < len(lines):
+            line = lines[i].rstrip("\n")
+            if line.strip() and len(line) - len(line.lstrip()) <= indent:
+                break
+            content.append(line)
+            i += 1
+
+        while content and not content[-1].strip():
+            content.pop()
+        while content and not content[0].strip():
+            content.pop(0)
+            start += 1
+        if not content:
+            continue
+
+        dedent = min(len(line) - len(line.lstrip()) for line in content if line.strip())
+        yield start + 1, "\n".join(line[dedent:] for line in content) + "\n"
+
+
+def load_corpus(root):
+    """Returns a list of (path, line number, source) for every GDScript code block."""
+    corpus = []
+    for path in find_rst_files(root):
+        with open(path, "r", encoding="utf-8-sig") as f:
+            lines = f.readlines()
+        for line, source in extract_code_blocks(lines):
+            corpus.append((os.path.relpath(path, root).replace(os.sep, "/"), line, source))
+    return corpus
+
+
+def lex_block(lexer, source, repeat):
+    """Returns (number of tokens, fastest time in seconds) for lexing `source`."""
+    best = None
+    tokens = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tokens = 0
+        for _ in lexer.get_tokens_unprocessed(source):
+            tokens += 1
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return tokens, best
+
+
+def percentile(sorted_values, percent):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run_benchmark(corpus, repeat, slowest, profile_threshold=None):
+    start = time.perf_counter()
+    if profile_threshold is None:
+        lexer = GDScriptLexer()
+    else:
+        lexer = InstrumentedGDScriptLexer(threshold=profile_threshold / 1000)
+    # Token tables are compiled when the first text is lexed.
+    list(lexer.get_tokens_unprocessed("pass\n"))
+    setup_time = time.perf_counter() - start
+
+    blocks = []
+    flagged = []
+    for path, line, source in corpus:
+        if profile_threshold is not None:
+            lexer.slow_blocks.clear()
+        tokens, elapsed = lex_block(lexer, source, repeat)
+        blocks.append(
+            {
+                "block": f"{path}:{line}",
+                "characters": len(source),
+                "tokens": tokens,
+                "seconds": elapsed,
+            }
+        )
+        # Only flag blocks that were slow on every run, to ignore hiccups.
+        if profile_threshold is not None and len(lexer.slow_blocks) == repeat:
+            slow_block = min(lexer.slow_blocks, key=lambda slow_block: slow_block["seconds"])
+            flagged.append(
+                {
+                    "block": f"{path}:{line}",
+                    "seconds": slow_block["seconds"],
+                    "state": slow_block["state"],
+                    "rule": slow_block["rule"],
+                    "rule_seconds": slow_block["rule_seconds"],
+                }
+            )
+
+    total_time = sum(block["seconds"] for block in blocks)
+    total_tokens = sum(block["tokens"] for block in blocks)
+    total_characters = sum(block["characters"] for block in blocks)
+    latencies = sorted(block["seconds"] for block in blocks)
+
+    results = {
+        "blocks": len(blocks),
+        "characters": total_characters,
+        "tokens": total_tokens,
+        "setup_seconds": setup_time,
+        "total_seconds": total_time,
+        "tokens_per_second": total_tokens / total_time if total_time else 0.0,
+        "characters_per_second": total_characters / total_time if total_time else 0.0,
+        "p50_seconds": percentile(latencies, 50),
+        "p99_seconds": percentile(latencies, 99),
+        "max_seconds": latencies[-1] if latencies else 0.0,
+        "slowest": sorted(blocks, key=lambda block: block["seconds"], reverse=True)[:slowest],
+        "per_block": {block["block"]: block["seconds"] for block in blocks},
+    }
+
+    if profile_threshold is not None:
+        results["profile"] = {
+            "threshold_seconds": profile_threshold / 1000,
+            "states": {
+                state: {"attempts": attempts, "matches": matches, "seconds": seconds}
+                for state, (attempts, matches, seconds) in lexer.state_stats().items()
+            },
+            "rules": sorted(
+                (
+                    {
+                        "state": state,
+                        "rule_index": index,
+                        "rule": rule,
+                        "attempts": attempts,
+                        "matches": matches,
+                        "seconds": seconds,
+                    }
+                    for (state, index, rule), (attempts, matches, seconds) in lexer.rule_stats.items()
+                    if attempts
+                ),
+                key=lambda rule: rule["seconds"],
+                reverse=True,
+            ),
+            "flagged": sorted(flagged, key=lambda block: block["seconds"], reverse=True),
+        }
+
+    return results
+
+
+def print_results(results):
+    print(f"Lexer setup: {results['setup_seconds'] * 1000:.1f} ms")
+    print(
+        f"Lexed {results['blocks']} code blocks ({results['characters']} characters, "
+        f"{results['tokens']} tokens) in {results['total_seconds']:.3f} s."
+    )
+    print(
+        f"Throughput: {results['tokens_per_second']:.0f} tokens/s, "
+        f"{results['characters_per_second']:.0f} characters/s."
+    )
+    print(
+        f"Per-block latency: p50 {results['p50_seconds'] * 1000:.3f} ms, "
+        f"p99 {results['p99_seconds'] * 1000:.3f} ms, max {results['max_seconds'] * 1000:.3f} ms."
+    )
+    print("Slowest code blocks:")
+    for block in results["slowest"]:
+        print(
+            f"  {block['seconds'] * 1000:8.3f} ms  {block['block']} "
+            f"({block['characters']} characters, {block['tokens']} tokens)"
+        )
+
+
+def print_profile(profile, slowest):
+    print("Time spent matching per lexer state:")
+    states = sorted(profile["states"].items(), key=lambda item: item[1]["seconds"], reverse=True)
+    for state, stats in states:
+        if stats["attempts"]:
+            print(
+                f"  {stats['seconds'] * 1000:9.2f} ms  {stats['attempts']:9d} attempts  "
+                f"{stats['matches']:8d} matches  {state}"
+            )
+    print("Most expensive rules:")
+    for rule in profile["rules"][:slowest]:
+        print(
+            f"  {rule['seconds'] * 1000:9.2f} ms  {rule['attempts']:9d} attempts  "
+            f"{rule['matches']:8d} matches  {rule['state']} #{rule['rule_index']}: {rule['rule']}"
+        )
+    threshold = profile["threshold_seconds"] * 1000
+    print(f"{len(profile['flagged'])} code blocks took more than {threshold:g} ms to lex:")
+    for block in profile["flagged"][:slowest]:
+        print(
+            f"  {block['seconds'] * 1000:8.3f} ms  {block['block']}, slowest rule in state "
+            f"{block['state']}: {block['rule']} ({block['rule_seconds'] * 1000:.3f} ms)"
+        )
+    if len(profile["flagged"]) > slowest:
+        print(f"  ... and {len(profile['flagged']) - slowest} more (see the JSON output).")
+
+
+def compare_results(results, previous, max_regression):
+    """Prints the differences with `previous` results. Returns False if throughput
+    regressed by more than `max_regression` percent."""
+
+    def change(key):
+        if not previous.get(key):
+            return 0.0
+        return (results[key] - previous[key]) / previous[key] * 100
+
+    print("Compared to previous results:")
+    print(f"  Throughput: {change('tokens_per_second'):+.1f}% tokens/s")
+    print(f"  Total time: {change('total_seconds'):+.1f}%")
+    print(f"  p50 latency: {change('p50_seconds'):+.1f}%")
+    print(f"  p99 latency: {change('p99_seconds'):+.1f}%")
+    print(f"  Lexer setup: {change('setup_seconds'):+.1f}%")
+
+    # Only compare blocks present in both runs, as blocks move when documents are edited.
+    previous_blocks = previous.get("per_block", {})
+    regressions = []
+    for block, seconds in results["per_block"].items():
+        before = previous_blocks.get(block)
+        if before and seconds > before * 2 and seconds - before > 0.001:
+            regressions.append((seconds / before, block, before, seconds))
+    regressions.sort(reverse=True)
+    if regressions:
+        print("  Code blocks that got more than twice as slow:")
+        for ratio, block, before, seconds in regressions[:10]:
+            print(f"    {block}: {before * 1000:.3f} ms -> {seconds * 1000:.3f} ms ({ratio:.1f}x)")
+
+    if change("tokens_per_second") < -max_regression:
+        print(f"Throughput regressed by more than {max_regression}%!")
+        return False
+    return True
+
+
+def main():
+    args = parse_command_line_args()
+
+    corpus = load_corpus(args.root)
+    results = run_benchmark(corpus, args.repeat, args.slowest, args.profile)
+    print_results(results)
+    if args.profile is not None:
+        print_profile(results["profile"], args.slowest)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4, sort_keys=True)
+            f.write("\n")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+        if not compare_results(results, previous, args.max_regression):
+            exit(1)
+
+
+if __name__ == "__main__":
+    main()
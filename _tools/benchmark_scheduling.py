@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+"""Simulates how documents are scheduled on parallel jobs in the read phase, with
+the chunks of Sphinx and with the cost-balanced chunks of `_extensions/override_jobs.py`
+(used with `SPHINX_BALANCED_CHUNKS`).
+
+Chunks are run the way `sphinx.util.parallel.ParallelTasks` runs them: the
+first chunks start in order as long as jobs are available, then waiting
+chunks start as jobs finish, last added first. For each number of jobs, this
+reports the time until all documents are done (makespan) and how long the
+last job works alone after the first one has run out of chunks (tail).
+
+The time spent on each document is estimated from the size of its source,
+or taken from a profile written by `_extensions/build_profiler.py`, which is
+more accurate:
+  python _tools/benchmark_scheduling.py
+  python _tools/benchmark_scheduling.py --profile _build/build_profile.json --jobs 4 16
+"""
+
+import argparse
+import heapq
+import json
+import os
+import sys
+
+ROOT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT_PATH, "_extensions"))
+
+from sphinx.util.parallel import make_chunks  # noqa: E402
+
+from override_jobs import READ_DOCUMENT_OVERHEAD, make_balanced_chunks  # noqa: E402
+
+# Linear estimate of the time spent reading a document from the size of its source in bytes
+# (seconds, seconds per byte), fitted on a profile of a build with one job.
+READ_TIME_ESTIMATE = (0.023, 2.7e-6)
+
+
+def parse_command_line_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--profile",
+        help="Path to a `build_profile.json` file to take the time spent on each document from.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        nargs="+",
+        default=[2, 4, 8, 16],
+        help="Numbers of parallel jobs to simulate.",
+    )
+    parser.add_argument(
+        "--chunk-overhead",
+        type=float,
+        default=0.0,
+        help="Time in seconds added to each chunk, for starting a process and sending its results back.",
+    )
+    return parser.parse_args()
+
+
+def find_source_sizes():
+    sizes = {}
+    for root, dirs, files in os.walk(ROOT_PATH):
+        dirs[:] = sorted(name for name in dirs if not name.startswith((".", "_")))
+        for name in files:
+            if name.endswith(".rst"):
+                path = os.path.join(root, name)
+                docname = os.path.relpath(path, ROOT_PATH)[:-4].replace(os.sep, "/")
+                sizes[docname] = os.path.getsize(path)
+    return sizes
+
+
+def simulate(chunks, document_times, jobs, chunk_overhead):
+    """Returns the makespan and the tail of running `chunks` on `jobs` jobs."""
+    chunk_times = [sum(document_times[docname] for docname in chunk) + chunk_overhead for chunk in chunks]
+    running = [(chunk_times[i], i) for i in range(min(jobs, len(chunks)))]
+    heapq.heapify(running)
+    waiting = list(range(len(running), len(chunks)))
+
+    idle_times = []
+    while running:
+        time, _ = heapq.heappop(running)
+        if waiting:
+            i = waiting.pop()
+            heapq.heappush(running, (time + chunk_times[i], i))
+        else:
+            idle_times.append(time)
+    return idle_times[-1], idle_times[-1] - idle_times[0]
+
+
+def main():
+    args = parse_command_line_args()
+
+    if args.profile:
+        with open(args.profile, encoding="utf-8") as file:
+            documents = json.load(file)["documents"]
+        source_sizes = {docname: document.get("source_size", 0) for docname, document in documents.items()}
+        times = {docname: document.get("read_time", 0.0) for docname, document in documents.items()}
+        print(f"Simulating {len(documents)} documents with the times of {args.profile}.")
+    else:
+        source_sizes = find_source_sizes()
+        base, per_byte = READ_TIME_ESTIMATE
+        times = {docname: base + size * per_byte for docname, size in source_sizes.items()}
+        print(f"Simulating {len(source_sizes)} documents with times estimated from their size.")
+
+    docnames = sorted(source_sizes)
+    print(f"{'jobs':>4}  {'scheduler':>9} {'chunks':>6} {'makespan':>9} {'tail':>8}")
+    for jobs in args.jobs:
+        stock_chunks = make_chunks(docnames, jobs)
+        balanced_chunks = make_balanced_chunks(
+            docnames, jobs, lambda docname: source_sizes[docname] + READ_DOCUMENT_OVERHEAD
+        )
+        results = []
+        for name, chunks in (("stock", stock_chunks), ("balanced", balanced_chunks)):
+            makespan, tail = simulate(chunks, times, jobs, args.chunk_overhead)
+            results.append(makespan)
+            print(f"{jobs:>4}  {name:>9} {len(chunks):>6} {makespan:8.1f}s {tail:7.1f}s")
+        print(f"{'':>5} makespan reduced by {100 * (1 - results[1] / results[0]):.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+
+"""Builds only the pages affected by changes in Git, instead of the whole documentation.
+
+The changes between two revisions (or between a revision and the working tree,
+including untracked files) are compared with an index of the documentation
+(see `_tools/rst_index.py`), and the pages to build are:
+  - the changed documents themselves;
+  - the documents referring to a label that was added, removed or moved to
+    another section title, as the link text or target of these references
+    changes;
+  - the documents linking to or including a document in a toctree, when the
+    title of this document changed, or it was added, removed or renamed;
+  - the documents in a toctree that changed, as their previous and next links
+    may change;
+  - the documents using an image, video or included file that changed.
+
+Changes to `conf.py`, extensions, templates or static files affect all pages,
+so the whole documentation is built instead.
+
+The pages are then built by passing them as `FILELIST` to `make html`. Sphinx
+still reads every document it considers outdated, which is all of them after a
+fresh checkout, unless `SPHINX_CONTENT_HASHES` is set. Navigation in the
+sidebar of pages that are not built (e.g. when a title changes) isn't updated.
+
+The index reflects the working tree, so the last revision of the range should
+be the one checked out:
+  python _tools/build_changed_pages.py                      # Uncommitted changes.
+  python _tools/build_changed_pages.py origin/master        # Changes of the branch, and uncommitted ones.
+  python _tools/build_changed_pages.py HEAD~3 HEAD --dry-run
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT_PATH, "_tools"))
+
+from rst_index import EXCLUDED_DIRECTORIES, RstIndex, get_empty_scan, scan_document  # noqa: E402
+
+# Changes to these paths (or in these directories) affect all pages.
+FULL_BUILD_PATHS = ("conf.py", "_extensions/", "_templates/", "_static/", "requirements.txt")
+NULL_SHA = "0" * 40
+
+
+def parse_command_line_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "revisions",
+        nargs="*",
+        default=["HEAD"],
+        help="Revision to compare the working tree with, or two revisions to compare (default: HEAD).",
+    )
+    parser.add_argument(
+        "-n",
+        "--dry-run",
+        action="store_true",
+        help="Only print the pages that would be built, and why.",
+    )
+    parser.add_argument(
+        "-b",
+        "--builder",
+        default="html",
+        help="Make target to build the pages with (default: html).",
+    )
+    return parser.parse_args()
+
+
+def git(*args, **kwargs):
+    return subprocess.run(["git", *args], cwd=ROOT_PATH, check=True, capture_output=True, **kwargs).stdout
+
+
+def get_changes(revisions):
+    """Returns `(status, old path, new path, old sha, new sha)` for each changed file, where the
+    path and sha of a side that doesn't exist are `None`, and the sha is `None` for working tree files."""
+    output = git("diff", "--raw", "-z", "-M", "--no-abbrev", *revisions, "--")
+    fields = output.decode().split("\0")
+    changes = []
+    i = 0
+    while i < len(fields) - 1:
+        _, _, old_sha, new_sha, status = fields[i][1:].split(" ")
+        if status[0] in "RC":
+            old_path, new_path = fields[i + 1], fields[i + 2]
+            i += 3
+        else:
+            old_path = new_path = fields[i + 1]
+            i += 2
+        if status[0] == "A":
+            old_path = old_sha = None
+        elif status[0] == "D":
+            new_path = new_sha = None
+        changes.append((status[0], old_path, new_path, old_sha, None if new_sha == NULL_SHA else new_sha))
+
+    if len(revisions) < 2:
+        untracked = git("ls-files", "--others", "--exclude-standard", "-z", "--", ".", ":(exclude)_build")
+        for path in untracked.decode().split("\0"):
+            if path:
+                changes.append(("A", None, path, None, None))
+    return changes
+
+
+def read_blobs(shas):
+    """Returns the content of the Git blobs `shas`, read with a single `git cat-file` process."""
+    shas = sorted(set(shas))
+    output = git("cat-file", "--batch", input="".join(sha + "\n" for sha in shas).encode())
+    blobs = {}
+    offset = 0
+    for sha in shas:
+        header_end = output.index(b"\n", offset)
+        size = int(output[offset:header_end].split()[2])
+        blobs[sha] = output[header_end + 1 : header_end + 1 + size].decode("utf-8-sig")
+        # Content is followed by a newline.
+        offset = header_end + 1 + size + 1
+    return blobs
+
+
+def is_document(path):
+    return path is not None and path.endswith(".rst") and path.split("/")[0] not in EXCLUDED_DIRECTORIES
+
+
+def affects_all_pages(path):
+    return any(path == prefix or (prefix.endswith("/") and path.startswith(prefix)) for prefix in FULL_BUILD_PATHS)
+
+
+def get_affected_documents(changes, index):
+    """Returns the affected documents with the reasons they're affected, or `None` if all are."""
+    affected = {}
+
+    def add(docnames, reason):
+        for docname in docnames:
+            if docname in index.documents:
+                affected.setdefault(docname, []).append(reason)
+
+    blobs = read_blobs(
+        [change[3] for change in changes if is_document(change[1])]
+        + [change[4] for change in changes if is_document(change[2]) and change[4] is not None]
+    )
+
+    for status, old_path, new_path, old_sha, new_sha in changes:
+        path = new_path or old_path
+        if affects_all_pages(path):
+            return None
+
+        if not is_document(old_path) and not is_document(new_path):
+            docnames = index.asset_references.get(old_path, set()) | index.asset_references.get(new_path, set())
+            add(sorted(docnames), f"uses {path}")
+            continue
+
+        old_docname = old_path[: -len(".rst")] if is_document(old_path) else None
+        new_docname = new_path[: -len(".rst")] if is_document(new_path) else None
+        old_scan = scan_document(old_docname, blobs[old_sha]) if old_docname else get_empty_scan()
+        if new_docname is None:
+            new_scan = get_empty_scan()
+        elif new_sha is None:
+            with open(os.path.join(ROOT_PATH, new_path), encoding="utf-8-sig") as f:
+                new_scan = scan_document(new_docname, f.read())
+        else:
+            new_scan = scan_document(new_docname, blobs[new_sha])
+
+        add([new_docname], "changed")
+        # Includes are tracked like assets.
+        add(sorted(index.asset_references.get(path, ())), f"includes {path}")
+        for docnames, reason in index.get_dependents(old_docname, old_scan, new_docname, new_scan):
+            add(docnames, reason)
+
+    return affected
+
+
+def main():
+    args = parse_command_line_args()
+    if len(args.revisions) > 2:
+        sys.exit("Expected at most two revisions.")
+
+    index = RstIndex.load()
+    affected = get_affected_documents(get_changes(args.revisions), index)
+
+    command = ["make", args.builder]
+    if affected is None:
+        print("Configuration, extensions, templates or static files changed, building all pages.")
+    elif not affected:
+        print("No page is affected by the changes.")
+        return
+    else:
+        print(f"{len(affected)} of {len(index.documents)} pages affected by the changes:")
+        for docname in sorted(affected):
+            print(f"  {docname}: {', '.join(affected[docname])}")
+        command.append("FILELIST=" + " ".join(docname + ".rst" for docname in sorted(affected)))
+
+    if args.dry_run:
+        return
+    sys.exit(subprocess.run(command, cwd=ROOT_PATH).returncode)
+
+
+if __name__ == "__main__":
+    main()
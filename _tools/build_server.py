@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+
+"""Serves the documentation locally, building pages again as soon as they're saved.
+
+Running `make html` after each edit loads the configuration, extensions and
+environment again, and writes the root document and the other pages linking
+to the edited one in toctrees, which takes a while. This keeps Sphinx and its
+environment in memory instead: after an initial build (which only reads and
+writes what's outdated, like `make html`), the source tree is watched, and
+when files change, only the outdated documents are read again, and only
+these documents and those whose output depends on them are written (see
+`_tools/rst_index.py`), usually in well under a second. The time each
+rebuild took is printed, along with the time since the file was saved.
+
+The result is served on http://127.0.0.1:8000 by default, from `_build/html`
+as with `make html`. The search index, general index and search page are
+only updated when stopping the server (with Ctrl+C). The server restarts
+itself when `conf.py` or an extension changes:
+  python _tools/build_server.py
+  python _tools/build_server.py --port 8080 -j 4
+"""
+
+import argparse
+import functools
+import http.server
+import os
+import pickle
+import sys
+import threading
+import time
+
+ROOT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT_PATH, "_tools"))
+
+from sphinx.application import ENV_PICKLE_FILENAME, Sphinx  # noqa: E402
+from sphinx.util import logging  # noqa: E402
+from sphinx.util.build_phase import BuildPhase  # noqa: E402
+from sphinx.util.parallel import SerialTasks  # noqa: E402
+
+from rst_index import EXCLUDED_DIRECTORIES, RstIndex, get_empty_scan, scan_document  # noqa: E402
+
+BUILD_PATH = os.path.join(ROOT_PATH, "_build")
+# Changes to these paths (or in these directories) need Sphinx to be loaded again.
+RESTART_PATHS = ("conf.py", "_extensions/")
+
+
+def parse_command_line_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1", help="Address to serve the documentation on.")
+    parser.add_argument("--port", type=int, default=8000, help="Port to serve the documentation on.")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of parallel jobs for the initial build (rebuilds use a single one).",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.2,
+        help="Time in seconds between checks for changed files.",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show the output of Sphinx.")
+    return parser.parse_args()
+
+
+def get_file_states():
+    """Returns the modification time and size of all source files, by path relative to the root."""
+    states = {}
+    for directory, dirnames, filenames in os.walk(ROOT_PATH, followlinks=True):
+        dirnames[:] = [
+            name
+            for name in dirnames
+            if not name.startswith(".")
+            and name != "__pycache__"
+            and not (directory == ROOT_PATH and name in EXCLUDED_DIRECTORIES)
+        ]
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # Removed since it was listed.
+                continue
+            states[os.path.relpath(path, ROOT_PATH).replace(os.sep, "/")] = (stat.st_mtime_ns, stat.st_size)
+    return states
+
+
+def is_document(path):
+    return path.endswith(".rst")
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class BuildServer:
+    def __init__(self, app):
+        self.app = app
+        self.index = RstIndex.load()
+        self.file_states = get_file_states()
+
+    def get_dependents(self, paths):
+        """Updates the index with the changed documents in `paths`, and returns the documents
+        whose output depends on them."""
+        dependents = set()
+        for path in filter(is_document, paths):
+            docname = path[: -len(".rst")]
+            old_scan = self.index.documents.get(docname)
+            try:
+                with open(os.path.join(ROOT_PATH, path), encoding="utf-8-sig") as f:
+                    new_scan = scan_document(docname, f.read())
+                self.index.add_document(docname, new_scan)
+            except OSError:
+                new_scan = None
+                self.index.remove_document(docname)
+            for docnames, _ in self.index.get_dependents(
+                docname if old_scan else None,
+                old_scan or get_empty_scan(),
+                docname if new_scan else None,
+                new_scan or get_empty_scan(),
+            ):
+                dependents.update(docnames)
+        return dependents
+
+    def rebuild(self, paths):
+        """Reads the outdated documents and writes them with their dependents, returns the numbers
+        of documents read and written."""
+        app = self.app
+        builder = app.builder
+        env = app.env
+        dependents = self.get_dependents(paths)
+
+        with logging.pending_warnings():
+            updated = set(builder.read())
+        read_count = len(updated)
+        updated.update(env.check_dependents(app, updated))
+
+        # Pages older than their source or templates, and all of them if the configuration changed.
+        outdated = builder.get_outdated_docs()
+        outdated = env.found_docs if isinstance(outdated, str) else set(outdated)
+        docnames = (updated | outdated | dependents) & env.found_docs
+        if not docnames:
+            return read_count, 0
+
+        app.phase = BuildPhase.RESOLVING
+        builder.parallel_ok = False
+        # Images used by written pages are collected again, so only these are copied.
+        builder.images.clear()
+        builder.prepare_writing(docnames)
+        if any(path.startswith("_static/") for path in paths):
+            builder.copy_static_files()
+        builder.write_documents(docnames)
+        builder.copy_image_files()
+        builder.copy_download_files()
+        return read_count, len(docnames)
+
+    def finish(self):
+        """Writes the search index, indices and additional pages, and saves the environment."""
+        builder = self.app.builder
+        builder.finish_tasks = SerialTasks()
+        builder.finish()
+        builder.finish_tasks.join()
+        # The shards of the search index are written when builds finish, which they don't here.
+        if "search_shards" in self.app.extensions:
+            self.app.extensions["search_shards"].module.write_search_shards(self.app, None)
+        with open(os.path.join(self.app.doctreedir, ENV_PICKLE_FILENAME), "wb") as f:
+            pickle.dump(self.app.env, f, pickle.HIGHEST_PROTOCOL)
+
+    def watch(self, interval):
+        rebuilt = False
+        while True:
+            time.sleep(interval)
+            file_states = get_file_states()
+            paths = sorted(
+                path
+                for path in file_states.keys() | self.file_states.keys()
+                if file_states.get(path) != self.file_states.get(path)
+            )
+            if not paths:
+                continue
+            self.file_states = file_states
+
+            if any(path == prefix or path.startswith(prefix) for path in paths for prefix in RESTART_PATHS):
+                print("Configuration or extensions changed, restarting.", flush=True)
+                if rebuilt:
+                    self.finish()
+                os.execv(sys.executable, [sys.executable, *sys.argv])
+
+            saved_at = max((file_states[path][0] for path in paths if path in file_states), default=time.time_ns())
+            start = time.perf_counter()
+            read_count, write_count = self.rebuild(paths)
+            rebuilt = rebuilt or write_count > 0
+            duration = time.perf_counter() - start
+            latency = (time.time_ns() - saved_at) / 1e9
+            changes = paths[0] if len(paths) == 1 else f"{len(paths)} files"
+            print(
+                f"{time.strftime('%H:%M:%S')} {changes} changed: read {read_count} and wrote {write_count} pages "
+                f"in {duration:.2f}s ({latency:.2f}s after saving)",
+                flush=True,
+            )
+
+
+def main():
+    args = parse_command_line_args()
+
+    start = time.perf_counter()
+    app = Sphinx(
+        ROOT_PATH,
+        ROOT_PATH,
+        os.path.join(BUILD_PATH, "html"),
+        os.path.join(BUILD_PATH, "doctrees"),
+        "html",
+        status=sys.stdout if args.verbose else None,
+        warning=sys.stderr,
+        parallel=args.jobs,
+    )
+    app.build()
+    print(f"Initial build done in {time.perf_counter() - start:.1f}s.", flush=True)
+
+    handler = functools.partial(QuietHandler, directory=app.outdir)
+    httpd = http.server.ThreadingHTTPServer((args.host, args.port), handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    print(f"Serving on http://{args.host}:{args.port}/, watching for changes (Ctrl+C to stop).", flush=True)
+
+    server = BuildServer(app)
+    try:
+        server.watch(args.interval)
+    except KeyboardInterrupt:
+        print("Writing the search index and indices.", flush=True)
+        server.finish()
+    finally:
+        httpd.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+
+"""Checks that the GDScript lexer produces the same tokens as a lexer using plain
+regular expressions, to catch regressions when editing `_extensions/gdscript.py`.
+
+`GDScriptLexer` classifies builtin identifiers with `IdentifierTable`, which
+Pygments doesn't know about (see `GDScriptLexerMeta`). The reference lexer
+replaces each of these rules with the `words()` alternations they stand for,
+in the same order, and both lexers must produce the same token stream for:
+  - every `gdscript`/`gd` code block of the documentation (the corpus of
+    `benchmark_gdscript_lexer.py`);
+  - generated snippets mixing builtin names with the characters around
+    identifiers that matter to the rules (`.`, `@`, `_`, digits, etc.).
+
+Exits with status 1 if any difference is found:
+  python _tools/check_gdscript_lexer.py
+"""
+
+import argparse
+import os
+import random
+import sys
+
+ROOT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT_PATH, "_extensions"))
+sys.path.insert(0, os.path.join(ROOT_PATH, "_tools"))
+
+from pygments.lexer import RegexLexer, words  # noqa: E402
+
+import gdscript_builtins  # noqa: E402
+from benchmark_gdscript_lexer import load_corpus  # noqa: E402
+from gdscript import GDScriptLexer, IdentifierTable  # noqa: E402
+
+SEPARATORS = (" ", ".", "(", ")", ":", ",", "\n", "\t", "@", "$", "%", "_", "0", "é", "[", "]", '"', "#")
+
+
+def get_table_words(table_words):
+    if isinstance(table_words, str):
+        return getattr(gdscript_builtins, table_words)
+    return table_words
+
+
+def get_regex_rules(rules):
+    """Returns `rules` with each `IdentifierTable` rule replaced by the equivalent `words()` rules."""
+    regex_rules = []
+    for rule in rules:
+        if isinstance(rule, tuple) and isinstance(rule[0], IdentifierTable):
+            table = rule[0]
+            # The pattern is the prefix followed by a generic identifier.
+            prefix = table.regex.pattern[: -len(r"@?[a-zA-Z_]\w*")]
+            for table_words, token in table.tables:
+                regex_rules.append((words(get_table_words(table_words), prefix=prefix, suffix=r"\b"), token))
+        else:
+            regex_rules.append(rule)
+    return regex_rules
+
+
+class RegexGDScriptLexer(RegexLexer):
+    """GDScriptLexer with plain regular expressions instead of identifier tables."""
+
+    name = "GDScript (regular expressions)"
+    flags = GDScriptLexer.flags
+    tokens = {state: get_regex_rules(rules) for state, rules in GDScriptLexer.tokens.items()}
+
+
+def generate_snippets(count, seed):
+    """Yields `count` snippets of builtin names and other identifiers joined by separators."""
+    rng = random.Random(seed)
+    names = sorted(
+        set(
+            word
+            for rule in GDScriptLexer.tokens["builtin"]
+            if isinstance(rule, tuple) and isinstance(rule[0], IdentifierTable)
+            for table_words, _ in rule[0].tables
+            for word in get_table_words(table_words)
+        )
+    )
+    names += ["name", "_private", "var", "func", "self_", "x2", "Vector", "Vector2ii", "@", "."]
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(1, 8)):
+            name = rng.choice(names)
+            if rng.random() < 0.2:
+                name = name[: rng.randint(0, len(name))]
+            elif rng.random() < 0.2:
+                name += rng.choice(("_", "2", "x", "é"))
+            parts.append(name)
+            parts.append(rng.choice(SEPARATORS))
+        yield "".join(parts) + "\n"
+
+
+def find_difference(expected, actual):
+    """Returns the index of the first token that differs between both token lists, or None."""
+    for i, (expected_token, actual_token) in enumerate(zip(expected, actual)):
+        if expected_token != actual_token:
+            return i
+    if len(expected) != len(actual):
+        return min(len(expected), len(actual))
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--root",
+        default=ROOT_PATH,
+        help="Path to the documentation root, where reST files are looked up.",
+    )
+    parser.add_argument(
+        "--snippets",
+        type=int,
+        default=20000,
+        help="Number of generated snippets to check.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed of the generated snippets.",
+    )
+    args = parser.parse_args()
+
+    lexer = GDScriptLexer()
+    reference = RegexGDScriptLexer()
+
+    cases = [(f"{path}:{line}", source) for path, line, source in load_corpus(args.root)]
+    cases += [(f"snippet #{i}", source) for i, source in enumerate(generate_snippets(args.snippets, args.seed))]
+
+    failures = 0
+    for name, source in cases:
+        expected = list(reference.get_tokens_unprocessed(source))
+        actual = list(lexer.get_tokens_unprocessed(source))
+        index = find_difference(expected, actual)
+        if index is None:
+            continue
+        failures += 1
+        if failures <= 10:
+            print(f"{name}: tokens differ at token {index}:")
+            print(f"  expected: {expected[index] if index < len(expected) else None!r}")
+            print(f"  actual:   {actual[index] if index < len(actual) else None!r}")
+
+    print(f"Checked {len(cases)} code blocks and snippets, {failures} with different tokens.")
+    if failures:
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
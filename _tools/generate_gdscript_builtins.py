@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+"""Generates `_extensions/gdscript_builtins.py`, the tables of builtin names
+highlighted by the GDScript lexer, from the class reference in `classes/`.
+
+Run it after syncing the class reference, so code blocks highlight the
+classes, functions and annotations of the current engine version:
+  python _tools/generate_gdscript_builtins.py
+"""
+
+import argparse
+import os
+import re
+import textwrap
+
+ROOT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Sections of `classes/index.rst` to generate each table from.
+CLASS_SECTIONS = ("Nodes", "Resources", "Other objects", "Editor-only")
+VARIANT_TYPE_SECTIONS = ("Variant types",)
+
+SECTION_REGEX = re.compile(r"^(?P<title>[^\n]+)\n=+\n\n\.\. toctree::\n(?:[ ]+:[^\n]*\n)*\n(?P<entries>(?:[ ]+\S+\n)+)", re.M)
+CLASS_LABEL_REGEX = re.compile(r"^\.\. _class_([^:]+):$", re.M)
+METHOD_LABEL_REGEX = re.compile(r"^\.\. _class_@\w+_method_(\w+):$", re.M)
+ANNOTATION_LABEL_REGEX = re.compile(r"^\.\. _class_@\w+_annotation_(@\w+):$", re.M)
+
+HEADER = '''# -*- coding: utf-8 -*-
+"""
+    gdscript_builtins
+    ~~~~~~~~~~~~~~~~~
+
+    Builtin names highlighted by the GDScript lexer (see gdscript.py).
+
+    DO NOT EDIT THIS FILE!!!
+    Generated automatically from the class reference in classes/
+    by _tools/generate_gdscript_builtins.py.
+"""
+'''
+
+
+def parse_command_line_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--classes",
+        default=os.path.join(ROOT_PATH, "classes"),
+        help="Path to the class reference folder.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=os.path.join(ROOT_PATH, "_extensions", "gdscript_builtins.py"),
+        help="Path to the generated module.",
+    )
+    return parser.parse_args()
+
+
+def read_file(path):
+    with open(path, "r", encoding="utf-8-sig") as f:
+        return f.read()
+
+
+def read_class_name(classes_path, document):
+    """Returns the class name documented in `document` (e.g. `class_node` -> `Node`)."""
+    match = CLASS_LABEL_REGEX.search(read_file(os.path.join(classes_path, document + ".rst")))
+    if not match:
+        raise ValueError(f"No class label found in {document}.rst.")
+    return match[1]
+
+
+def read_index_sections(classes_path):
+    """Returns {section title: [class names]} from the toctrees of the class reference index."""
+    sections = {}
+    for match in SECTION_REGEX.finditer(read_file(os.path.join(classes_path, "index.rst"))):
+        documents = match["entries"].split()
+        sections[match["title"]] = [read_class_name(classes_path, document) for document in documents]
+    return sections
+
+
+def collect_classes(sections, titles):
+    names = []
+    for title in titles:
+        if title not in sections:
+            raise ValueError(f"Section {title!r} not found in the class reference index.")
+        for name in sections[title]:
+            if name not in names:
+                names.append(name)
+    return names
+
+
+def collect_labels(classes_path, documents, regex):
+    names = []
+    for document in documents:
+        for name in regex.findall(read_file(os.path.join(classes_path, document))):
+            if name not in names:
+                names.append(name)
+    return sorted(names)
+
+
+def format_table(name, comment, words):
+    items = ", ".join(f'"{word}"' for word in words) + ","
+    lines = textwrap.wrap(items, width=116, break_long_words=False, break_on_hyphens=False)
+    body = "\n".join("    " + line for line in lines)
+    return f"\n# {comment}\n{name} = (\n{body}\n)\n"
+
+
+def main():
+    args = parse_command_line_args()
+
+    sections = read_index_sections(args.classes)
+    tables = [
+        (
+            "GLOBAL_FUNCTIONS",
+            "Methods of @GlobalScope and @GDScript.",
+            collect_labels(args.classes, ("class_@globalscope.rst", "class_@gdscript.rst"), METHOD_LABEL_REGEX),
+        ),
+        (
+            "VARIANT_TYPES",
+            "Classes listed under " + ", ".join(VARIANT_TYPE_SECTIONS) + " in classes/index.rst.",
+            collect_classes(sections, VARIANT_TYPE_SECTIONS),
+        ),
+        (
+            "CLASSES",
+            "Classes listed under " + ", ".join(CLASS_SECTIONS) + " in classes/index.rst.",
+            collect_classes(sections, CLASS_SECTIONS),
+        ),
+        (
+            "ANNOTATIONS",
+            "Annotations of @GDScript.",
+            collect_labels(args.classes, ("class_@gdscript.rst",), ANNOTATION_LABEL_REGEX),
+        ),
+    ]
+
+    with open(args.output, "w", encoding="utf-8", newline="\n") as f:
+        f.write(HEADER)
+        for name, comment, words in tables:
+            if not words:
+                raise ValueError(f"No entries found for {name}.")
+            f.write(format_table(name, comment, words))
+
+    for name, _, words in tables:
+        print(f"{name}: {len(words)} entries")
+    print("Wrote", args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,25 @@
-import re
+"""Moves reST documents and the images, videos and other files only they use to another directory.
+
+The documents and files to move are found with the index of the whole documentation
+(see `_tools/rst_index.py`, cached in `_build/rst_index.json` so only documents changed
+since the last run are scanned again). Files also used by documents which aren't moved
+stay where they are, as well as files outside the directories of the moved documents (both
+are listed). References to the moved documents and files (`:doc:`, toctree entries,
+`:download:` and directives such as `.. image::`, `.. figure::` and `.. video::`) are
+rewritten in every document, as well as the relative references of the moved documents.
+"""
+
+import posixpath
 from argparse import ArgumentParser
 from os.path import isfile, isdir, join, realpath, split, dirname, relpath
 import os
 import shutil
+import sys
+
+sys.path.insert(0, dirname(realpath(__file__)))
+
+from rst_index import ROOT_PATH, RstIndex, is_external, resolve_path  # noqa: E402
+from rst_index import ASSET_DIRECTIVE_REGEX, OPTION_REGEX, ROLE_REGEX, ROLE_TARGET_REGEX, TOCTREE_REGEX  # noqa: E402
 
 
 def parse_and_get_arguments():
@@ -17,6 +34,9 @@ def parse_and_get_arguments():
     parser.add_argument(
         "output_path", help="Path to the target output directory.",
     )
+    parser.add_argument(
+        "-n", "--dry-run", action="store_true", help="Only print the files that would be moved and changed.",
+    )
     return parser.parse_args()
 
 
@@ -42,39 +62,136 @@ from the path of any file in the project."""
     return root_path
 
 
-def find_images(document):
-    """Returns the list of image filepaths used by the `document`."""
-    images = []
-    for line in document:
-        match = re.match(r"\.\. image::\s+(img\/.+)", line)
+def get_docname(path):
+    """Returns the docname of the document at `path`, relative to the root of the documentation."""
+    return relpath(realpath(path), ROOT_PATH).replace(os.sep, "/").rsplit(".rst", 1)[0]
+
+
+def plan_moves(index, docnames, output_docdir):
+    """Returns a dict with the form { old path: new path } of the documents in `docnames` and the
+    files only they use, the list of files they share with other documents, and the list of files
+    only they use but outside their directories (neither of which are moved).
+    Paths are relative to the root, without extension for documents."""
+    moves = {}
+    shared = set()
+    outside = set()
+    for docname in docnames:
+        moves[docname] = posixpath.join(output_docdir, posixpath.basename(docname))
+        directory = posixpath.dirname(docname)
+        for _, path, _ in index.documents[docname]["assets"]:
+            if path in moves or path.endswith(".rst") or not isfile(join(ROOT_PATH, path)):
+                continue
+            if not index.asset_references.get(path, set()) <= set(docnames):
+                shared.add(path)
+            # Files in the directory of the document (e.g. in `img/`) keep their place relative to it.
+            elif directory == "" or path.startswith(directory + "/"):
+                moves[path] = posixpath.join(output_docdir, posixpath.relpath(path, directory or "."))
+            # Other files (e.g. in a common directory) would have no obvious place in the output directory.
+            else:
+                outside.add(path)
+    # A file in the directory of one moved document can be outside the directory of another.
+    return moves, sorted(shared), sorted(outside - moves.keys())
+
+
+def move_target(target, docname, new_docname, moves):
+    """Returns `target`, referred to from `docname` which moves to `new_docname`, updated for `moves`."""
+    if is_external(target):
+        return target
+    path = resolve_path(docname, target)
+    new_path = moves.get(path, path)
+    if new_path == path and new_docname == docname:
+        return target
+    if target.startswith("/"):
+        return "/" + new_path
+    return posixpath.relpath(new_path, posixpath.dirname(new_docname) or ".")
+
+
+def rewrite_references(docname, new_docname, text, moves):
+    """Returns `text`, the content of `docname` which moves to `new_docname`, with its references
+    (to documents and files, relative or not) updated for `moves`."""
+    lines = text.splitlines(keepends=True)
+    toctree_indent = None
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if toctree_indent is not None:
+            indent = len(line) - len(line.lstrip())
+            if stripped and indent <= toctree_indent:
+                toctree_indent = None
+            elif stripped and not OPTION_REGEX.match(line) and stripped != "self":
+                match = ROLE_TARGET_REGEX.match(stripped)
+                target = match[1] if match else stripped
+                if not any(c in target for c in "*?["):
+                    lines[i] = line.replace(target, move_target(target, docname, new_docname, moves), 1)
+                continue
+            else:
+                continue
+
+        match = TOCTREE_REGEX.match(line)
+        if match:
+            toctree_indent = len(match[1])
+            continue
+
+        match = ASSET_DIRECTIVE_REGEX.match(line)
         if match:
-            images.append(match[1])
-    return list(set(images))
-
-
-def find_document_dependencies(documents):
-    """For each document path in `documents`, finds all pictures it depends on and returns a dict with the form { document: [images] }."""
-    data = {}
-    for path in documents:
-        with open(path, "r") as rst_file:
-            images = find_images(rst_file)
-            data[path] = images
-    return data
-
-
-def move_documents(paths, output_path):
-    """Moves .rst files and all their image dependencies to `output_path`"""
-    data = find_document_dependencies(paths)
-    for path in data:
-        directory = dirname(path)
-        shutil.move(path, output_path)
-        for image in data[path]:
-            image_in_path = join(directory, image)
-            image_out_path = join(output_path, image)
-            image_out_dirpath = dirname(image_out_path)
-            if not isdir(image_out_dirpath):
-                os.makedirs(image_out_dirpath)
-            shutil.move(image_in_path, image_out_path)
+            new_target = move_target(match[2], docname, new_docname, moves)
+            lines[i] = line[: match.start(2)] + new_target + line[match.end(2) :]
+
+    def replace_role(match):
+        role, content = match[1], match[2]
+        if role == "ref":
+            return match[0]
+        target_match = ROLE_TARGET_REGEX.match(content)
+        target = target_match[1] if target_match else content
+        new_content = content[: len(content) - len(target) - (1 if target_match else 0)]
+        new_content += move_target(target, docname, new_docname, moves) + (">" if target_match else "")
+        return f":{role}:`{new_content}`"
+
+    return ROLE_REGEX.sub(replace_role, "".join(lines))
+
+
+def move_documents(paths, output_path, dry_run=False):
+    """Moves .rst files and the files only they use to `output_path`, and updates the references
+    to them in all documents."""
+    index = RstIndex.load()
+    docnames = [get_docname(path) for path in paths]
+    output_docdir = relpath(realpath(output_path), ROOT_PATH).replace(os.sep, "/")
+    if output_docdir == ".":
+        output_docdir = ""
+    moves, shared, outside = plan_moves(index, docnames, output_docdir)
+
+    for old, new in moves.items():
+        new_path = join(ROOT_PATH, new + ".rst" if old in index.documents else new)
+        if old != new and os.path.exists(new_path):
+            print(f"Can't move {old} to {new}, which already exists. Aborting.")
+            exit(1)
+
+    # The moved documents, and the documents referring to them or to the moved files.
+    to_rewrite = set(docnames)
+    for old in moves:
+        to_rewrite |= index.get_document_references(old)
+    for docname in sorted(to_rewrite):
+        new_docname = moves.get(docname, docname)
+        with open(join(ROOT_PATH, docname + ".rst"), "r", encoding="utf-8") as rst_file:
+            text = rst_file.read()
+        new_text = rewrite_references(docname, new_docname, text, moves)
+        if new_text != text:
+            print("Updating references in", docname + ".rst")
+            if not dry_run:
+                with open(join(ROOT_PATH, docname + ".rst"), "w", encoding="utf-8") as rst_file:
+                    rst_file.write(new_text)
+
+    for path in shared:
+        users = sorted(index.asset_references[path] - set(docnames))
+        print("Keeping", path, "also used by", ", ".join(users))
+    for path in outside:
+        print("Keeping", path, "only used by the moved documents, but outside their directories")
+    for old, new in moves.items():
+        if old in index.documents:
+            old, new = old + ".rst", new + ".rst"
+        print("Moving", old, "to", new)
+        if not dry_run:
+            os.makedirs(dirname(join(ROOT_PATH, new)), exist_ok=True)
+            shutil.move(join(ROOT_PATH, old), join(ROOT_PATH, new))
 
 
 def print_redirects(paths):
@@ -104,5 +221,5 @@ if __name__ == "__main__":
     documents = [
         path for path in args.documents if isfile(path) and path.endswith(".rst")
     ]
-    move_documents(documents, args.output_path)
+    move_documents(documents, args.output_path, args.dry_run)
     print_redirects(documents)
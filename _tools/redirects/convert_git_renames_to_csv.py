@@ -4,6 +4,13 @@
 that to a CSV table.
 
 Use it to prepare and double-check data for create_redirects.py.
+
+With --history, the renames of every commit between the revisions are followed
+instead, in a single pass over `git log`, so files renamed several times (or on
+several branches) get one redirect from each of their old names to their last
+one. With --merge, the redirects are added to an existing CSV file (which is then
+sorted like create_redirects.py sorts it), and its redirects to pages renamed
+since then are updated.
 """
 
 import subprocess
@@ -25,9 +32,23 @@ def parse_command_line_args():
     parser.add_argument(
         "revision2",
         type=str,
-        help="End revision to get renamed files from (new).",
+        nargs="+",
+        help="End revision to get renamed files from (new). With --history, several end revisions "
+        "can be given (e.g. release branches).",
     )
     parser.add_argument("-f", "--output-file", type=str, help="Path to the output file")
+    parser.add_argument(
+        "--history",
+        action="store_true",
+        help="Follows the renames of each commit between the revisions, instead of comparing the revisions.",
+    )
+    parser.add_argument(
+        "--merge",
+        metavar="file",
+        type=str,
+        help="Path to a CSV file of redirects (e.g. ../../_static/redirects.csv) to add the renames to. "
+        "It's written to the output file if given, or updated otherwise.",
+    )
     return parser.parse_args()
 
 
@@ -38,6 +59,136 @@ def dict_item_to_str(item):
     return s
 
 
+def redirect_to_str(item):
+    # Same order as create_redirects.py.
+    return item["source"] + " -> " + item["destination"]
+
+
+def document_to_url(path):
+    url = path.replace(".rst", ".html")
+    if not url.startswith("/"):
+        url = "/" + url
+    return url
+
+
+def get_history_renames(start, ends):
+    """Returns the last name of each document renamed in the commits between `start` and `ends`,
+    by old name, following it through successive renames.
+
+    The commits are read from `git log` as it outputs them, from the most recent one, keeping the
+    final name of the document at each path as of the commit being read: a renamed document ends
+    up where the document at its new name at that point does. Paths can be used by several
+    documents over time, so a path stops having a final name before the commit which added it
+    (or renamed a document to it), and after the one which deleted it.
+    """
+    renames = {}
+    final = {}
+    with subprocess.Popen(
+        [
+            "git",
+            "-c",
+            "core.quotePath=false",
+            "log",
+            "--topo-order",
+            "--find-renames",
+            "--name-status",
+            "--diff-filter=ADR",
+            "--format=",
+            "^" + start,
+            *ends,
+            "--",
+            "*.rst",
+        ],
+        stdout=subprocess.PIPE,
+        encoding="utf-8",
+    ) as git:
+        for line in git.stdout:
+            line = line.rstrip("\n")
+            if not line:
+                continue
+            status, *paths = line.split("\t")
+            if status.startswith("R"):
+                source, destination = paths
+                final[source] = final.get(destination, destination)
+                final.pop(destination, None)
+                # The most recent rename of a path is the one its redirect follows.
+                renames.setdefault(source, final[source])
+            else:
+                # Added or deleted: another document (or none) was at this path in older commits.
+                final.pop(paths[0], None)
+    if git.returncode != 0:
+        print("Failed to read the history from", start, "to", ", ".join(ends) + ".")
+        exit(1)
+
+    # Documents renamed back, or which exist again in every end revision, don't need a redirect
+    # (RTD only redirects pages which don't exist).
+    documents = None
+    for end in ends:
+        end_documents = set(
+            subprocess.check_output(["git", "-c", "core.quotePath=false", "ls-tree", "-r", "--name-only", end])
+            .decode("utf-8")
+            .split("\n")
+        )
+        documents = end_documents if documents is None else documents & end_documents
+    return {
+        source: destination
+        for source, destination in renames.items()
+        if source not in documents and source != destination
+    }
+
+
+def merge_redirects(path, csv_data):
+    """Returns the redirects of the CSV file at `path` with the ones of `csv_data` added.
+
+    The redirects are sorted the same way as create_redirects.py sorts the file. Those to a source of
+    `csv_data` are updated to its destination, and those from an existing source are kept as is.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        merged = list(csv.DictReader(f))
+    by_source = {row["source"]: row for row in merged}
+    by_destination = {}
+    for row in merged:
+        by_destination.setdefault(row["destination"].split("#", 1)[0], []).append(row)
+
+    added = 0
+    updated = 0
+    for redirect in csv_data:
+        # Redirects to the renamed page go to its new name.
+        for row in by_destination.pop(redirect["source"], []):
+            fragment = row["destination"][len(redirect["source"]):]
+            row["destination"] = redirect["destination"] + fragment
+            by_destination.setdefault(redirect["destination"], []).append(row)
+            updated += 1
+
+        row = by_source.get(redirect["source"])
+        if row is None:
+            merged.append(redirect)
+            by_source[redirect["source"]] = redirect
+            by_destination.setdefault(redirect["destination"], []).append(redirect)
+            added += 1
+        elif row["destination"] != redirect["destination"]:
+            print(
+                "Keeping redirect",
+                redirect_to_str(row),
+                "from",
+                path + ", instead of",
+                redirect_to_str(redirect),
+                file=sys.stderr,
+            )
+
+    merged.sort(key=redirect_to_str)
+    print(
+        "Added",
+        added,
+        "redirects to",
+        path + ", and updated",
+        updated,
+        "redirects to renamed pages.",
+        file=sys.stderr,
+    )
+    return merged
+
+
 def main():
     try:
         subprocess.check_output(["git", "--version"])
@@ -46,12 +197,13 @@ def main():
         exit(1)
 
     args = parse_command_line_args()
-    assert args.revision1 != args.revision2, "Revisions must be different."
-    for revision in [args.revision1, args.revision2]:
+    assert args.history or len(args.revision2) == 1, "Only one end revision can be given without --history."
+    assert args.revision1 not in args.revision2, "Revisions must be different."
+    for revision in [args.revision1, *args.revision2]:
         assert not "/" in revision, "Revisions must be local branches only."
 
     # Ensure that both revisions are present in the local repository.
-    for revision in [args.revision1, args.revision2]:
+    for revision in [args.revision1, *args.revision2]:
         try:
             subprocess.check_output(
                 ["git", "rev-list", f"HEAD..{revision}"], stderr=subprocess.STDOUT
@@ -63,44 +215,49 @@ def main():
             )
             exit(1)
 
-    # Get the list of renamed files between the two revisions.
-    renamed_files = (
-        subprocess.check_output(
-            [
-                "git",
-                "diff",
-                "--find-renames",
-                "--name-status",
-                "--diff-filter=R",
-                args.revision1,
-                args.revision2,
-            ]
-        )
-        .decode("utf-8")
-        .split("\n")
-    )
-    renamed_documents = [f for f in renamed_files if f.lower().endswith(".rst")]
-
     csv_data: list[dict] = []
 
-    for document in renamed_documents:
-        _, source, destination = document.split("\t")
-        source = source.replace(".rst", ".html")
-        destination = destination.replace(".rst", ".html")
-        if not source.startswith("/"):
-            source = "/" + source
-        if not destination.startswith("/"):
-            destination = "/" + destination
-        csv_data.append(
-            {"source": source, "destination": destination}
+    if args.history:
+        for source, destination in get_history_renames(args.revision1, args.revision2).items():
+            csv_data.append(
+                {"source": document_to_url(source), "destination": document_to_url(destination)}
+            )
+    else:
+        # Get the list of renamed files between the two revisions.
+        renamed_files = (
+            subprocess.check_output(
+                [
+                    "git",
+                    "diff",
+                    "--find-renames",
+                    "--name-status",
+                    "--diff-filter=R",
+                    args.revision1,
+                    args.revision2[0],
+                ]
+            )
+            .decode("utf-8")
+            .split("\n")
         )
+        renamed_documents = [f for f in renamed_files if f.lower().endswith(".rst")]
+
+        for document in renamed_documents:
+            _, source, destination = document.split("\t")
+            csv_data.append(
+                {"source": document_to_url(source), "destination": document_to_url(destination)}
+            )
 
     if len(csv_data) < 1:
-        print("No renames found for", args.revision1, "->", args.revision2)
+        print("No renames found for", args.revision1, "->", ", ".join(args.revision2))
         return
 
     csv_data.sort(key=dict_item_to_str)
 
+    if args.merge:
+        csv_data = merge_redirects(args.merge, csv_data)
+        if not args.output_file:
+            args.output_file = args.merge
+
     out = args.output_file
     if not out:
         out = sys.stdout.fileno()
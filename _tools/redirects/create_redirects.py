@@ -21,28 +21,58 @@ and then create the redirects on RTD accordingly.
 Make sure to use the old branch first, then the more recent branch (i.e., stable > master).
 You need to have both branches or revisions available and up to date locally.
 Care is taken to not add redirects that already exist on RTD.
+
+The redirects on RTD are kept in a local snapshot (in _build/), which is refreshed
+with conditional requests, so only the pages of the listing that changed since the
+last run are downloaded. The redirects of the CSV file are compared with it, and
+only the differences are applied: redirects are created, and those whose destination
+changed are updated. Redirects on RTD which aren't in the CSV file are only removed
+with --prune. Dry runs compare the CSV file with the snapshot, without refreshing it.
+
+Cycles of redirects are reported. With --validate, chains of redirects (to a page missing
+from the build which is redirected as well) are reported with the final destination, so each
+redirect can go there at once. Dry runs (including --validate) don't rewrite the CSV file.
+
+Redirects are submitted (or deleted) by several requests at once, limited to a rate
+which is lowered when RTD responds with 429 (Too Many Requests) and pauses for as
+long as its Retry-After header asks, then rises back. A local stand-in for the API
+can be used to try this out without touching RTD (see rtd_api_server.py):
+  python rtd_api_server.py --rate 10 --latency 0.2 &
+  RTD_AUTH_TOKEN=test python create_redirects.py --api-url http://127.0.0.1:8001/api/v3/projects/godot/redirects/
 """
 
 import argparse
+import concurrent.futures
 import csv
+import email.utils
+import functools
+import json
 import os
+import threading
 import time
+import urllib.parse
 
 import requests
 from requests.models import default_hooks
 from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
+from urllib3.util.retry import Retry
 
 RTD_AUTH_TOKEN = ""
 REQUEST_HEADERS = ""
 REDIRECT_URL = "https://readthedocs.org/api/v3/projects/godot/redirects/"
 USER_AGENT = "Godot RTD Redirects on Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/97.0.4692.71 Safari/537.36"
 DEFAULT_PAGINATED_SIZE = 1024
-API_SLEEP_TIME = 0.2 # Seconds.
+DEFAULT_JOBS = 4
+DEFAULT_RATE = 10 # Requests per second.
+MIN_RATE = 0.5 # Requests per second.
+MAX_RATE_LIMITED_RETRIES = 5
 REDIRECT_SUFFIXES = [".html", "/"]
 BUILD_PATH = "../../_build/html"
+SNAPSHOT_PATH = "../../_build/rtd_redirects.json"
+SNAPSHOT_VERSION = 1
 TIMEOUT_SECONDS = 5
 HTTP = None
+LIMITER = None
 
 def parse_command_line_args():
     parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
@@ -69,6 +99,16 @@ def parse_command_line_args():
         action="store_true",
         help="Only dumps or deletes (if --delete) existing RTD redirects, skips submission.",
     )
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="Also removes the 'page' redirects on ReadTheDocs which aren't in the CSV file.",
+    )
+    parser.add_argument(
+        "--snapshot",
+        default=SNAPSHOT_PATH,
+        help=f"Path to the local snapshot of the redirects on ReadTheDocs (default: {SNAPSHOT_PATH}).",
+    )
     parser.add_argument(
         "-v",
         "--verbose",
@@ -78,114 +118,432 @@ def parse_command_line_args():
     parser.add_argument(
         "--validate",
         action="store_true",
-        help="Validates each redirect by checking the target page exists. Implies --dry-run.",
+        help="Validates each redirect by checking the target page exists in the build (" + BUILD_PATH + "). "
+        "Implies --dry-run.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"Maximum number of requests to the RTD API at once (default: {DEFAULT_JOBS}).",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=DEFAULT_RATE,
+        help=f"Maximum number of requests to the RTD API per second (default: {DEFAULT_RATE}).",
+    )
+    parser.add_argument(
+        "--api-url",
+        default=REDIRECT_URL,
+        help="URL of the redirects endpoint of the RTD API, e.g. to use a local stand-in (see rtd_api_server.py).",
     )
     return parser.parse_args()
 
+
+class TokenBucket:
+    """Limits the rate of the requests made by all threads, adapting it to the rate limit of the API.
+
+    Each request takes a token, and tokens are added at `rate` per second, up to `capacity`.
+    When the API responds with 429, requests are paused for the delay it asks for and the rate
+    is halved (once for all the requests made before), then successful requests raise it back
+    towards the initial rate by about one request per second every second.
+    """
+
+    def __init__(self, rate, capacity):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.slowed_down_at = 0.0
+        self.throttled = 0
+        self.lock = threading.Lock()
+
+    def refill(self, now):
+        # No tokens are added while paused, so requests don't all resume at once.
+        start = max(self.updated_at, self.paused_until)
+        if now > start:
+            self.tokens = min(self.capacity, self.tokens + (now - start) * self.rate)
+        self.updated_at = now
+
+    def acquire(self):
+        """Waits until a request can be made, and returns the time it was allowed at."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.refill(now)
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return now
+                delay = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(delay)
+
+    def slow_down(self, delay, requested_at):
+        """Pauses requests for `delay` seconds and halves the rate, after a request made at
+        `requested_at` was rate limited."""
+        with self.lock:
+            now = time.monotonic()
+            self.refill(now)
+            self.paused_until = max(self.paused_until, now + delay)
+            self.tokens = 0
+            self.throttled += 1
+            # Requests made at the same rate are likely rate limited as well.
+            if requested_at >= self.slowed_down_at:
+                self.rate = max(MIN_RATE, self.rate / 2)
+                self.slowed_down_at = now
+
+    def speed_up(self):
+        """Raises the rate back towards the initial one, after a request succeeded."""
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + 1 / self.rate)
+
+
+class Progress:
+    """Reports each finished request with the number left and the throughput so far."""
+
+    def __init__(self, total):
+        self.total = total
+        self.done = 0
+        self.started_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def get_throughput(self):
+        return self.done / max(time.monotonic() - self.started_at, 0.001)
+
+    def report(self, message):
+        with self.lock:
+            self.done += 1
+            print(f"[{self.done}/{self.total}, {self.get_throughput():.1f}/s] {message}", flush=True)
+
+    def summary(self, description):
+        elapsed = time.monotonic() - self.started_at
+        throttled = f", rate limited {LIMITER.throttled} times" if LIMITER else ""
+        print(f"{description}: {self.done} of {self.total} done in {elapsed:.1f}s "
+              f"({self.get_throughput():.1f}/s{throttled}).")
+
+
+class Snapshot:
+    """Local copy of the redirects on RTD, so they aren't all downloaded again on each run.
+
+    The redirects are stored by page of the API listing, with the ETag of each page. Pages are
+    requested with If-None-Match, and only downloaded again if they changed (otherwise the API
+    responds with 304 Not Modified). Changes made by this script are applied to the snapshot,
+    and the pages they change are downloaded again on the next refresh.
+    """
+
+    def __init__(self, path, api_url):
+        self.path = path
+        self.api_url = api_url
+        self.pages = []
+        self.lock = threading.Lock()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == SNAPSHOT_VERSION and data.get("api_url") == api_url:
+            self.pages = data["pages"]
+
+    def get_redirects(self):
+        return [redirect for page in self.pages for redirect in page["results"]]
+
+    def refresh(self):
+        """Updates the snapshot from RTD, and returns the number of pages downloaded and of pages."""
+        stored = {page["url"]: page for page in self.pages}
+        pages = []
+        downloaded = 0
+        url = self.api_url + "?" + urllib.parse.urlencode({"limit": DEFAULT_PAGINATED_SIZE})
+        while url and url not in (page["url"] for page in pages):
+            etag = stored[url]["etag"] if url in stored else None
+            response = request("GET", url, headers={"If-None-Match": etag} if etag else {})
+            if response.status_code == 304:
+                page = stored[url]
+            elif response.status_code == 200:
+                data = response.json()
+                page = {
+                    "url": url,
+                    "etag": response.headers.get("ETag"),
+                    "count": data["count"],
+                    "next": data["next"],
+                    "results": data["results"],
+                }
+                downloaded += 1
+            else:
+                if response.status_code == 401:
+                    print("Access denied, check RTD API key in RTD_AUTH_TOKEN!")
+                print("Error accessing RTD API: " + url + ": " + str(response.status_code))
+                exit(1)
+            pages.append(page)
+            url = page["next"]
+
+        count = sum(len(page["results"]) for page in pages)
+        if pages[0]["count"] != count:
+            print(
+                "Mismatch getting paginated content from " + self.api_url + ": " +
+                "expected " + str(pages[0]["count"]) + " items, got " + str(count))
+            exit(1)
+        self.pages = pages
+        return downloaded, len(pages)
+
+    def changed(self, page):
+        # The first page has the number of redirects.
+        page["etag"] = None
+        self.pages[0]["etag"] = None
+
+    def add(self, redirect):
+        with self.lock:
+            self.pages[-1]["results"].append(redirect)
+            self.changed(self.pages[-1])
+
+    def replace(self, pk, redirect=None):
+        """Replaces the redirect `pk` with `redirect`, or removes it if it's `None`."""
+        with self.lock:
+            for page in self.pages:
+                for i, existing in enumerate(page["results"]):
+                    if existing["pk"] == pk:
+                        if redirect is None:
+                            del page["results"][i]
+                        else:
+                            page["results"][i] = redirect
+                        self.changed(page)
+                        return
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"version": SNAPSHOT_VERSION, "api_url": self.api_url, "pages": self.pages}, f)
+
+
+def run_concurrently(tasks, jobs):
+    """Calls each task (without arguments), at most `jobs` at once. Stops as soon as a task fails
+    (returns False), and returns whether all tasks succeeded."""
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(task) for task in tasks]
+        for future in concurrent.futures.as_completed(futures):
+            if not future.result():
+                for pending in futures:
+                    pending.cancel()
+                return False
+    return True
+
+
+def get_retry_after(response, retry):
+    """Returns the delay in seconds the API asks for before retrying, or a growing default."""
+    value = response.headers.get("Retry-After", "")
+    if value.isdigit():
+        return int(value)
+    try:
+        return max(0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return retry * retry
+
+
+def request(method, url, headers=None, **kwargs):
+    """Makes a request to the RTD API through the rate limiter, retrying if it's rate limited."""
+    for retry in range(1, MAX_RATE_LIMITED_RETRIES + 2):
+        requested_at = LIMITER.acquire()
+        response = HTTP.request(
+            method, url, headers={**REQUEST_HEADERS, **(headers or {})}, timeout=TIMEOUT_SECONDS, **kwargs
+        )
+        if response.status_code != 429:
+            LIMITER.speed_up()
+            return response
+        if retry <= MAX_RATE_LIMITED_RETRIES:
+            LIMITER.slow_down(get_retry_after(response, retry), requested_at)
+    return response
+
 def is_dry_run(args):
     return args.dry_run or args.validate
 
-def validate(destination):
-    if destination.startswith("https://"):
-        # Skip; external targets cannot be validated here.
-        return
-
-    p = BUILD_PATH + destination.split("#", 1)[0]
-    if not os.path.exists(p):
-        print("Invalid destination: " + destination + " (" + p + ")")
+def split_fragment(url):
+    path, separator, fragment = url.partition("#")
+    return path, separator + fragment
+
+
+class RedirectGraph:
+    """Redirects by source, to follow chains of redirects (a destination which is the source of
+    another redirect) and find cycles.
+
+    RTD only redirects pages which don't exist, once per request, so a reader following a chain
+    through missing pages gets a redirect for each step: collapsing it gives each source the final
+    destination of its chain at once. A page which exists isn't redirected, so chains are only
+    followed through the pages missing from `pages` (see `index_build()`), and not at all without it.
+    """
+
+    def __init__(self, redirects, pages=None):
+        self.destinations = {source: destination for source, destination in redirects}
+        self.pages = pages
+        # Final destination of each source, or None if its chain ends in a cycle.
+        self.resolved = {}
+
+    def is_redirected(self, page):
+        return page in self.destinations and self.pages is not None and page not in self.pages
+
+    def resolve(self, source):
+        if source in self.resolved:
+            return self.resolved[source]
+
+        # Follow the chain up to a page which isn't redirected (or an already resolved source).
+        chain = [source]
+        positions = {source: 0}
+        page = split_fragment(self.destinations[source])[0]
+        while self.is_redirected(page) and page not in self.resolved:
+            if page in positions:
+                for step in chain:
+                    self.resolved[step] = None
+                return None
+            positions[page] = len(chain)
+            chain.append(page)
+            page = split_fragment(self.destinations[page])[0]
+
+        # Then resolve it backwards, so each step reuses the destination of the next one.
+        for step in reversed(chain):
+            destination = self.destinations[step]
+            path, fragment = split_fragment(destination)
+            if self.is_redirected(path):
+                final = self.resolved[path]
+                if final is not None:
+                    # Browsers keep the fragment of the previous URL when redirected to one without a fragment.
+                    final_path, final_fragment = split_fragment(final)
+                    final = final_path + (final_fragment or fragment)
+                destination = final
+            self.resolved[step] = destination
+        return self.resolved[source]
+
+    def collapse(self, redirects):
+        """Returns `redirects` with the final destination of each one (or the same destination if
+        its chain ends in a cycle), and the redirects whose destination changed."""
+        collapsed = []
+        changed = []
+        for source, destination in redirects:
+            final = self.resolve(source)
+            if final is None:
+                final = destination
+            elif final != destination:
+                changed.append([source, destination, final])
+            collapsed.append([source, final])
+        return collapsed, changed
+
+    def find_cycles(self):
+        """Returns the cycles of redirects, whether the pages exist or not, each as the list of
+        pages it goes through (back to the first one)."""
+        cycles = []
+        visited = {}
+        for start in self.destinations:
+            chain = []
+            page = start
+            while page in self.destinations and page not in visited:
+                visited[page] = start
+                chain.append(page)
+                page = split_fragment(self.destinations[page])[0]
+            # Only a cycle if the chain went back to one of its own pages.
+            if page in self.destinations and visited[page] == start:
+                cycles.append(chain[chain.index(page):] + [page])
+        return cycles
+
+
+def index_build(path):
+    """Returns the URL paths of the files and directories of the built documentation in `path`."""
+    pages = set()
+    for directory, _, filenames in os.walk(path):
+        relative = os.path.relpath(directory, path).replace(os.sep, "/")
+        prefix = "/" if relative == "." else "/" + relative + "/"
+        pages.add(prefix)
+        pages.update(prefix + filename for filename in filenames)
+    return pages
+
+
+def validate(redirects, pages):
+    """Checks the destinations of `redirects` exist in `pages` (see `index_build()`), and reports
+    the sources which do, as RTD only redirects pages which don't exist."""
+    for source, destination in redirects:
+        if source in pages:
+            print("Unused redirect:", [source, destination], "- the source page exists.")
+
+        if destination.startswith("https://"):
+            # Skip; external targets cannot be validated here.
+            continue
 
-def make_redirect(source, destination, args, retry=0):
-    if args.validate:
-        validate(destination)
+        if split_fragment(destination)[0] not in pages:
+            print("Invalid destination: " + destination + " (" + BUILD_PATH + split_fragment(destination)[0] + ")")
 
+def make_redirect(source, destination, args, progress, snapshot):
     json_data = {"from_url": source, "to_url": destination, "type": "page"}
-    headers = REQUEST_HEADERS
 
     if args.verbose:
-        print("POST " + REDIRECT_URL, headers, json_data)
+        print("POST " + args.api_url, REQUEST_HEADERS, json_data)
 
     if is_dry_run(args):
-        if not args.validate:
-            print(f"Created redirect {source} -> {destination} (DRY RUN)")
-        return
-
-    response = HTTP.post(
-        REDIRECT_URL,
-        json=json_data,
-        headers=headers,
-        timeout=TIMEOUT_SECONDS
-    )
+        progress.report(f"Created redirect {source} -> {destination} (DRY RUN)")
+        return True
+
+    response = request("POST", args.api_url, json=json_data)
 
     if response.status_code == 201:
-        print(f"Created redirect {source} -> {destination}")
-    elif response.status_code == 429 and retry<5:
-        retry += 1
-        time.sleep(retry*retry)
-        make_redirect(source, destination, args, retry)
-        return
-    else:
-        print(
-            f"Failed to create redirect {source} -> {destination}. "
-            f"Status code: {response.status_code}"
-        )
-        exit(1)
+        snapshot.add(response.json())
+        progress.report(f"Created redirect {source} -> {destination}")
+        return True
 
+    print(
+        f"Failed to create redirect {source} -> {destination}. "
+        f"Status code: {response.status_code}"
+    )
+    return False
 
-def sleep():
-    time.sleep(API_SLEEP_TIME)
 
+def update_redirect(redirect, destination, args, progress, snapshot):
+    url = args.api_url + str(redirect["pk"]) + "/"
+    json_data = {"from_url": redirect["from_url"], "to_url": destination, "type": "page"}
+    change = f"{id(redirect['from_url'], redirect['to_url'])} to {destination}"
 
-def id(from_url, to_url):
-    return from_url + " -> " + to_url
+    if args.verbose:
+        print("PUT " + url, REQUEST_HEADERS, json_data)
 
+    if is_dry_run(args):
+        progress.report(f"Updated redirect {change} (DRY RUN)")
+        return True
 
-def get_paginated(url, parameters={"limit": DEFAULT_PAGINATED_SIZE}):
-    entries = []
-    count = -1
-    while True:
-        data = HTTP.get(
-            url,
-            headers=REQUEST_HEADERS,
-            params=parameters,
-            timeout=TIMEOUT_SECONDS
-        )
-        if data.status_code != 200:
-            if data.status_code == 401:
-                print("Access denied, check RTD API key in RTD_AUTH_TOKEN!")
-            print("Error accessing RTD API: " + url + ": " + str(data.status_code))
-            exit(1)
-        else:
-            json = data.json()
-            if json["count"] and count < 0:
-                count = json["count"]
-            entries.extend(json["results"])
-            next = json["next"]
-            if next and len(next) > 0 and next != url:
-                url = next
-                sleep()
-                continue
-        if count > 0 and len(entries) != count:
-            print(
-                "Mismatch getting paginated content from " + url + ": " +
-                "expected " + str(count) + " items, got " + str(len(entries)))
-            exit(1)
-        return entries
+    response = request("PUT", url, json=json_data)
+
+    if response.status_code == 200:
+        snapshot.replace(redirect["pk"], response.json())
+        progress.report(f"Updated redirect {change}")
+        return True
 
+    print(f"Failed to update redirect {change}. Status code: {response.status_code}")
+    return False
+
+
+def delete_redirect(redirect, args, progress, snapshot):
+    url = args.api_url + str(redirect["pk"]) + "/"
+    description = f"#{redirect['pk']} {id(redirect['from_url'], redirect['to_url'])}"
+
+    if args.verbose:
+        print("DELETE " + url, REQUEST_HEADERS)
 
-def delete_redirect(id):
-    url = REDIRECT_URL + str(id)
-    data = HTTP.delete(url, headers=REQUEST_HEADERS, timeout=TIMEOUT_SECONDS)
+    if is_dry_run(args):
+        progress.report(f"Deleted redirect {description} (DRY RUN)")
+        return True
+
+    data = request("DELETE", url)
     if data.status_code != 204:
-        print("Error deleting redirect with ID", id, "- code:", data.status_code)
-        exit(1)
-    else:
-        print("Deleted redirect", id, "on RTD.")
+        print("Error deleting redirect", description, "- code:", data.status_code)
+        return False
+    snapshot.replace(redirect["pk"])
+    progress.report(f"Deleted redirect {description} on RTD.")
+    return True
+
 
+def id(from_url, to_url):
+    return from_url + " -> " + to_url
 
-def get_existing_redirects(delete=False):
-    redirs = get_paginated(REDIRECT_URL)
+
+def get_existing_redirects(snapshot):
     existing = []
-    for redir in redirs:
+    for redir in snapshot.get_redirects():
         if redir["type"] != "page":
             print(
                 "Ignoring redirect (only type 'page' is handled): #" +
@@ -193,14 +551,49 @@ def get_existing_redirects(delete=False):
                 " on ReadTheDocs is '" + redir["type"] + "'. "
             )
             continue
-        if delete:
-            delete_redirect(redir["pk"])
-            sleep()
-        else:
-            existing.append([redir["from_url"], redir["to_url"]])
+        existing.append(redir)
     return existing
 
 
+def get_plan(redirects, existing):
+    """Returns the redirects to create, the existing redirects to update with their new
+    destination, and the existing redirects to remove, so RTD has exactly `redirects`."""
+    by_source = {}
+    to_remove = []
+    for redirect in existing:
+        if redirect["from_url"] in by_source:
+            # Only one redirect is used for a source.
+            to_remove.append(redirect)
+        else:
+            by_source[redirect["from_url"]] = redirect
+
+    to_create = []
+    to_update = []
+    for source, destination in redirects:
+        redirect = by_source.pop(source, None)
+        if redirect is None:
+            to_create.append([source, destination])
+        elif redirect["to_url"] != destination:
+            to_update.append((redirect, destination))
+    to_remove.extend(by_source.values())
+    return to_create, to_update, to_remove
+
+
+def apply_changes(tasks, description, args, snapshot):
+    """Runs the tasks changing redirects, saves the snapshot, and exits if a task failed."""
+    progress = Progress(len(tasks))
+    try:
+        succeeded = run_concurrently([functools.partial(task, *task_args, args, progress, snapshot)
+                                      for task, *task_args in tasks], args.jobs)
+    finally:
+        if not is_dry_run(args):
+            snapshot.save()
+    if not is_dry_run(args):
+        progress.summary(description)
+    if not succeeded:
+        exit(1)
+
+
 def set_auth(token):
     global RTD_AUTH_TOKEN
     RTD_AUTH_TOKEN = token
@@ -258,17 +651,21 @@ def main():
     if not is_dry_run(args):
         load_auth()
 
+        # Rate limiting (429) is handled by the limiter, for all requests.
         retry_strategy = Retry(
             total=3,
-            status_forcelist=[429, 500, 502, 503, 504],
+            status_forcelist=[500, 502, 503, 504],
             backoff_factor=2,
-            method_whitelist=["HEAD", "GET", "PUT", "DELETE", "OPTIONS", "TRACE"]
+            allowed_methods=["HEAD", "GET", "PUT", "DELETE", "OPTIONS", "TRACE"]
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Connections are kept open and shared by the threads making requests.
+        adapter = HTTPAdapter(pool_maxsize=args.jobs, max_retries=retry_strategy)
         global HTTP
         HTTP = requests.Session()
         HTTP.mount("https://", adapter)
         HTTP.mount("http://", adapter)
+        global LIMITER
+        LIMITER = TokenBucket(args.rate, args.jobs)
 
     to_add = []
     redirects_file = []
@@ -284,13 +681,19 @@ def main():
         to_add.append([row["source"], row["destination"]])
     print("Loaded", len(redirects_file), "redirects from", args.file + ".")
 
-    existing = []
-    if not is_dry_run(args):
-        existing = get_existing_redirects(args.delete)
-    print("Loaded", len(existing), "existing redirects from RTD.")
+    snapshot = Snapshot(args.snapshot, args.api_url)
+    if is_dry_run(args):
+        existing = get_existing_redirects(snapshot)
+        print("Loaded", len(existing), "existing redirects from the snapshot (not refreshed in dry runs).")
+    else:
+        downloaded, pages = snapshot.refresh()
+        existing = get_existing_redirects(snapshot)
+        print("Loaded", len(existing), "existing redirects from RTD (" + str(downloaded), "of", pages,
+              "pages changed since the last run).")
 
-    print("Total redirects:", str(len(to_add)) +
-          " new + " + str(len(existing)), "existing =", to_add+existing, "total")
+    if args.delete:
+        apply_changes([(delete_redirect, redirect) for redirect in existing], "Deleting redirects", args, snapshot)
+        existing = []
 
     redirects = []
     added = {}
@@ -328,25 +731,44 @@ def main():
         sources[redirect[0]] = redirect
         redirects.append(redirect)
 
-    redirects.sort(key=redirect_to_str)
-
-    with open(args.file, "w", encoding="utf-8", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerows([["source", "destination"]])
-        writer.writerows(redirects)
+    # Cycles are left in the CSV file, as whether readers go around them depends on which pages exist.
+    graph = RedirectGraph(redirects)
+    for cycle in graph.find_cycles():
+        print("Invalid redirects: cycle", " -> ".join(cycle))
 
-    existing_ids = {}
-    for e in existing:
-        existing_ids[id(e[0], e[1])] = True
+    redirects.sort(key=redirect_to_str)
 
-    if not args.dump:
-        print("Creating redirects.")
-        for redirect in redirects:
-            if not id(redirect[0], redirect[1]) in existing_ids:
-                make_redirect(redirect[0], redirect[1], args)
+    if not is_dry_run(args):
+        with open(args.file, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerows([["source", "destination"]])
+            writer.writerows(redirects)
 
-            if not is_dry_run(args):
-                sleep()
+    if args.validate:
+        if not os.path.isdir(BUILD_PATH):
+            print("Missing build in", BUILD_PATH + ", build the documentation to validate redirects. Aborting.")
+            exit(1)
+        pages = index_build(BUILD_PATH)
+        print("Validating", len(redirects), "redirects against", len(pages), "files and directories in",
+              BUILD_PATH + ".")
+        validate(redirects, pages)
+
+        # Only pages missing from the build are redirected further, so chains are only known here.
+        _, changed = RedirectGraph(redirects, pages).collapse(redirects)
+        for source, destination, final in changed:
+            print("Chain of redirects:", id(source, destination), "is redirected further, use", final, "instead.")
+        if changed:
+            print(len(changed), "redirects go to pages missing from the build which are redirected as well.")
+    elif not args.dump:
+        to_create, to_update, to_remove = get_plan(redirects, existing)
+        print("Changes:", len(to_create), "to create,", len(to_update), "to update,", len(to_remove), "to remove.")
+        tasks = [(make_redirect, *redirect) for redirect in to_create]
+        tasks += [(update_redirect, *update) for update in to_update]
+        if args.prune:
+            tasks += [(delete_redirect, redirect) for redirect in to_remove]
+        elif to_remove:
+            print(len(to_remove), "redirects on RTD are not in", args.file + ", use --prune to remove them.")
+        apply_changes(tasks, "Applying changes", args, snapshot)
 
     print("Finished creating", len(redirects), "redirects.")
 
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+
+"""Serves a local stand-in for the redirects endpoints of the Read the Docs API v3,
+to try out create_redirects.py without touching the redirects on RTD.
+
+Redirects are kept in memory while the server runs. Like RTD, it requires an
+`Authorization: token ...` header (any token is accepted), paginates listings
+with `limit` and `offset`, and responds with 429 (Too Many Requests) and a
+Retry-After header to requests over its rate limit. Pages of listings have an
+ETag, and requests with a matching If-None-Match get 304 (Not Modified). Each
+response can also be delayed, to mimic the latency of the real API.
+
+Example:
+  python rtd_api_server.py --rate 10 --latency 0.2
+  RTD_AUTH_TOKEN=test python create_redirects.py --api-url http://127.0.0.1:8001/api/v3/projects/godot/redirects/
+"""
+
+import argparse
+import hashlib
+import http.server
+import json
+import math
+import re
+import threading
+import time
+import urllib.parse
+
+REDIRECTS_PATH_REGEX = re.compile(r"^/api/v3/projects/(?P<project>[^/]+)/redirects/(?:(?P<pk>\d+)/?)?$")
+DEFAULT_LIMIT = 10
+
+
+def parse_command_line_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on.")
+    parser.add_argument("--port", type=int, default=8001, help="Port to listen on.")
+    parser.add_argument(
+        "--rate",
+        type=int,
+        default=0,
+        help="Maximum number of requests per second, over which 429 is returned (default: no limit).",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Time in seconds to wait before responding to each request.",
+    )
+    return parser.parse_args()
+
+
+class RedirectsApi:
+    """Redirects of the projects, and the number of requests in the current second to rate limit them."""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.redirects = {}
+        self.next_pk = 1
+        self.window = 0
+        self.window_requests = 0
+        self.requests = 0
+        self.rate_limited = 0
+        self.lock = threading.Lock()
+
+    def get_retry_after(self):
+        """Counts a request, and returns the seconds to wait before retrying if it's over the rate limit."""
+        with self.lock:
+            self.requests += 1
+            if not self.rate:
+                return None
+            now = time.time()
+            if int(now) != self.window:
+                self.window = int(now)
+                self.window_requests = 0
+            self.window_requests += 1
+            if self.window_requests <= self.rate:
+                return None
+            self.rate_limited += 1
+            return max(1, math.ceil(self.window + 1 - now))
+
+    def list(self, project, offset, limit, url):
+        with self.lock:
+            redirects = [dict(redirect) for redirect in self.redirects.values() if redirect["project"] == project]
+        page = {"count": len(redirects), "next": None, "previous": None, "results": redirects[offset : offset + limit]}
+        if offset + limit < len(redirects):
+            page["next"] = f"{url}?{urllib.parse.urlencode({'limit': limit, 'offset': offset + limit})}"
+        if offset > 0:
+            page["previous"] = f"{url}?{urllib.parse.urlencode({'limit': limit, 'offset': max(0, offset - limit)})}"
+        return page
+
+    def create(self, project, data):
+        with self.lock:
+            redirect = {
+                "pk": self.next_pk,
+                "project": project,
+                "type": data.get("type", "page"),
+                "from_url": data.get("from_url", ""),
+                "to_url": data.get("to_url", ""),
+                "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            }
+            self.redirects[redirect["pk"]] = redirect
+            self.next_pk += 1
+        return redirect
+
+    def update(self, project, pk, data):
+        with self.lock:
+            redirect = self.redirects.get(pk)
+            if redirect is None or redirect["project"] != project:
+                return None
+            for key in ("type", "from_url", "to_url"):
+                redirect[key] = data.get(key, redirect[key])
+            return dict(redirect)
+
+    def delete(self, project, pk):
+        with self.lock:
+            redirect = self.redirects.get(pk)
+            if redirect is None or redirect["project"] != project:
+                return False
+            del self.redirects[pk]
+        return True
+
+
+class RedirectsApiHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def respond(self, status, data=None, headers=()):
+        body = json.dumps(data).encode() if data is not None else b""
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        if data is not None:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def handle_request(self, method):
+        url = urllib.parse.urlsplit(self.path)
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length) if length else b""
+        time.sleep(self.server.latency)
+
+        match = REDIRECTS_PATH_REGEX.match(url.path)
+        if match is None:
+            return self.respond(404, {"detail": "Not found."})
+        if not self.headers.get("Authorization", "").startswith("token "):
+            return self.respond(401, {"detail": "Authentication credentials were not provided."})
+        retry_after = self.server.api.get_retry_after()
+        if retry_after is not None:
+            return self.respond(
+                429,
+                {"detail": f"Request was throttled. Expected available in {retry_after} seconds."},
+                [("Retry-After", str(retry_after))],
+            )
+
+        project = match["project"]
+        pk = match["pk"]
+        if method == "GET" and pk is None:
+            query = urllib.parse.parse_qs(url.query)
+            offset = int(query.get("offset", ["0"])[0])
+            limit = int(query.get("limit", [str(DEFAULT_LIMIT)])[0])
+            page_url = f"http://{self.headers.get('Host', '')}{url.path}"
+            page = self.server.api.list(project, offset, limit, page_url)
+            etag = '"' + hashlib.sha256(json.dumps(page).encode()).hexdigest()[:16] + '"'
+            if self.headers.get("If-None-Match") == etag:
+                return self.respond(304, headers=[("ETag", etag)])
+            return self.respond(200, page, [("ETag", etag)])
+        if method == "POST" and pk is None:
+            return self.respond(201, self.server.api.create(project, json.loads(body or b"{}")))
+        if method == "PUT" and pk is not None:
+            redirect = self.server.api.update(project, int(pk), json.loads(body or b"{}"))
+            if redirect is not None:
+                return self.respond(200, redirect)
+            return self.respond(404, {"detail": "Not found."})
+        if method == "DELETE" and pk is not None:
+            if self.server.api.delete(project, int(pk)):
+                return self.respond(204)
+            return self.respond(404, {"detail": "Not found."})
+        return self.respond(405, {"detail": f'Method "{method}" not allowed.'})
+
+    def do_GET(self):
+        self.handle_request("GET")
+
+    def do_POST(self):
+        self.handle_request("POST")
+
+    def do_PUT(self):
+        self.handle_request("PUT")
+
+    def do_DELETE(self):
+        self.handle_request("DELETE")
+
+
+def main():
+    args = parse_command_line_args()
+
+    server = http.server.ThreadingHTTPServer((args.host, args.port), RedirectsApiHandler)
+    server.api = RedirectsApi(args.rate)
+    server.latency = args.latency
+    print(f"Serving the RTD redirects API on http://{args.host}:{args.port}/api/v3/projects/<project>/redirects/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    print(f"Served {server.api.requests} requests, {server.api.rate_limited} rate limited (429).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Tests of convert_git_renames_to_csv.py, on histories made up in temporary Git repositories.
+
+  python -m unittest discover -s _tools/redirects
+"""
+
+import os
+import subprocess
+import tempfile
+import unittest
+
+from convert_git_renames_to_csv import get_history_renames
+
+
+class HistoryRenamesTest(unittest.TestCase):
+    def setUp(self):
+        self.previous_path = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+        self.git("init", "--quiet", "--initial-branch=master")
+        self.git("config", "user.name", "Test")
+        self.git("config", "user.email", "test@example.com")
+        self.write("index.rst", "Index")
+        self.commit("start")
+        self.git("tag", "start")
+
+    def tearDown(self):
+        os.chdir(self.previous_path)
+        self.directory.cleanup()
+
+    def git(self, *args):
+        subprocess.check_output(["git", *args])
+
+    def write(self, path, content):
+        # Documents need enough content in common with their old name for Git to find renames.
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(f"{content} line {i}" for i in range(20)) + "\n")
+
+    def commit(self, message):
+        self.git("add", "--all")
+        self.git("commit", "--quiet", "--message", message)
+
+    def rename(self, source, destination):
+        self.git("mv", source, destination)
+        self.commit(f"Rename {source} to {destination}")
+
+    def test_successive_renames(self):
+        self.write("a.rst", "A")
+        self.commit("Add a")
+        self.git("tag", "--force", "start")
+        self.rename("a.rst", "b.rst")
+        self.rename("b.rst", "c.rst")
+
+        self.assertEqual(get_history_renames("start", ["master"]), {"a.rst": "c.rst", "b.rst": "c.rst"})
+
+    def test_reused_path(self):
+        self.write("a.rst", "A")
+        self.commit("Add a")
+        self.git("tag", "--force", "start")
+        self.rename("a.rst", "b.rst")
+        self.rename("b.rst", "c.rst")
+        self.write("b.rst", "B")
+        self.commit("Add another b")
+        self.rename("b.rst", "d.rst")
+
+        # The content of `a.rst` is in `c.rst`, `b.rst` goes to the last document at that path.
+        self.assertEqual(get_history_renames("start", ["master"]), {"a.rst": "c.rst", "b.rst": "d.rst"})
+
+    def test_renamed_back(self):
+        self.write("a.rst", "A")
+        self.commit("Add a")
+        self.git("tag", "--force", "start")
+        self.rename("a.rst", "b.rst")
+        self.rename("b.rst", "a.rst")
+
+        self.assertEqual(get_history_renames("start", ["master"]), {"b.rst": "a.rst"})
+
+
+if __name__ == "__main__":
+    unittest.main()
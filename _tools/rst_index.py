@@ -0,0 +1,274 @@
+"""Index of what reST documents of the documentation refer to, shared by tools.
+
+Documents are scanned with regular expressions rather than parsed by Sphinx,
+so the whole tree can be indexed in a few seconds. For each document, the
+index knows its title, the labels it defines (with the title of the section
+they point to), the labels and documents it refers to (`:ref:`, `:doc:` and
+toctree entries), and the files it uses (images, figures, videos, includes
+and downloads), with line numbers. Reverse lookups tell which documents use
+a label, document or file.
+
+The index is cached in `_build/rst_index.json`, and only documents modified
+since the cache was written are scanned again.
+"""
+
+import fnmatch
+import json
+import os
+import posixpath
+import re
+
+ROOT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CACHE_PATH = os.path.join(ROOT_PATH, "_build", "rst_index.json")
+# Bump this when the scanned data changes.
+CACHE_VERSION = 1
+
+# Same as `exclude_patterns` in `conf.py`.
+EXCLUDED_DIRECTORIES = ("_build", "_tools")
+
+# Internal hyperlink target (`.. _label:`), not an external one (`.. _name: https://...`).
+LABEL_REGEX = re.compile(r"^\.\. _([^:`]+|`[^`]+`):\s*$")
+TITLE_UNDERLINE_REGEX = re.compile(r"^([=\-`:'\"~^_*+#<>])\1+\s*$")
+ROLE_REGEX = re.compile(r":(ref|doc|download):`([^`]+)`")
+ROLE_TARGET_REGEX = re.compile(r"(?s).*<([^<>]+)>$")
+# Directives with a path as argument, also as substitution definitions (`.. |name| image:: path`).
+ASSET_DIRECTIVE_REGEX = re.compile(
+    r"^\s*\.\. (?:\|[^|]+\|\s+)?(image|figure|video|include|literalinclude)::\s+(\S+)\s*$"
+)
+TOCTREE_REGEX = re.compile(r"^(\s*)\.\. toctree::")
+OPTION_REGEX = re.compile(r"^\s*:([\w-]+):")
+# Directives with a `:name:` option define a label as well.
+NAME_OPTION_REGEX = re.compile(r"^\s+:name:\s+(\S.*?)\s*$")
+
+
+def get_empty_scan():
+    return {"title": None, "labels": {}, "refs": [], "docs": [], "toctree": [], "toctree_glob": [], "assets": []}
+
+
+def get_line_number(text, offset):
+    return text.count("\n", 0, offset) + 1
+
+
+def resolve_path(docname, path):
+    """Returns `path`, relative to the directory of `docname` or absolute from the
+    root if it starts with `/`, as a path relative to the root."""
+    if path.startswith("/"):
+        return posixpath.normpath(path.lstrip("/"))
+    return posixpath.normpath(posixpath.join(posixpath.dirname(docname), path))
+
+
+def is_external(target):
+    return "://" in target or target.startswith("mailto:")
+
+
+def normalize_label(label):
+    return " ".join(label.strip("`").lower().split())
+
+
+def scan_document(docname, text):
+    """Returns what the document `docname` with the content `text` defines and refers to."""
+    lines = text.splitlines()
+    # `labels` maps labels to the title of the section they point to, if any, and `assets` has
+    # `[directive or role, path relative to the root, line number]` for each file used.
+    scan = get_empty_scan()
+
+    pending_labels = []
+    toctree_indent = None
+    toctree_glob = False
+    for i, line in enumerate(lines):
+        if toctree_indent is not None:
+            stripped = line.strip()
+            indent = len(line) - len(line.lstrip())
+            if stripped and indent <= toctree_indent:
+                toctree_indent = None
+            elif stripped and NAME_OPTION_REGEX.match(line):
+                scan["labels"][normalize_label(NAME_OPTION_REGEX.match(line)[1])] = None
+            elif stripped and OPTION_REGEX.match(line):
+                toctree_glob = toctree_glob or OPTION_REGEX.match(line)[1] == "glob"
+            elif stripped and stripped != "self":
+                match = ROLE_TARGET_REGEX.match(stripped)
+                target = match[1] if match else stripped
+                if not is_external(target):
+                    key = "toctree_glob" if toctree_glob and any(c in target for c in "*?[") else "toctree"
+                    scan[key].append(resolve_path(docname, target))
+                continue
+            else:
+                continue
+
+        match = TOCTREE_REGEX.match(line)
+        if match:
+            toctree_indent = len(match[1])
+            toctree_glob = False
+            continue
+
+        match = LABEL_REGEX.match(line)
+        if match:
+            label = normalize_label(match[1])
+            scan["labels"][label] = None
+            pending_labels.append(label)
+            continue
+
+        match = NAME_OPTION_REGEX.match(line)
+        if match:
+            scan["labels"].setdefault(normalize_label(match[1]), None)
+            continue
+
+        match = ASSET_DIRECTIVE_REGEX.match(line)
+        if match:
+            if not is_external(match[2]):
+                scan["assets"].append([match[1], resolve_path(docname, match[2]), i + 1])
+            pending_labels = []
+            continue
+
+        # Section title, underlined and optionally overlined.
+        if (
+            line.strip()
+            and not line[0].isspace()
+            and i + 1 < len(lines)
+            and TITLE_UNDERLINE_REGEX.match(lines[i + 1])
+            and len(lines[i + 1].rstrip()) >= len(line.rstrip())
+            and not TITLE_UNDERLINE_REGEX.match(line)
+        ):
+            title = line.strip()
+            if scan["title"] is None:
+                scan["title"] = title
+            for label in pending_labels:
+                scan["labels"][label] = title
+            pending_labels = []
+        elif line.strip() and not TITLE_UNDERLINE_REGEX.match(line):
+            pending_labels = []
+
+    for match in ROLE_REGEX.finditer(text):
+        role, content = match[1], match[2]
+        target_match = ROLE_TARGET_REGEX.match(content)
+        target = target_match[1] if target_match else content
+        if role == "ref":
+            scan["refs"].append(normalize_label(target))
+        elif role == "doc":
+            scan["docs"].append(resolve_path(docname, target))
+        elif not is_external(target):
+            scan["assets"].append([role, resolve_path(docname, target), get_line_number(text, match.start())])
+
+    scan["refs"] = sorted(set(scan["refs"]))
+    scan["docs"] = sorted(set(scan["docs"]))
+    return scan
+
+
+def find_documents(root_path=ROOT_PATH):
+    """Returns the paths of all documents relative to `root_path`, in the same order."""
+    paths = []
+    for directory, dirnames, filenames in os.walk(root_path, followlinks=True):
+        dirnames[:] = sorted(
+            name
+            for name in dirnames
+            if not name.startswith(".") and not (directory == root_path and name in EXCLUDED_DIRECTORIES)
+        )
+        for filename in sorted(filenames):
+            if filename.endswith(".rst") and not filename.startswith("."):
+                paths.append(os.path.relpath(os.path.join(directory, filename), root_path).replace(os.sep, "/"))
+    return paths
+
+
+class RstIndex:
+    def __init__(self, documents):
+        # Docname: scan.
+        self.documents = {}
+        self.label_definitions = {}
+        self.label_references = {}
+        self.document_references = {}
+        # Glob patterns of toctrees are only matched against documents when looked up, as
+        # the documents they match change when documents are added or removed.
+        self.glob_references = {}
+        self.asset_references = {}
+        for docname, scan in documents.items():
+            self.add_document(docname, scan)
+
+    def get_reverse_maps(self, scan):
+        """Yields the reverse lookup maps and the keys the document with `scan` is in."""
+        yield self.label_definitions, scan["labels"]
+        yield self.label_references, scan["refs"]
+        yield self.document_references, scan["docs"] + scan["toctree"]
+        yield self.glob_references, scan["toctree_glob"]
+        yield self.asset_references, [path for _, path, _ in scan["assets"]]
+
+    def add_document(self, docname, scan):
+        self.remove_document(docname)
+        self.documents[docname] = scan
+        for reverse_map, keys in self.get_reverse_maps(scan):
+            for key in keys:
+                reverse_map.setdefault(key, set()).add(docname)
+
+    def remove_document(self, docname):
+        scan = self.documents.pop(docname, None)
+        if scan is None:
+            return
+        for reverse_map, keys in self.get_reverse_maps(scan):
+            for key in keys:
+                reverse_map.get(key, set()).discard(docname)
+                if not reverse_map.get(key, True):
+                    del reverse_map[key]
+
+    def expand_globs(self, patterns):
+        return [docname for pattern in patterns for docname in fnmatch.filter(self.documents, pattern)]
+
+    def get_document_references(self, docname):
+        """Returns the documents linking to `docname`, or with it in their toctree."""
+        references = set(self.document_references.get(docname, ()))
+        for pattern, docnames in self.glob_references.items():
+            if fnmatch.fnmatch(docname, pattern):
+                references |= docnames
+        return references
+
+    def get_dependents(self, old_docname, old_scan, new_docname, new_scan):
+        """Yields `(docnames, reason)` for the documents whose output changes when the document
+        `old_docname` scanned as `old_scan` becomes `new_docname` scanned as `new_scan`.
+        Either docname is `None` (with an empty scan) if the document was added or removed."""
+        labels = old_scan["labels"].keys() | new_scan["labels"].keys()
+        for label in sorted(labels):
+            if old_scan["labels"].get(label, False) != new_scan["labels"].get(label, False):
+                yield sorted(self.label_references.get(label, ())), f"refers to label {label}"
+
+        # Links and toctree entries show the title of the document.
+        if old_docname != new_docname or old_scan["title"] != new_scan["title"]:
+            for docname in sorted({old_docname, new_docname} - {None}):
+                yield sorted(self.get_document_references(docname)), f"links to {docname}"
+
+        # The previous and next links of documents depend on the toctrees they're in.
+        old_entries = old_scan["toctree"] + self.expand_globs(old_scan["toctree_glob"])
+        new_entries = new_scan["toctree"] + self.expand_globs(new_scan["toctree_glob"])
+        if old_entries != new_entries:
+            yield sorted(set(old_entries) | set(new_entries)), f"in the toctree of {new_docname or old_docname}"
+
+    @classmethod
+    def load(cls, root_path=ROOT_PATH, cache_path=CACHE_PATH):
+        """Returns the index of all documents in `root_path`, scanning only those modified since
+        the index was cached in `cache_path` (if not `None`), and updates the cache."""
+        cache = {}
+        if cache_path is not None:
+            try:
+                with open(cache_path, encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == CACHE_VERSION and data.get("root_path") == root_path:
+                    cache = data["documents"]
+            except (OSError, ValueError):
+                pass
+
+        entries = {}
+        updated = False
+        for path in find_documents(root_path):
+            stat = os.stat(os.path.join(root_path, path))
+            entry = cache.get(path)
+            if entry is None or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+                with open(os.path.join(root_path, path), encoding="utf-8-sig") as f:
+                    scan = scan_document(path[: -len(".rst")], f.read())
+                entry = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "scan": scan}
+                updated = True
+            entries[path] = entry
+
+        if cache_path is not None and (updated or entries.keys() != cache.keys()):
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(cache_path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, "root_path": root_path, "documents": entries}, f)
+            os.replace(cache_path + ".tmp", cache_path)
+
+        return cls({path[: -len(".rst")]: entry["scan"] for path, entry in entries.items()})
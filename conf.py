@@ -40,8 +40,9 @@ on_rtd = os.environ.get("READTHEDOCS", None) == "True"
 if not on_rtd:
     notfound_urls_prefix = ''
 
-if on_rtd:
-    extensions.append("override_jobs")
+# Always loaded, so the list of extensions (and the environment) doesn't depend on the
+# build being on Read the Docs. The number of jobs is only changed there (or when asked).
+extensions.append("override_jobs")
 
 # Specify the site name for the Open Graph extension.
 ogp_site_name = "Godot Engine documentation"
@@ -49,9 +50,52 @@ ogp_social_cards = {
     "enable": False
 }
 
+# Only read documents using `|version|` or `|release|` again when the version changes,
+# and log which configuration values changed since the last build.
+if not os.getenv("SPHINX_NO_CONFIG_FINGERPRINT"):
+    extensions.append("config_fingerprint")
+
 if not os.getenv("SPHINX_NO_DESCRIPTIONS"):
     extensions.append("godot_descriptions")
 
+# Parse the generated class reference with a faster, structure-aware parser.
+# It reimplements parts of the docutils parser, so it's only used when asked, and its
+# doctrees should be compared with the stock parser (see `_tools/benchmark_classref_parser.py`)
+# when updating docutils.
+if os.getenv("SPHINX_CLASSREF_PARSER"):
+    extensions.append("classref_parser")
+
+# The extensions below are always loaded and only enabled through configuration values,
+# as changing the list of extensions makes Sphinx read all documents again. None of these
+# values changes doctrees, so toggling them doesn't either (shared navigation and search
+# shards write all pages again). `godot_descriptions` and `classref_parser` change doctrees, and are still
+# toggled as extensions. Note that tags (`-t`) don't invalidate the environment either,
+# but all pages are written again when they change, as `only` directives are resolved then.
+extensions += ["content_hashes", "build_profiler", "highlight_cache", "shared_navigation", "search_shards"]
+
+# Decide which documents to read again from the hashes of their content instead of
+# modification times, so doctrees cached by CI are reused with a fresh checkout.
+content_hashes_enabled = bool(os.getenv("SPHINX_CONTENT_HASHES"))
+
+# Report the documents that take the most time to build, and write
+# the time spent on each document to `_build/build_profile.json`.
+build_profile_enabled = bool(os.getenv("SPHINX_BUILD_PROFILE"))
+# Set to "rss" or "tracemalloc" to report the peak memory of each document as well.
+build_profile_memory = os.getenv("SPHINX_BUILD_PROFILE_MEMORY", "")
+
+# Cache highlighted code blocks in `_build/highlight_cache` across builds.
+highlight_cache_enabled = not os.getenv("SPHINX_NO_HIGHLIGHT_CACHE")
+
+# Render the sidebar navigation once into a file loaded by `custom.js`, instead of into
+# every page, which makes pages much smaller and faster to write. Requires JavaScript,
+# and the output to be served over HTTP (browsers block loading it from local files).
+shared_navigation_enabled = bool(os.getenv("SPHINX_SHARED_NAVIGATION"))
+
+# Split the search index into shards, so the search page only loads those a query needs.
+# Falls back to the whole index when they can't be loaded (e.g. from local files). It relies
+# on private methods of the search of Sphinx, so check it in a browser when updating Sphinx.
+search_shards_enabled = bool(os.getenv("SPHINX_SEARCH_SHARDS"))
+
 templates_path = ["_templates"]
 
 # You can specify multiple suffix as a list of string: ['.rst', '.md']
@@ -172,6 +216,9 @@ html_context = {
     "godot_show_article_status": True,
     # Display user-contributed notes at the bottom of pages that don't have `:allow_comments: False` at the top.
     "godot_show_article_comments": on_rtd and not is_i18n,
+    # Only keep the part of the sidebar navigation in view in the DOM (see `virtualizeNavigation` in `custom.js`).
+    # Items out of view can't be found with the search of the browser, so this isn't enabled by default.
+    "godot_virtual_navigation": bool(os.getenv("SPHINX_VIRTUAL_NAVIGATION")),
 }
 
 html_logo = "img/docs_logo.svg"